@@ -9,6 +9,7 @@ from app.prompts.loader import PromptManager
 from app.services.langfuse_service import LangfuseService
 from app.models.chat import ChatMessage, ChatSession, MessageRole, UIComponent, Action
 from app.models.user import UserRole
+from app.db.database import unit_of_work
 from app.db.repositories import ResumeRepository, JobRepository, ChatRepository
 
 settings = get_settings()
@@ -35,7 +36,12 @@ class ChatAgent:
         context_ids: Optional[List[UUID]] = None,
         trace_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Process a chat message and generate response"""
+        """Process a chat message and generate response.
+        
+        The session, history and context are read in one transaction and
+        the turn is written in another, so the database connection is not
+        held while the model generates the reply.
+        """
         
         generation = None
         if trace_id:
@@ -47,28 +53,31 @@ class ChatAgent:
             )
         
         try:
-            # Get or create session
-            session = None
-            if session_id:
-                session = await self.chat_repo.get_session(str(session_id))
-            
-            if not session:
-                session = ChatSession(
-                    user_id=user_id,
-                    context_type=context_type,
-                    context_ids=context_ids or []
+            async with unit_of_work():
+                # Get or create session
+                session = None
+                if session_id:
+                    session = await self.chat_repo.get_session(str(session_id))
+                
+                new_session = session is None
+                if new_session:
+                    session = ChatSession(
+                        user_id=user_id,
+                        context_type=context_type,
+                        context_ids=context_ids or []
+                    )
+                
+                # Get conversation history
+                history = [] if new_session else await self.chat_repo.get_recent_messages(
+                    str(session.id), settings.chat_history_messages
+                )
+                
+                # Build context
+                context = await self._build_context(
+                    user_role=user_role,
+                    context_type=session.context_type,
+                    context_ids=session.context_ids
                 )
-                await self.chat_repo.create_session(session)
-            
-            # Get conversation history
-            history = await self.chat_repo.get_messages(str(session.id))
-            
-            # Build context
-            context = await self._build_context(
-                user_role=user_role,
-                context_type=session.context_type,
-                context_ids=session.context_ids
-            )
             
             # Get appropriate prompt
             prompt_name = "chat_candidate" if user_role == UserRole.CANDIDATE else "chat_recruiter"
@@ -84,8 +93,8 @@ class ChatAgent:
             # Build messages
             messages = [{"role": "system", "content": system_prompt}]
             
-            # Add history (last 10 messages)
-            for msg in history[-10:]:
+            # Add history
+            for msg in history:
                 messages.append({
                     "role": msg.role,
                     "content": msg.content
@@ -93,6 +102,11 @@ class ChatAgent:
             
             # Add current message
             messages.append({"role": "user", "content": user_message})
+            user_chat_msg = ChatMessage(
+                session_id=session.id,
+                role=MessageRole.USER,
+                content=user_message
+            )
             
             # Generate response
             response = await self.client.chat.completions.create(
@@ -103,14 +117,6 @@ class ChatAgent:
             
             assistant_message = response.choices[0].message.content
             
-            # Save messages to history
-            user_chat_msg = ChatMessage(
-                session_id=session.id,
-                role=MessageRole.USER,
-                content=user_message
-            )
-            await self.chat_repo.add_message(user_chat_msg)
-            
             # Generate UI components if applicable
             ui_components, actions = await self._generate_ui_components(
                 assistant_message,
@@ -125,7 +131,13 @@ class ChatAgent:
                 ui_components=ui_components,
                 actions=actions
             )
-            await self.chat_repo.add_message(assistant_chat_msg)
+            
+            # Save the turn (and a new session) in a single commit
+            async with unit_of_work():
+                if new_session:
+                    await self.chat_repo.create_session(session)
+                await self.chat_repo.add_message(user_chat_msg)
+                await self.chat_repo.add_message(assistant_chat_msg)
             
             if generation:
                 self.langfuse.end_generation(
@@ -164,30 +176,28 @@ class ChatAgent:
         
         if context_type == "resume":
             # Single resume context
-            resume = await self.resume_repo.get_by_id(str(context_ids[0]))
+            resume = await self.resume_repo.get_summary_by_id(str(context_ids[0]))
             if resume:
                 context["resume_context"] = json.dumps(resume.parsed_data.model_dump())
         
         elif context_type == "job":
             # Single job context
-            job = await self.job_repo.get_by_id(str(context_ids[0]))
+            job = await self.job_repo.get_summary_by_id(str(context_ids[0]))
             if job:
                 context["job_context"] = json.dumps(job.parsed_data.model_dump())
         
         elif context_type == "multi_resume":
             # Multiple resumes context
-            resumes = []
-            for rid in context_ids:
-                resume = await self.resume_repo.get_by_id(str(rid))
-                if resume:
-                    resumes.append(resume.parsed_data.model_dump())
-            context["candidates_context"] = json.dumps(resumes)
+            resumes = await self.resume_repo.get_summaries_by_ids([str(rid) for rid in context_ids])
+            context["candidates_context"] = json.dumps([
+                resume.parsed_data.model_dump() for resume in resumes if resume
+            ])
         
         elif context_type == "resume_job":
             # Resume and job context
             if len(context_ids) >= 2:
-                resume = await self.resume_repo.get_by_id(str(context_ids[0]))
-                job = await self.job_repo.get_by_id(str(context_ids[1]))
+                resume = await self.resume_repo.get_summary_by_id(str(context_ids[0]))
+                job = await self.job_repo.get_summary_by_id(str(context_ids[1]))
                 if resume:
                     context["resume_context"] = json.dumps(resume.parsed_data.model_dump())
                 if job:
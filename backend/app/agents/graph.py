@@ -14,6 +14,7 @@ from app.agents.search_agent import SearchAgent
 from app.agents.chat_agent import ChatAgent
 from app.models.user import UserRole
 from app.services.langfuse_service import LangfuseService
+from app.services.document_service import DocumentService
 
 
 class AgentState(TypedDict):
@@ -26,6 +27,7 @@ class AgentState(TypedDict):
     context_type: Optional[str]
     context_ids: Optional[list]
     file_content: Optional[bytes]
+    file_path: Optional[str]
     file_type: Optional[str]
     file_name: Optional[str]
     
@@ -52,6 +54,7 @@ class AgentGraph:
         self.search = SearchAgent()
         self.chat = ChatAgent()
         self.langfuse = LangfuseService()
+        self.document_service = DocumentService()
         
         # Build the graph
         self.graph = self._build_graph()
@@ -136,16 +139,26 @@ class AgentGraph:
         else:
             return "chat"
     
+    async def _document_text(self, state: AgentState) -> Optional[str]:
+        """Text of the uploaded document: parsed from file_path, or inline file_content"""
+        if state.get("file_path"):
+            return await self.document_service.parse_file(state["file_path"], state.get("file_type") or "")
+        
+        file_content = state.get("file_content")
+        if isinstance(file_content, bytes):
+            return file_content.decode("utf-8")
+        return file_content
+    
     async def _parse_resume_node(self, state: AgentState) -> AgentState:
         """Parse a resume document"""
         try:
-            file_content = state.get("file_content")
-            if not file_content:
+            resume_text = await self._document_text(state)
+            if not resume_text:
                 state["error"] = "No file content provided for resume parsing"
                 return state
             
             resume = await self.resume_parser.parse_resume(
-                resume_text=file_content.decode("utf-8") if isinstance(file_content, bytes) else file_content,
+                resume_text=resume_text,
                 candidate_id=UUID(state["user_id"]),
                 file_name=state.get("file_name"),
                 trace_id=state.get("trace_id")
@@ -177,13 +190,13 @@ class AgentGraph:
     async def _parse_job_node(self, state: AgentState) -> AgentState:
         """Parse a job description"""
         try:
-            file_content = state.get("file_content")
-            if not file_content:
+            job_text = await self._document_text(state)
+            if not job_text:
                 state["error"] = "No file content provided for job parsing"
                 return state
             
             job = await self.job_parser.parse_job(
-                job_text=file_content.decode("utf-8") if isinstance(file_content, bytes) else file_content,
+                job_text=job_text,
                 recruiter_id=UUID(state["user_id"]),
                 file_name=state.get("file_name"),
                 trace_id=state.get("trace_id")
@@ -310,6 +323,7 @@ class AgentGraph:
         context_type: Optional[str] = None,
         context_ids: Optional[list] = None,
         file_content: Optional[bytes] = None,
+        file_path: Optional[str] = None,
         file_type: Optional[str] = None,
         file_name: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -323,6 +337,7 @@ class AgentGraph:
             "context_type": context_type,
             "context_ids": context_ids,
             "file_content": file_content,
+            "file_path": file_path,
             "file_type": file_type,
             "file_name": file_name,
             "intent": "",
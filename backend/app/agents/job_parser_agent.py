@@ -1,6 +1,6 @@
 """Job description parser agent"""
 import json
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 from openai import AsyncOpenAI
 
@@ -8,9 +8,13 @@ from app.config import get_settings
 from app.prompts.loader import PromptManager
 from app.services.langfuse_service import LangfuseService
 from app.services.embedding_service import EmbeddingService
-from app.services.qdrant_service import QdrantService
+from app.services.vector_store import get_vector_store
 from app.models.job import Job, ParsedJob
-from app.db.repositories import JobRepository
+from app.services.fingerprint import text_fingerprint, get_dedup_stats
+from app.services.extraction_cache import get_extraction_cache, make_extraction_key
+from app.services.vector_outbox import get_vector_outbox
+from app.db.repositories import JobRepository, VectorOutboxRepository
+from app.models.outbox import VectorWriteKind
 
 settings = get_settings()
 
@@ -23,17 +27,26 @@ class JobParserAgent:
         self.model = settings.openai_chat_model
         self.langfuse = LangfuseService()
         self.embedding_service = EmbeddingService()
-        self.qdrant_service = QdrantService()
+        self.vector_store = get_vector_store()
         self.job_repo = JobRepository()
+        self.outbox_repo = VectorOutboxRepository()
+        self.extraction_cache = get_extraction_cache()
     
     async def parse_job(
         self,
         job_text: str,
         recruiter_id: UUID,
         file_name: Optional[str] = None,
-        trace_id: Optional[str] = None
+        trace_id: Optional[str] = None,
+        content_sha256: Optional[str] = None
     ) -> Job:
-        """Parse job description text and extract structured data"""
+        """Parse job description text and extract structured data.
+        
+        Uploads whose bytes or normalized text match an existing job skip
+        extraction: the recruiter's own copy is returned as is, and
+        another recruiter's copy donates its parsed data. The vector is
+        written after the database commit by the outbox dispatcher.
+        """
         
         generation = None
         if trace_id:
@@ -45,78 +58,51 @@ class JobParserAgent:
             )
         
         try:
-            # Get prompts
-            system_prompt = PromptManager.get_system_prompt("job_parser")
-            user_prompt = PromptManager.get_user_prompt(
-                "job_parser",
-                job_text=job_text
+            text_sha256 = text_fingerprint(job_text)
+            existing = await self.job_repo.find_by_fingerprint(
+                content_sha256, text_sha256, str(recruiter_id)
             )
             
-            # Parse with LLM
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1
-            )
+            if existing and existing.recruiter_id == recruiter_id:
+                await self._reuse_own_job(existing, trace_id)
+                if generation:
+                    self.langfuse.end_generation(
+                        generation,
+                        output={"job_id": str(existing.id), "deduplicated": True}
+                    )
+                return existing
             
-            parsed_data = json.loads(response.choices[0].message.content)
-            
-            # Create ParsedJob object
-            parsed_job = ParsedJob(
-                title=parsed_data.get("title"),
-                company=parsed_data.get("company"),
-                location=parsed_data.get("location"),
-                required_skills=parsed_data.get("required_skills", []),
-                responsibilities=parsed_data.get("responsibilities", []),
-                qualifications=parsed_data.get("qualifications", []),
-                salary_range=parsed_data.get("salary_range"),
-                job_type=parsed_data.get("job_type")
-            )
+            usage = None
+            if existing:
+                get_dedup_stats().record("jobs", "parse_hit")
+                parsed_job = existing.parsed_data.model_copy(deep=True)
+            else:
+                get_dedup_stats().record("jobs", "miss")
+                parsed_job, usage = await self.extract_job(job_text)
             
             # Create Job object
             job = Job(
                 recruiter_id=recruiter_id,
                 raw_text=job_text,
                 parsed_data=parsed_job,
-                file_name=file_name
-            )
-            
-            # Generate embedding for the job
-            embedding_text = self._create_embedding_text(parsed_job, job_text)
-            embedding = await self.embedding_service.generate_embedding(
-                embedding_text,
-                trace_id=trace_id
+                file_name=file_name,
+                content_sha256=content_sha256,
+                text_sha256=text_sha256
             )
             
-            # Store in Qdrant
-            self.qdrant_service.upsert_job(
-                job_id=job.id,
-                recruiter_id=recruiter_id,
-                embedding=embedding,
-                metadata={
-                    "title": parsed_job.title,
-                    "company": parsed_job.company,
-                    "location": parsed_job.location,
-                    "required_skills": parsed_job.required_skills
-                }
-            )
-            
-            # Store in database
+            # Store in database together with its pending vector write
             await self.job_repo.create(job)
+            get_vector_outbox().notify()
             
             if generation:
                 self.langfuse.end_generation(
                     generation,
                     output={"job_id": str(job.id)},
                     usage={
-                        "input_tokens": response.usage.prompt_tokens,
-                        "output_tokens": response.usage.completion_tokens,
-                        "total_tokens": response.usage.total_tokens
-                    }
+                        "input_tokens": usage.prompt_tokens,
+                        "output_tokens": usage.completion_tokens,
+                        "total_tokens": usage.total_tokens
+                    } if usage else None
                 )
             
             return job
@@ -126,6 +112,108 @@ class JobParserAgent:
                 self.langfuse.end_generation(generation, error=str(e))
             raise
     
+    async def extract_job(self, job_text: str) -> Tuple[ParsedJob, Any]:
+        """Extract structured job data with the LLM; returns the parsed job and token usage.
+        
+        Results are cached by text, model and prompt version; usage is None on a cache hit.
+        """
+        usage = None
+        parsed_data = None
+        if self.extraction_cache is not None:
+            cache_key = make_extraction_key("job_parser", self.model, job_text)
+            parsed_data = self.extraction_cache.get(cache_key)
+        
+        if parsed_data is None:
+            # Get prompts
+            system_prompt = PromptManager.get_system_prompt("job_parser")
+            user_prompt = PromptManager.get_user_prompt(
+                "job_parser",
+                job_text=job_text
+            )
+            
+            # Parse with LLM
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.1
+            )
+            
+            parsed_data = json.loads(response.choices[0].message.content)
+            usage = response.usage
+            if self.extraction_cache is not None:
+                self.extraction_cache.put(cache_key, parsed_data)
+        
+        # Create ParsedJob object
+        parsed_job = ParsedJob(
+            title=parsed_data.get("title"),
+            company=parsed_data.get("company"),
+            location=parsed_data.get("location"),
+            required_skills=parsed_data.get("required_skills", []),
+            responsibilities=parsed_data.get("responsibilities", []),
+            qualifications=parsed_data.get("qualifications", []),
+            salary_range=parsed_data.get("salary_range"),
+            job_type=parsed_data.get("job_type")
+        )
+        
+        return parsed_job, usage
+    
+    @staticmethod
+    def vector_metadata(parsed_job: ParsedJob) -> Dict[str, Any]:
+        """Payload stored alongside the job vector"""
+        return {
+            "title": parsed_job.title,
+            "company": parsed_job.company,
+            "location": parsed_job.location,
+            "required_skills": parsed_job.required_skills,
+            "job_type": parsed_job.job_type,
+            "salary_range": parsed_job.salary_range
+        }
+    
+    async def find_uploaded_job(
+        self,
+        recruiter_id: UUID,
+        content_sha256: str,
+        trace_id: Optional[str] = None
+    ) -> Optional[Job]:
+        """The recruiter's existing job with identical file bytes, checked before parsing the file"""
+        existing = await self.job_repo.find_by_fingerprint(
+            content_sha256, None, str(recruiter_id)
+        )
+        if existing is None or existing.recruiter_id != recruiter_id:
+            return None
+        return await self._reuse_own_job(existing, trace_id)
+    
+    async def _reuse_own_job(self, existing: Job, trace_id: Optional[str]) -> Job:
+        """Count a dedup hit and restore the vector if it was lost, e.g. after a collection rebuild"""
+        get_dedup_stats().record("jobs", "record_hit")
+        if await self.vector_store.get_job_by_id(existing.id) is None:
+            await self.outbox_repo.enqueue(VectorWriteKind.JOB, existing.id)
+            get_vector_outbox().notify()
+        return existing
+    
+    async def index_jobs(self, jobs: List[Job], trace_id: Optional[str] = None) -> None:
+        """Embed jobs in one call and upsert them into the vector store"""
+        if not jobs:
+            return
+        
+        embeddings = await self.embedding_service.generate_embeddings_batch(
+            [self._create_embedding_text(job.parsed_data, job.raw_text) for job in jobs],
+            trace_id=trace_id
+        )
+        await self.vector_store.upsert_jobs_batch([
+            {
+                "job_id": job.id,
+                "recruiter_id": job.recruiter_id,
+                "embedding": embedding,
+                "metadata": self.vector_metadata(job.parsed_data)
+            }
+            for job, embedding in zip(jobs, embeddings)
+        ])
+    
     def _create_embedding_text(self, parsed_job: ParsedJob, raw_text: str) -> str:
         """Create text for embedding from parsed job"""
         parts = []
@@ -1,7 +1,7 @@
 """Resume parser agent"""
 
 import json
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 from openai import AsyncOpenAI
 
@@ -9,9 +9,14 @@ from app.config import get_settings
 from app.prompts.loader import PromptManager
 from app.services.langfuse_service import LangfuseService
 from app.services.embedding_service import EmbeddingService
-from app.services.qdrant_service import QdrantService
+from app.services.vector_store import get_vector_store
+from app.services.document_service import DocumentService
+from app.services.vector_outbox import get_vector_outbox
 from app.models.resume import Resume, ParsedResume
-from app.db.repositories import ResumeRepository
+from app.services.fingerprint import text_fingerprint, get_dedup_stats
+from app.services.extraction_cache import get_extraction_cache, make_extraction_key
+from app.db.repositories import ResumeRepository, VectorOutboxRepository
+from app.models.outbox import VectorWriteKind
 
 settings = get_settings()
 
@@ -24,8 +29,11 @@ class ResumeParserAgent:
         self.model = settings.openai_chat_model
         self.langfuse = LangfuseService()
         self.embedding_service = EmbeddingService()
-        self.qdrant_service = QdrantService()
+        self.vector_store = get_vector_store()
         self.resume_repo = ResumeRepository()
+        self.outbox_repo = VectorOutboxRepository()
+        self.extraction_cache = get_extraction_cache()
+        self.document_service = DocumentService()
 
     async def parse_resume(
         self,
@@ -33,8 +41,15 @@ class ResumeParserAgent:
         candidate_id: UUID,
         file_name: Optional[str] = None,
         trace_id: Optional[str] = None,
+        content_sha256: Optional[str] = None,
     ) -> Resume:
-        """Parse resume text and extract structured data"""
+        """Parse resume text and extract structured data.
+
+        Uploads whose bytes or normalized text match an existing resume
+        skip extraction: the candidate's own copy is returned as is, and
+        another candidate's copy donates its parsed data. The vector is
+        written after the database commit by the outbox dispatcher.
+        """
 
         generation = None
         if trace_id:
@@ -46,73 +61,27 @@ class ResumeParserAgent:
             )
 
         try:
-            # Get prompts
-            system_prompt = PromptManager.get_system_prompt("resume_parser")
-            user_prompt = PromptManager.get_user_prompt(
-                "resume_parser", resume_text=resume_text
+            text_sha256 = text_fingerprint(resume_text)
+            existing = await self.resume_repo.find_by_fingerprint(
+                content_sha256, text_sha256, str(candidate_id)
             )
 
-            # Parse with LLM
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1,
-            )
-
-            parsed_data = json.loads(response.choices[0].message.content)
-
-            # Clean and validate education data
-            education_list = parsed_data.get("education", [])
-            cleaned_education = []
-            for edu in education_list:
-                # Only include education entries that have at least a degree
-                if edu and isinstance(edu, dict) and edu.get("degree"):
-                    cleaned_education.append(
-                        {
-                            "degree": edu.get("degree", ""),
-                            "institution": edu.get("institution")
-                            if edu.get("institution")
-                            else None,
-                            "year": edu.get("year") if edu.get("year") else None,
-                        }
-                    )
-
-            # Clean and validate experience data
-            experience_list = parsed_data.get("experience", [])
-            cleaned_experience = []
-            for exp in experience_list:
-                # Only include experience entries that have at least title and company
-                if (
-                    exp
-                    and isinstance(exp, dict)
-                    and exp.get("title")
-                    and exp.get("company")
-                ):
-                    cleaned_experience.append(
-                        {
-                            "title": exp.get("title", ""),
-                            "company": exp.get("company", ""),
-                            "duration": exp.get("duration", ""),
-                            "description": exp.get("description")
-                            if exp.get("description")
-                            else None,
-                        }
+            if existing and existing.candidate_id == candidate_id:
+                await self._reuse_own_resume(existing, trace_id)
+                if generation:
+                    self.langfuse.end_generation(
+                        generation,
+                        output={"resume_id": str(existing.id), "deduplicated": True},
                     )
+                return existing
 
-            # Create ParsedResume object
-            parsed_resume = ParsedResume(
-                name=parsed_data.get("name"),
-                email=parsed_data.get("email"),
-                phone=parsed_data.get("phone"),
-                skills=parsed_data.get("skills", []),
-                experience=cleaned_experience,
-                education=cleaned_education,
-                summary=parsed_data.get("summary"),
-            )
+            usage = None
+            if existing:
+                get_dedup_stats().record("resumes", "parse_hit")
+                parsed_resume = existing.parsed_data.model_copy(deep=True)
+            else:
+                get_dedup_stats().record("resumes", "miss")
+                parsed_resume, usage = await self.extract_resume(resume_text)
 
             # Create Resume object
             resume = Resume(
@@ -120,38 +89,23 @@ class ResumeParserAgent:
                 raw_text=resume_text,
                 parsed_data=parsed_resume,
                 file_name=file_name,
+                content_sha256=content_sha256,
+                text_sha256=text_sha256,
             )
 
-            # Generate embedding for the resume
-            embedding_text = self._create_embedding_text(parsed_resume, resume_text)
-            embedding = await self.embedding_service.generate_embedding(
-                embedding_text, trace_id=trace_id
-            )
-
-            # Store in Qdrant
-            self.qdrant_service.upsert_resume(
-                resume_id=resume.id,
-                candidate_id=candidate_id,
-                embedding=embedding,
-                metadata={
-                    "name": parsed_resume.name,
-                    "skills": parsed_resume.skills,
-                    "summary": parsed_resume.summary,
-                },
-            )
-
-            # Store in database
+            # Store in database together with its pending vector write
             await self.resume_repo.create(resume)
+            get_vector_outbox().notify()
 
             if generation:
                 self.langfuse.end_generation(
                     generation,
                     output={"resume_id": str(resume.id)},
                     usage={
-                        "input_tokens": response.usage.prompt_tokens,
-                        "output_tokens": response.usage.completion_tokens,
-                        "total_tokens": response.usage.total_tokens,
-                    },
+                        "input_tokens": usage.prompt_tokens,
+                        "output_tokens": usage.completion_tokens,
+                        "total_tokens": usage.total_tokens,
+                    } if usage else None,
                 )
 
             return resume
@@ -161,6 +115,164 @@ class ResumeParserAgent:
                 self.langfuse.end_generation(generation, error=str(e))
             raise
 
+    async def find_uploaded_resume(
+        self,
+        candidate_id: UUID,
+        content_sha256: str,
+        trace_id: Optional[str] = None,
+    ) -> Optional[Resume]:
+        """The candidate's existing resume with identical file bytes, checked before parsing the file"""
+        existing = await self.resume_repo.find_by_fingerprint(
+            content_sha256, None, str(candidate_id)
+        )
+        if existing is None or existing.candidate_id != candidate_id:
+            return None
+        return await self._reuse_own_resume(existing, trace_id)
+
+    async def _reuse_own_resume(self, existing: Resume, trace_id: Optional[str]) -> Resume:
+        """Count a dedup hit and restore the vector if it was lost, e.g. after a collection rebuild"""
+        get_dedup_stats().record("resumes", "record_hit")
+        if await self.vector_store.get_resume_by_id(existing.id) is None:
+            await self.outbox_repo.enqueue(VectorWriteKind.RESUME, existing.id)
+            get_vector_outbox().notify()
+        return existing
+
+    async def index_resumes(self, resumes: List[Resume], trace_id: Optional[str] = None) -> None:
+        """Embed resumes (and their chunks, when enabled) in one call and upsert them into the vector store"""
+        if not resumes:
+            return
+
+        # The summary text covers only the top experiences; chunks make the rest searchable
+        chunked = [
+            self.document_service.chunk_text(resume.raw_text)
+            if settings.resume_chunk_indexing_enabled else []
+            for resume in resumes
+        ]
+        all_embeddings = await self.embedding_service.generate_embeddings_batch(
+            [self._create_embedding_text(r.parsed_data, r.raw_text) for r in resumes]
+            + [chunk for chunks in chunked for chunk in chunks],
+            trace_id=trace_id,
+        )
+        embeddings = all_embeddings[:len(resumes)]
+        chunk_embeddings = all_embeddings[len(resumes):]
+
+        await self.vector_store.upsert_resumes_batch([
+            {
+                "resume_id": resume.id,
+                "candidate_id": resume.candidate_id,
+                "embedding": embedding,
+                "metadata": self.vector_metadata(resume.parsed_data),
+                "sparse_text": self._create_sparse_text(resume.parsed_data, resume.raw_text),
+            }
+            for resume, embedding in zip(resumes, embeddings)
+        ])
+
+        if settings.resume_chunk_indexing_enabled:
+            offset = 0
+            for resume, chunks in zip(resumes, chunked):
+                await self.vector_store.upsert_resume_chunks(
+                    resume_id=resume.id,
+                    candidate_id=resume.candidate_id,
+                    chunk_embeddings=chunk_embeddings[offset:offset + len(chunks)],
+                    metadata=self.vector_metadata(resume.parsed_data),
+                )
+                offset += len(chunks)
+
+    async def extract_resume(self, resume_text: str) -> Tuple[ParsedResume, Any]:
+        """Extract structured resume data with the LLM; returns the parsed resume and token usage.
+
+        Results are cached by text, model and prompt version; usage is None on a cache hit.
+        """
+        usage = None
+        parsed_data = None
+        if self.extraction_cache is not None:
+            cache_key = make_extraction_key("resume_parser", self.model, resume_text)
+            parsed_data = self.extraction_cache.get(cache_key)
+
+        if parsed_data is None:
+            # Get prompts
+            system_prompt = PromptManager.get_system_prompt("resume_parser")
+            user_prompt = PromptManager.get_user_prompt(
+                "resume_parser", resume_text=resume_text
+            )
+
+            # Parse with LLM
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.1,
+            )
+
+            parsed_data = json.loads(response.choices[0].message.content)
+            usage = response.usage
+            if self.extraction_cache is not None:
+                self.extraction_cache.put(cache_key, parsed_data)
+
+        # Clean and validate education data
+        education_list = parsed_data.get("education", [])
+        cleaned_education = []
+        for edu in education_list:
+            # Only include education entries that have at least a degree
+            if edu and isinstance(edu, dict) and edu.get("degree"):
+                cleaned_education.append(
+                    {
+                        "degree": edu.get("degree", ""),
+                        "institution": edu.get("institution")
+                        if edu.get("institution")
+                        else None,
+                        "year": edu.get("year") if edu.get("year") else None,
+                    }
+                )
+
+        # Clean and validate experience data
+        experience_list = parsed_data.get("experience", [])
+        cleaned_experience = []
+        for exp in experience_list:
+            # Only include experience entries that have at least title and company
+            if (
+                exp
+                and isinstance(exp, dict)
+                and exp.get("title")
+                and exp.get("company")
+            ):
+                cleaned_experience.append(
+                    {
+                        "title": exp.get("title", ""),
+                        "company": exp.get("company", ""),
+                        "duration": exp.get("duration", ""),
+                        "description": exp.get("description")
+                        if exp.get("description")
+                        else None,
+                    }
+                )
+
+        # Create ParsedResume object
+        parsed_resume = ParsedResume(
+            name=parsed_data.get("name"),
+            email=parsed_data.get("email"),
+            phone=parsed_data.get("phone"),
+            skills=parsed_data.get("skills", []),
+            experience=cleaned_experience,
+            education=cleaned_education,
+            summary=parsed_data.get("summary"),
+        )
+
+        return parsed_resume, usage
+
+    @staticmethod
+    def vector_metadata(parsed_resume: ParsedResume) -> Dict[str, Any]:
+        """Payload stored alongside the resume vector"""
+        return {
+            "name": parsed_resume.name,
+            "skills": parsed_resume.skills,
+            "summary": parsed_resume.summary,
+            "experience_years": len(parsed_resume.experience),
+        }
+
     def _create_embedding_text(self, parsed_resume: ParsedResume, raw_text: str) -> str:
         """Create text for embedding from parsed resume"""
         parts = []
@@ -182,3 +294,7 @@ class ResumeParserAgent:
             parts.append(raw_text[:2000])
 
         return "\n".join(parts)
+
+    def _create_sparse_text(self, parsed_resume: ParsedResume, raw_text: str) -> str:
+        """Create text for the lexical sparse vector: the embedding text plus every skill token"""
+        return f"{self._create_embedding_text(parsed_resume, raw_text)} {' '.join(parsed_resume.skills)}"
@@ -8,7 +8,8 @@ from app.config import get_settings
 from app.prompts.loader import PromptManager
 from app.services.langfuse_service import LangfuseService
 from app.services.embedding_service import EmbeddingService
-from app.services.qdrant_service import QdrantService
+from app.services.vector_store import VectorStore, get_vector_store, collection_generation
+from app.services.search_cache import get_search_cache, make_search_key
 from app.models.search import CandidateMatch, JobMatch
 from app.db.repositories import ResumeRepository, JobRepository
 
@@ -23,7 +24,8 @@ class SearchAgent:
         self.model = settings.openai_chat_model
         self.langfuse = LangfuseService()
         self.embedding_service = EmbeddingService()
-        self.qdrant_service = QdrantService()
+        self.vector_store = get_vector_store()
+        self.search_cache = get_search_cache()
         self.resume_repo = ResumeRepository()
         self.job_repo = JobRepository()
     
@@ -67,32 +69,29 @@ class SearchAgent:
             ]
             is_show_all = any(keyword in query.lower() for keyword in show_all_keywords)
             
-            # Generate embedding for query
-            query_embedding = await self.embedding_service.generate_embedding(
+            # Search the vector store - no threshold for "show all" queries, otherwise the configured one
+            results = await self._vector_search(
+                VectorStore.RESUMES_COLLECTION,
                 query,
-                trace_id=trace_id
-            )
-            
-            # Search in Qdrant - use 0.0 threshold for "show all" queries, otherwise use lower threshold
-            results = self.qdrant_service.search_candidates(
-                query_embedding=query_embedding,
-                limit=limit,
                 filters=filters,
-                score_threshold=0.0 if is_show_all else 0.1
+                limit=limit,
+                score_threshold=0.0 if is_show_all else settings.search_score_threshold,
+                query_text=None if is_show_all else query,
+                trace_id=trace_id
             )
             
-            print(f"[DEBUG] Qdrant returned {len(results)} results")
+            print(f"[DEBUG] Vector store returned {len(results)} results")
             for r in results:
                 print(f"  - ID: {r['id']}, Score: {r['score']}")
             
+            # Load all matching resumes (without raw text) in one query, in hit order
+            resumes = await self.resume_repo.get_summaries_by_ids([r["id"] for r in results])
+            
             # Convert to CandidateMatch objects
             candidates = []
-            for result in results:
+            for result, resume in zip(results, resumes):
                 payload = result.get("payload", {})
                 
-                # Get full resume data
-                resume = await self.resume_repo.get_by_id(result["id"])
-                
                 match = CandidateMatch(
                     id=UUID(result["id"]),
                     name=payload.get("name", "Unknown"),
@@ -157,18 +156,14 @@ class SearchAgent:
             ]
             is_show_all = any(keyword in query.lower() for keyword in show_all_keywords)
             
-            # Generate embedding for query
-            query_embedding = await self.embedding_service.generate_embedding(
+            # Search the vector store - no threshold for "show all" queries, otherwise the configured one
+            results = await self._vector_search(
+                VectorStore.JOBS_COLLECTION,
                 query,
-                trace_id=trace_id
-            )
-            
-            # Search in Qdrant - use 0.0 threshold for "show all" queries, otherwise use lower threshold
-            results = self.qdrant_service.search_jobs(
-                query_embedding=query_embedding,
-                limit=limit,
                 filters=filters,
-                score_threshold=0.0 if is_show_all else 0.1
+                limit=limit,
+                score_threshold=0.0 if is_show_all else settings.search_score_threshold,
+                trace_id=trace_id
             )
             
             # Convert to JobMatch objects
@@ -202,6 +197,52 @@ class SearchAgent:
                 self.langfuse.end_span(span, error=str(e))
             raise
     
+    async def _vector_search(
+        self,
+        collection_name: str,
+        query: str,
+        filters: Optional[Dict[str, Any]],
+        limit: int,
+        score_threshold: float,
+        query_text: Optional[str] = None,
+        trace_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Embed the query and search a collection; repeated searches are served from the cache"""
+        cache_key = make_search_key(collection_name, query, filters, limit, score_threshold)
+        if self.search_cache is not None:
+            cached = self.search_cache.get(collection_name, cache_key)
+            if cached is not None:
+                print(f"[DEBUG] Search cache hit on {collection_name}")
+                return cached
+        
+        # Read the generation before searching so a concurrent write leaves the entry stale
+        generation = collection_generation(collection_name)
+        
+        query_embedding = await self.embedding_service.generate_embedding(
+            query,
+            trace_id=trace_id
+        )
+        
+        if collection_name == VectorStore.RESUMES_COLLECTION:
+            results = await self.vector_store.search_candidates(
+                query_embedding=query_embedding,
+                limit=limit,
+                filters=filters,
+                score_threshold=score_threshold,
+                query_text=query_text
+            )
+        else:
+            results = await self.vector_store.search_jobs(
+                query_embedding=query_embedding,
+                limit=limit,
+                filters=filters,
+                score_threshold=score_threshold
+            )
+        
+        if self.search_cache is not None:
+            self.search_cache.put(cache_key, generation, results)
+        return results
+    
     async def _generate_candidate_query(self, job_text: str, trace_id: Optional[str]) -> str:
         """Generate a search query from job description"""
         system_prompt = PromptManager.get_system_prompt("search_candidates", version="from_job")
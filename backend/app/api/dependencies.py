@@ -1,10 +1,12 @@
-"""Authentication dependencies"""
+"""Authentication and database dependencies"""
+from typing import AsyncIterator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 
 from app.config import get_settings
 from app.models.user import User, UserRole
+from app.db.database import unit_of_work
 from app.db.repositories import UserRepository
 
 security = HTTPBearer()
@@ -64,3 +66,9 @@ async def get_current_recruiter(
             detail="Access restricted to recruiters only"
         )
     return current_user
+
+
+async def get_unit_of_work() -> AsyncIterator[None]:
+    """Run the endpoint's repository calls on one session, committed when it returns"""
+    async with unit_of_work():
+        yield
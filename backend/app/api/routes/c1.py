@@ -60,7 +60,7 @@ async def c1_chat_completions(request: Request):
     if role == "candidate":
         from app.db.repositories import ResumeRepository
         resume_repo = ResumeRepository()
-        resume = await resume_repo.get_by_candidate_id(str(user.id))
+        resume = await resume_repo.get_summary_by_candidate_id(str(user.id))
         if resume:
             context_info = f"\n\nUser's Resume Summary:\n- Name: {resume.parsed_data.name}\n- Skills: {', '.join(resume.parsed_data.skills[:10]) if resume.parsed_data.skills else 'Not specified'}\n- Experience: {len(resume.parsed_data.experience)} positions"
             if resume.parsed_data.summary:
@@ -77,12 +77,11 @@ async def c1_chat_completions(request: Request):
             from app.agents.search_agent import SearchAgent
             search_agent = SearchAgent()
             try:
-                # Debug: Check Qdrant collection
-                from app.services.qdrant_service import QdrantService
-                qdrant = QdrantService()
+                # Debug: Check vector store collection
+                from app.services.vector_store import get_vector_store
                 try:
-                    collection_info = qdrant.client.get_collection(collection_name="jobs")
-                    print(f"Qdrant jobs collection has {collection_info.points_count} points")
+                    points_count = await get_vector_store().count_points("jobs")
+                    print(f"Vector store jobs collection has {points_count} points")
                 except Exception as e:
                     print(f"Jobs collection error: {e}")
                 
@@ -122,11 +121,10 @@ async def c1_chat_completions(request: Request):
             from app.agents.search_agent import SearchAgent
             search_agent = SearchAgent()
             try:
-                # Debug: Check Qdrant collection
-                from app.services.qdrant_service import QdrantService
-                qdrant = QdrantService()
-                collection_info = qdrant.client.get_collection(collection_name="resumes")
-                print(f"Qdrant resumes collection has {collection_info.points_count} points")
+                # Debug: Check vector store collection
+                from app.services.vector_store import get_vector_store
+                points_count = await get_vector_store().count_points("resumes")
+                print(f"Vector store resumes collection has {points_count} points")
                 
                 candidates = await search_agent.search_candidates(
                     query=user_message,
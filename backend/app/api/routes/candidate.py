@@ -1,32 +1,39 @@
 """Candidate endpoints"""
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form, Response
 
 from app.api.dependencies import get_current_candidate
-from app.schemas.responses import ResumeResponse, JobMatchResponse, ChatMessageResponse
+from app.schemas.responses import ResumeResponse, JobMatchResponse, ChatMessageResponse, IngestionJobResponse
 from app.schemas.requests import ChatMessageRequest
-from app.services.document_service import DocumentService
+from app.services.upload_service import spool_upload, UploadTooLargeError
+from app.services.ingestion_queue import get_ingestion_workers
+from app.api.routes.ingestion import to_ingestion_response
 from app.agents.resume_parser_agent import ResumeParserAgent
 from app.agents.search_agent import SearchAgent
 from app.agents.graph import get_agent_graph
 from app.db.repositories import ResumeRepository
+from app.models.ingestion import IngestionKind
 from app.services.langfuse_service import LangfuseService
 
 router = APIRouter()
-document_service = DocumentService()
 resume_parser = ResumeParserAgent()
 search_agent = SearchAgent()
 resume_repo = ResumeRepository()
 langfuse = LangfuseService()
 
 
-@router.post("/resume/upload", response_model=ResumeResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/resume/upload", response_model=IngestionJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_resume(
+    response: Response,
     file: UploadFile = File(...),
     current_user = Depends(get_current_candidate)
 ):
-    """Upload and parse a resume (PDF or DOCX)"""
+    """Upload a resume (PDF or DOCX) for background parsing.
+    
+    Returns an ingestion job; poll its status_url until it succeeds, then
+    fetch the resume.
+    """
     # Validate file type
     allowed_types = ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
     if file.content_type not in allowed_types:
@@ -36,38 +43,21 @@ async def upload_resume(
         )
     
     try:
-        # Read file content
-        file_content = await file.read()
-        
-        # Create trace
-        trace_id = langfuse.create_trace(
-            name="resume_upload",
-            user_id=str(current_user.id),
-            metadata={"file_name": file.filename, "file_type": file.content_type}
-        )
-        
-        # Parse document
-        raw_text = await document_service.parse_document(file_content, file.content_type)
-        
-        # Parse resume with agent
-        resume = await resume_parser.parse_resume(
-            resume_text=raw_text,
-            candidate_id=current_user.id,
-            file_name=file.filename,
-            trace_id=trace_id
-        )
+        # Stream to a temp file, then hand it to the ingestion queue
+        async with spool_upload(file) as upload:
+            job = await get_ingestion_workers().enqueue(
+                IngestionKind.RESUME, current_user.id, upload, file.filename
+            )
         
-        langfuse.flush()
+        job_response = to_ingestion_response(job)
+        response.headers["Location"] = job_response.status_url
+        return job_response
         
-        return ResumeResponse(
-            id=resume.id,
-            candidate_id=resume.candidate_id,
-            parsed_data=resume.parsed_data.model_dump(),
-            file_name=resume.file_name,
-            created_at=resume.created_at,
-            updated_at=resume.updated_at
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
         )
-        
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -76,7 +66,7 @@ async def upload_resume(
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process resume: {str(e)}"
+            detail=f"Failed to queue resume: {str(e)}"
         )
 
 
@@ -121,7 +111,7 @@ async def upload_resume_text(
 @router.get("/resume", response_model=ResumeResponse)
 async def get_resume(current_user = Depends(get_current_candidate)):
     """Get the current candidate's resume"""
-    resume = await resume_repo.get_by_candidate_id(str(current_user.id))
+    resume = await resume_repo.get_summary_by_candidate_id(str(current_user.id))
     
     if not resume:
         raise HTTPException(
@@ -146,7 +136,7 @@ async def get_job_matches(
 ):
     """Get jobs matching the candidate's resume"""
     # Get candidate's resume
-    resume = await resume_repo.get_by_candidate_id(str(current_user.id))
+    resume = await resume_repo.get_summary_by_candidate_id(str(current_user.id))
     
     if not resume:
         raise HTTPException(
@@ -6,11 +6,12 @@ from fastapi.responses import StreamingResponse
 import json
 import asyncio
 
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user, get_unit_of_work
 from app.schemas.requests import ChatMessageRequest
 from app.schemas.responses import ChatMessageResponse
 from app.agents.graph import get_agent_graph
 from app.db.repositories import ChatRepository
+from app.db.pagination import clamp_page_size
 from app.services.langfuse_service import LangfuseService
 
 router = APIRouter()
@@ -213,9 +214,12 @@ async def recruiter_chat_stream(
 @router.get("/history/{session_id}")
 async def get_chat_history(
     session_id: UUID,
-    current_user = Depends(get_current_user)
+    page_size: Optional[int] = None,
+    page_token: Optional[str] = None,
+    current_user = Depends(get_current_user),
+    _ = Depends(get_unit_of_work)
 ):
-    """Get chat history for a session"""
+    """Get a page of a session's chat history, oldest first"""
     session = await chat_repo.get_session(str(session_id))
     
     if not session:
@@ -230,7 +234,15 @@ async def get_chat_history(
             detail="Access denied"
         )
     
-    messages = await chat_repo.get_messages(str(session_id))
+    try:
+        page = await chat_repo.get_messages_page(
+            str(session_id), clamp_page_size(page_size), page_token
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     return {
         "session_id": session_id,
@@ -241,6 +253,7 @@ async def get_chat_history(
                 "content": msg.content,
                 "created_at": msg.created_at.isoformat()
             }
-            for msg in messages
-        ]
+            for msg in page.items
+        ],
+        "next_page_token": page.next_page_token
     }
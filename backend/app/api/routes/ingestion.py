@@ -0,0 +1,46 @@
+"""Ingestion job status endpoints"""
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, status, Depends
+
+from app.api.dependencies import get_current_user
+from app.schemas.responses import IngestionJobResponse
+from app.db.repositories import IngestionJobRepository
+from app.models.ingestion import IngestionJob
+
+router = APIRouter()
+ingestion_repo = IngestionJobRepository()
+
+
+def to_ingestion_response(job: IngestionJob) -> IngestionJobResponse:
+    """Build the status response for an ingestion job"""
+    return IngestionJobResponse(
+        id=job.id,
+        kind=job.kind.value,
+        status=job.status.value,
+        stage=job.stage.value,
+        attempts=job.attempts,
+        max_attempts=job.max_attempts,
+        file_name=job.file_name,
+        result_id=job.result_id,
+        error=job.error,
+        status_url=f"/api/ingestion/jobs/{job.id}",
+        created_at=job.created_at,
+        updated_at=job.updated_at
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job(
+    job_id: UUID,
+    current_user = Depends(get_current_user)
+):
+    """Poll the status of an upload's ingestion job"""
+    job = await ingestion_repo.get_by_id(str(job_id))
+    
+    if not job or job.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ingestion job not found"
+        )
+    
+    return to_ingestion_response(job)
@@ -1,32 +1,41 @@
 """Recruiter endpoints"""
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form, Response
 
 from app.api.dependencies import get_current_recruiter
-from app.schemas.responses import JobResponse, CandidateMatchResponse, ChatMessageResponse
+from app.schemas.responses import JobResponse, JobListResponse, CandidateMatchResponse, ChatMessageResponse, IngestionJobResponse
 from app.schemas.requests import ChatMessageRequest, SearchQueryRequest
-from app.services.document_service import DocumentService
+from app.services.upload_service import spool_upload, UploadTooLargeError
+from app.services.ingestion_queue import get_ingestion_workers
+from app.services.vector_outbox import get_vector_outbox
+from app.api.routes.ingestion import to_ingestion_response
 from app.agents.job_parser_agent import JobParserAgent
 from app.agents.search_agent import SearchAgent
 from app.agents.graph import get_agent_graph
 from app.db.repositories import JobRepository
+from app.db.pagination import clamp_page_size
+from app.models.ingestion import IngestionKind
 from app.services.langfuse_service import LangfuseService
 
 router = APIRouter()
-document_service = DocumentService()
 job_parser = JobParserAgent()
 search_agent = SearchAgent()
 job_repo = JobRepository()
 langfuse = LangfuseService()
 
 
-@router.post("/job/upload", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/job/upload", response_model=IngestionJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_job(
+    response: Response,
     file: UploadFile = File(...),
     current_user = Depends(get_current_recruiter)
 ):
-    """Upload and parse a job description (PDF or DOCX)"""
+    """Upload a job description (PDF or DOCX) for background parsing.
+    
+    Returns an ingestion job; poll its status_url until it succeeds, then
+    fetch the job.
+    """
     allowed_types = ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
     if file.content_type not in allowed_types:
         raise HTTPException(
@@ -35,34 +44,20 @@ async def upload_job(
         )
     
     try:
-        file_content = await file.read()
-        
-        trace_id = langfuse.create_trace(
-            name="job_upload",
-            user_id=str(current_user.id),
-            metadata={"file_name": file.filename}
-        )
-        
-        raw_text = await document_service.parse_document(file_content, file.content_type)
-        
-        job = await job_parser.parse_job(
-            job_text=raw_text,
-            recruiter_id=current_user.id,
-            file_name=file.filename,
-            trace_id=trace_id
-        )
+        async with spool_upload(file) as upload:
+            job = await get_ingestion_workers().enqueue(
+                IngestionKind.JOB, current_user.id, upload, file.filename
+            )
         
-        langfuse.flush()
+        job_response = to_ingestion_response(job)
+        response.headers["Location"] = job_response.status_url
+        return job_response
         
-        return JobResponse(
-            id=job.id,
-            recruiter_id=job.recruiter_id,
-            parsed_data=job.parsed_data.model_dump(),
-            file_name=job.file_name,
-            created_at=job.created_at,
-            updated_at=job.updated_at
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
         )
-        
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -71,7 +66,7 @@ async def upload_job(
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process job description: {str(e)}"
+            detail=f"Failed to queue job description: {str(e)}"
         )
 
 
@@ -113,22 +108,40 @@ async def upload_job_text(
         )
 
 
-@router.get("/jobs", response_model=List[JobResponse])
-async def get_jobs(current_user = Depends(get_current_recruiter)):
-    """Get all jobs for the current recruiter"""
-    jobs = await job_repo.get_by_recruiter_id(str(current_user.id))
+@router.get("/jobs", response_model=JobListResponse)
+async def get_jobs(
+    page_size: Optional[int] = None,
+    page_token: Optional[str] = None,
+    current_user = Depends(get_current_recruiter)
+):
+    """Get a page of the current recruiter's jobs, newest first.
     
-    return [
-        JobResponse(
-            id=job.id,
-            recruiter_id=job.recruiter_id,
-            parsed_data=job.parsed_data.model_dump(),
-            file_name=job.file_name,
-            created_at=job.created_at,
-            updated_at=job.updated_at
+    When more jobs exist, next_page_token is the page_token for the next page.
+    """
+    try:
+        page = await job_repo.get_page_by_recruiter_id(
+            str(current_user.id), clamp_page_size(page_size), page_token
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-        for job in jobs
-    ]
+    
+    return JobListResponse(
+        jobs=[
+            JobResponse(
+                id=job.id,
+                recruiter_id=job.recruiter_id,
+                parsed_data=job.parsed_data.model_dump(),
+                file_name=job.file_name,
+                created_at=job.created_at,
+                updated_at=job.updated_at
+            )
+            for job in page.items
+        ],
+        next_page_token=page.next_page_token
+    )
 
 
 @router.get("/job/{job_id}", response_model=JobResponse)
@@ -137,7 +150,7 @@ async def get_job(
     current_user = Depends(get_current_recruiter)
 ):
     """Get a specific job"""
-    job = await job_repo.get_by_id(str(job_id))
+    job = await job_repo.get_summary_by_id(str(job_id))
     
     if not job:
         raise HTTPException(
@@ -167,7 +180,7 @@ async def delete_job(
     current_user = Depends(get_current_recruiter)
 ):
     """Delete a job"""
-    job = await job_repo.get_by_id(str(job_id))
+    job = await job_repo.get_summary_by_id(str(job_id))
     
     if not job:
         raise HTTPException(
@@ -182,6 +195,7 @@ async def delete_job(
         )
     
     await job_repo.delete(str(job_id))
+    get_vector_outbox().notify()
 
 
 @router.get("/candidates/search", response_model=List[CandidateMatchResponse])
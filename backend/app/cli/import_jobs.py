@@ -0,0 +1,66 @@
+"""Import a recruiter's job feed from a CSV or JSONL export.
+
+Usage:
+    python -m app.cli.import_jobs feed.csv --recruiter-id <uuid>
+    python -m app.cli.import_jobs feed.jsonl --recruiter-id <uuid> --id-field req_id \
+        --text-fields title,location,body --concurrency 16
+
+Re-importing the same feed updates postings whose text changed, skips
+unchanged ones and removes postings that are no longer in the feed.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+from uuid import UUID
+
+from app.db.database import init_db
+from app.db.repositories import UserRepository
+from app.models.user import UserRole
+from app.services.job_feed_import import DEFAULT_TEXT_FIELDS, JobFeedImporter, iter_feed
+from app.services.vector_store import get_vector_store
+
+
+async def main(args: argparse.Namespace) -> int:
+    await init_db()
+    recruiter = await UserRepository().get_by_id(str(args.recruiter_id))
+    if recruiter is None or recruiter.role != UserRole.RECRUITER:
+        print(f"No recruiter with id {args.recruiter_id}")
+        return 2
+
+    vector_store = get_vector_store()
+    await vector_store.initialize_collections()
+
+    importer = JobFeedImporter(
+        recruiter_id=recruiter.id,
+        extraction_concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        prune=not args.keep_missing
+    )
+    postings = iter_feed(
+        args.feed,
+        feed_format=args.format,
+        id_field=args.id_field,
+        text_fields=[name.strip() for name in args.text_fields.split(",") if name.strip()]
+    )
+    try:
+        report = await importer.run(postings, file_name=Path(args.feed).name)
+    finally:
+        await vector_store.close()
+
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import job postings from a CSV or JSONL feed")
+    parser.add_argument("feed", help="CSV or JSONL export with one posting per row")
+    parser.add_argument("--recruiter-id", type=UUID, required=True, help="Recruiter who owns the postings")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Feed format (default: from the file extension)")
+    parser.add_argument("--id-field", default="external_id", help="Column holding the posting's ATS id")
+    parser.add_argument(
+        "--text-fields", default=",".join(DEFAULT_TEXT_FIELDS),
+        help="Comma-separated columns joined into the posting text"
+    )
+    parser.add_argument("--concurrency", type=int, help="Concurrent LLM extraction calls")
+    parser.add_argument("--batch-size", type=int, help="Postings per embedding/upsert/insert batch")
+    parser.add_argument("--keep-missing", action="store_true", help="Do not remove postings missing from the feed (never done if a row could not be read)")
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
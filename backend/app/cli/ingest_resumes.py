@@ -0,0 +1,75 @@
+"""Bulk-ingest a directory or zip archive of resumes.
+
+Usage:
+    python -m app.cli.ingest_resumes ./resumes.zip
+    python -m app.cli.ingest_resumes ./resumes --batch-size 128 --concurrency 16
+    python -m app.cli.ingest_resumes ./resumes --owners owners.csv
+    python -m app.cli.ingest_resumes ./my-resumes --candidate-id <uuid>
+
+Re-running the same command resumes from the checkpoint file and skips
+documents that were already ingested.
+
+--owners names a CSV with `file` (path relative to the source, or the
+archive member name) and `candidate_id` columns; --candidate-id assigns
+every remaining document to one candidate. A candidate can have only
+one resume, so the run is refused if a candidate would get several
+documents or already has a resume. Documents with no owner are
+ingested as ownerless resumes: recruiters can find them, but they are
+not linked to any candidate account.
+"""
+import argparse
+import asyncio
+from uuid import UUID
+
+from app.db.database import init_db
+from app.db.repositories import UserRepository
+from app.models.user import UserRole
+from app.services.resume_ingestion import ResumeIngestionPipeline, read_owner_manifest
+from app.services.vector_store import get_vector_store
+
+
+async def main(args: argparse.Namespace) -> int:
+    await init_db()
+    if args.candidate_id is not None:
+        candidate = await UserRepository().get_by_id(str(args.candidate_id))
+        if candidate is None or candidate.role != UserRole.CANDIDATE:
+            print(f"No candidate with id {args.candidate_id}")
+            return 2
+    try:
+        owners = read_owner_manifest(args.owners) if args.owners else None
+    except ValueError as e:
+        print(e)
+        return 2
+
+    vector_store = get_vector_store()
+    await vector_store.initialize_collections()
+
+    pipeline = ResumeIngestionPipeline(
+        checkpoint_path=args.checkpoint or f"{args.source.rstrip('/')}.checkpoint.jsonl",
+        parse_workers=args.workers,
+        extraction_concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        candidate_id=args.candidate_id,
+        owners=owners
+    )
+    try:
+        report = await pipeline.run(args.source)
+    except ValueError as e:
+        print(e)
+        return 2
+    finally:
+        await vector_store.close()
+
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-ingest resumes from a directory or zip archive")
+    parser.add_argument("source", help="Directory or .zip archive of PDF/DOCX resumes")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <source>.checkpoint.jsonl)")
+    parser.add_argument("--workers", type=int, help="Parsing processes (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, help="Concurrent LLM extraction calls")
+    parser.add_argument("--batch-size", type=int, help="Documents per embedding/upsert/insert batch")
+    parser.add_argument("--candidate-id", type=UUID, help="Candidate who owns documents not in --owners")
+    parser.add_argument("--owners", help="CSV mapping each document (file) to its owner (candidate_id)")
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
@@ -11,6 +11,22 @@ class Settings(BaseSettings):
     openai_api_key: str = Field(..., env="OPENAI_API_KEY")
     openai_embedding_model: str = Field(default="text-embedding-3-small", env="OPENAI_EMBEDDING_MODEL")
     openai_chat_model: str = Field(default="gpt-4o", env="OPENAI_CHAT_MODEL")
+    openai_embedding_dimensions: int = Field(default=1536, env="OPENAI_EMBEDDING_DIMENSIONS")
+    # Most recent messages sent to the chat model as conversation history
+    chat_history_messages: int = Field(default=10, env="CHAT_HISTORY_MESSAGES")
+    
+    # Listing pages (jobs, chat history); larger requested sizes are capped
+    page_size_default: int = Field(default=50, env="PAGE_SIZE_DEFAULT")
+    page_size_max: int = Field(default=200, env="PAGE_SIZE_MAX")
+    
+    # Embedding Cache Configuration
+    embedding_cache_enabled: bool = Field(default=True, env="EMBEDDING_CACHE_ENABLED")
+    embedding_cache_memory_mb: int = Field(default=64, env="EMBEDDING_CACHE_MEMORY_MB")
+    embedding_cache_path: str | None = Field(default="./embedding_cache.db", env="EMBEDDING_CACHE_PATH")
+    
+    # LLM extraction cache (resume and job parsing)
+    extraction_cache_enabled: bool = Field(default=True, env="EXTRACTION_CACHE_ENABLED")
+    extraction_cache_path: str | None = Field(default="./extraction_cache.db", env="EXTRACTION_CACHE_PATH")
     
     # Thesys Configuration
     thesys_api_key: str = Field(..., env="THESYS_API_KEY")
@@ -19,6 +35,77 @@ class Settings(BaseSettings):
     qdrant_host: str = Field(default="localhost", env="QDRANT_HOST")
     qdrant_port: int = Field(default=6333, env="QDRANT_PORT")
     qdrant_api_key: str | None = Field(default=None, env="QDRANT_API_KEY")
+    qdrant_grpc_port: int = Field(default=6334, env="QDRANT_GRPC_PORT")
+    qdrant_prefer_grpc: bool = Field(default=True, env="QDRANT_PREFER_GRPC")
+    qdrant_grpc_channels: int = Field(default=1, env="QDRANT_GRPC_CHANNELS")
+    qdrant_grpc_keepalive_ms: int = Field(default=30000, env="QDRANT_GRPC_KEEPALIVE_MS")
+    qdrant_timeout: int = Field(default=10, env="QDRANT_TIMEOUT")
+    
+    # Qdrant storage for the resumes collection: quantization is "none", "scalar" (int8) or "binary"
+    qdrant_quantization: str = Field(default="none", env="QDRANT_QUANTIZATION")
+    qdrant_quantization_always_ram: bool = Field(default=True, env="QDRANT_QUANTIZATION_ALWAYS_RAM")
+    qdrant_quantization_oversampling: float = Field(default=2.0, env="QDRANT_QUANTIZATION_OVERSAMPLING")
+    qdrant_quantization_rescore: bool = Field(default=True, env="QDRANT_QUANTIZATION_RESCORE")
+    qdrant_vectors_on_disk: bool = Field(default=False, env="QDRANT_VECTORS_ON_DISK")
+    # Unset keeps Qdrant's own default (payload on disk) and never migrates existing collections
+    qdrant_payload_on_disk: bool | None = Field(default=None, env="QDRANT_PAYLOAD_ON_DISK")
+    
+    # Vector Store Configuration: "qdrant" or "embedded" (NumPy, no server)
+    vector_store_backend: str = Field(default="qdrant", env="VECTOR_STORE_BACKEND")
+    vector_store_path: str | None = Field(default="./vector_store", env="VECTOR_STORE_PATH")
+    vector_store_mmap: bool = Field(default=False, env="VECTOR_STORE_MMAP")
+    vector_upsert_batch_size: int = Field(default=256, env="VECTOR_UPSERT_BATCH_SIZE")
+    vector_upsert_parallel: int = Field(default=4, env="VECTOR_UPSERT_PARALLEL")
+    
+    # Hybrid (dense + sparse lexical) candidate search
+    hybrid_search_enabled: bool = Field(default=True, env="HYBRID_SEARCH_ENABLED")
+    hybrid_rrf_k: int = Field(default=60, env="HYBRID_RRF_K")
+    hybrid_prefetch_multiplier: int = Field(default=2, env="HYBRID_PREFETCH_MULTIPLIER")
+    # Minimum cosine score for dense hits, applied by the vector store ("show all" queries use 0)
+    search_score_threshold: float = Field(default=0.1, env="SEARCH_SCORE_THRESHOLD")
+    
+    # Index resume chunks as child points and score candidates by their best-matching chunk
+    resume_chunk_indexing_enabled: bool = Field(default=False, env="RESUME_CHUNK_INDEXING_ENABLED")
+    # Chunk budgets, measured in chars or (approximate) tokens
+    chunk_size: int = Field(default=1000, env="CHUNK_SIZE")
+    chunk_overlap: int = Field(default=200, env="CHUNK_OVERLAP")
+    chunk_length_unit: str = Field(default="chars", env="CHUNK_LENGTH_UNIT")
+    
+    # Search result cache. Writes invalidate it only in the process that made them; the TTL
+    # bounds how stale other workers can be, so keep it short or run a single worker
+    search_cache_enabled: bool = Field(default=True, env="SEARCH_CACHE_ENABLED")
+    search_cache_max_entries: int = Field(default=1024, env="SEARCH_CACHE_MAX_ENTRIES")
+    search_cache_ttl_seconds: int = Field(default=30, env="SEARCH_CACHE_TTL_SECONDS")
+    
+    # Document parsing worker processes (0 parses in a thread instead)
+    document_parse_workers: int = Field(default=2, env="DOCUMENT_PARSE_WORKERS")
+    document_parse_timeout_seconds: float = Field(default=60, env="DOCUMENT_PARSE_TIMEOUT_SECONDS")
+    document_parse_memory_mb: int | None = Field(default=1024, env="DOCUMENT_PARSE_MEMORY_MB")
+    
+    # Uploads are streamed to temporary files (default: the system temp dir)
+    upload_max_mb: int = Field(default=10, env="UPLOAD_MAX_MB")
+    upload_tmp_dir: str | None = Field(default=None, env="UPLOAD_TMP_DIR")
+    
+    # Bulk resume ingestion (python -m app.cli.ingest_resumes); parse workers default to the CPU count
+    ingest_parse_workers: int | None = Field(default=None, env="INGEST_PARSE_WORKERS")
+    ingest_extraction_concurrency: int = Field(default=8, env="INGEST_EXTRACTION_CONCURRENCY")
+    ingest_batch_size: int = Field(default=64, env="INGEST_BATCH_SIZE")
+    
+    # Background ingestion queue for uploads; running jobs not updated within the lease are retried
+    ingestion_workers: int = Field(default=2, env="INGESTION_WORKERS")
+    ingestion_max_attempts: int = Field(default=3, env="INGESTION_MAX_ATTEMPTS")
+    ingestion_retry_backoff_seconds: float = Field(default=10, env="INGESTION_RETRY_BACKOFF_SECONDS")
+    ingestion_poll_interval_seconds: float = Field(default=2, env="INGESTION_POLL_INTERVAL_SECONDS")
+    ingestion_lease_seconds: float = Field(default=600, env="INGESTION_LEASE_SECONDS")
+    ingestion_storage_dir: str = Field(default="./ingestion_uploads", env="INGESTION_STORAGE_DIR")
+    
+    # Vector writes committed with their rows and applied in the background; failed entries back off exponentially
+    vector_outbox_batch_size: int = Field(default=64, env="VECTOR_OUTBOX_BATCH_SIZE")
+    vector_outbox_max_attempts: int = Field(default=10, env="VECTOR_OUTBOX_MAX_ATTEMPTS")
+    vector_outbox_retry_backoff_seconds: float = Field(default=5, env="VECTOR_OUTBOX_RETRY_BACKOFF_SECONDS")
+    vector_outbox_poll_interval_seconds: float = Field(default=1, env="VECTOR_OUTBOX_POLL_INTERVAL_SECONDS")
+    # Applied entries are persisted (vector store flush) and completed together at most this often
+    vector_outbox_checkpoint_seconds: float = Field(default=5, env="VECTOR_OUTBOX_CHECKPOINT_SECONDS")
     
     # Langfuse Configuration
     langfuse_secret_key: str = Field(..., env="LANGFUSE_SECRET_KEY")
@@ -33,6 +120,19 @@ class Settings(BaseSettings):
     # Database Configuration
     database_url: str = Field(default="sqlite:///./recruitment.db", env="DATABASE_URL")
     
+    # Postgres (postgresql+asyncpg) connection pool; set the statement cache to 0 behind pgbouncer
+    db_pool_size: int = Field(default=10, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=20, env="DB_MAX_OVERFLOW")
+    db_pool_timeout_seconds: float = Field(default=30, env="DB_POOL_TIMEOUT_SECONDS")
+    db_pool_recycle_seconds: int = Field(default=1800, env="DB_POOL_RECYCLE_SECONDS")
+    db_statement_cache_size: int = Field(default=100, env="DB_STATEMENT_CACHE_SIZE")
+    
+    # SQLite pragmas applied to every connection
+    sqlite_journal_mode: str = Field(default="WAL", env="SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: str = Field(default="NORMAL", env="SQLITE_SYNCHRONOUS")
+    sqlite_mmap_size_mb: int = Field(default=256, env="SQLITE_MMAP_SIZE_MB")
+    sqlite_busy_timeout_ms: int = Field(default=5000, env="SQLITE_BUSY_TIMEOUT_MS")
+    
     # Application Configuration
     app_name: str = "AI Recruitment Platform"
     debug: bool = Field(default=False, env="DEBUG")
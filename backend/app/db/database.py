@@ -1,22 +1,197 @@
 """Database connection and initialization"""
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, String, DateTime, JSON, Enum as SQLEnum
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import declarative_base, deferred
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy import Column, String, Integer, DateTime, JSON, Index, Enum as SQLEnum, event, exc, inspect, make_url, text
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
+from typing import AsyncIterator, Optional, Tuple
+import asyncio
 import enum
+import time
 
 from app.config import get_settings
 
 settings = get_settings()
 
-# Convert sqlite:/// to sqlite+aiosqlite:///
-database_url = settings.database_url
-if database_url.startswith("sqlite:///"):
-    database_url = database_url.replace("sqlite:///", "sqlite+aiosqlite:///")
 
-engine = create_async_engine(database_url, echo=settings.debug)
+def async_database_url(url: str) -> str:
+    """Select the async driver: sqlite:/// -> aiosqlite, postgres(ql):// -> asyncpg"""
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    for prefix in ("postgres://", "postgresql://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+class CheckoutStats:
+    """Connection checkout counters, for sizing workers against the database"""
+    
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+    
+    def record(self, wait_seconds: float, timed_out: bool = False) -> None:
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+            self.wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+    
+    def stats(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.timeouts,
+            "avg_checkout_wait_ms": round(1000 * self.wait_seconds / self.checkouts, 3) if self.checkouts else 0.0,
+            "max_checkout_wait_ms": round(1000 * self.max_wait_seconds, 3)
+        }
+
+
+checkout_stats = CheckoutStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that times checkouts, including waits for a free slot and new connections"""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            checkout_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        checkout_stats.record(time.perf_counter() - started)
+        return connection
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Tune each SQLite connection; WAL lets readers proceed while a writer commits"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size_mb * 1024 * 1024}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+    cursor.close()
+
+
+def build_engine(url: str) -> AsyncEngine:
+    """Create the async engine with the profile for its database"""
+    url = make_url(async_database_url(url))
+    
+    if url.get_backend_name() == "sqlite":
+        # In-memory databases keep their single static connection
+        in_memory = url.database in (None, "", ":memory:")
+        sqlite_engine = create_async_engine(
+            url,
+            echo=settings.debug,
+            **({} if in_memory else {"poolclass": InstrumentedQueuePool})
+        )
+        event.listen(sqlite_engine.sync_engine, "connect", _set_sqlite_pragmas)
+        return sqlite_engine
+    
+    if url.get_backend_name() == "postgresql":
+        return create_async_engine(
+            url,
+            echo=settings.debug,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_pre_ping=True,
+            connect_args={
+                # SQLAlchemy's prepared statement cache and asyncpg's own
+                "prepared_statement_cache_size": settings.db_statement_cache_size,
+                "statement_cache_size": settings.db_statement_cache_size
+            }
+        )
+    
+    return create_async_engine(url, echo=settings.debug)
+
+
+engine = build_engine(settings.database_url)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# The active unit of work: its session and the task that opened it
+_unit_of_work: ContextVar[Optional[Tuple[AsyncSession, asyncio.Task]]] = ContextVar("unit_of_work", default=None)
+
+
+def _current_unit_of_work() -> Optional[AsyncSession]:
+    """Session of the unit of work opened by the running task, if any.
+    
+    Tasks spawned inside a unit of work inherit the context variable but
+    not the session: an AsyncSession must not be used concurrently.
+    """
+    active = _unit_of_work.get()
+    if active is not None and active[1] is asyncio.current_task():
+        return active[0]
+    return None
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[AsyncSession]:
+    """Run repository calls on one session and connection, committed once at the end.
+    
+    Inside the block repository writes are flushed, not committed, so
+    they all land in a single transaction that rolls back if the block
+    raises. Nested blocks join the outer unit of work. Keep slow awaits
+    (LLM calls) outside: the connection is held until the block exits.
+    """
+    session = _current_unit_of_work()
+    if session is not None:
+        yield session
+        return
+    
+    async with async_session() as session:
+        token = _unit_of_work.set((session, asyncio.current_task()))
+        try:
+            yield session
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
+        finally:
+            _unit_of_work.reset(token)
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """Session for one repository call: the active unit of work's, or a new one"""
+    session = _current_unit_of_work()
+    if session is not None:
+        yield session
+    else:
+        async with async_session() as session:
+            yield session
+
+
+async def commit(session: AsyncSession) -> None:
+    """Commit a repository write, or only flush it when a unit of work will commit"""
+    if session is _current_unit_of_work():
+        await session.flush()
+    else:
+        await session.commit()
+
+
+def pool_stats() -> dict:
+    """Connection pool occupancy and checkout wait times"""
+    pool = engine.pool
+    stats = {"dialect": engine.dialect.name, "pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow()
+        )
+    stats.update(checkout_stats.stats())
+    return stats
+
 Base = declarative_base()
 
 
@@ -43,10 +218,13 @@ class ResumeTable(Base):
     
     id = Column(String, primary_key=True)
     candidate_id = Column(String, index=True, nullable=False)
-    raw_text = Column(String, nullable=False)
+    # Tens of KB per row: loaded only when a query asks for it (undefer)
+    raw_text = deferred(Column(String, nullable=False), raiseload=True)
     parsed_data = Column(JSON, nullable=False, default={})
     file_name = Column(String, nullable=True)
     file_type = Column(String, nullable=True)
+    content_sha256 = Column(String, index=True, nullable=True)
+    text_sha256 = Column(String, index=True, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -57,11 +235,20 @@ class JobTable(Base):
     
     id = Column(String, primary_key=True)
     recruiter_id = Column(String, index=True, nullable=False)
-    raw_text = Column(String, nullable=False)
+    # Tens of KB per row: loaded only when a query asks for it (undefer)
+    raw_text = deferred(Column(String, nullable=False), raiseload=True)
     parsed_data = Column(JSON, nullable=False, default={})
     file_name = Column(String, nullable=True)
+    content_sha256 = Column(String, index=True, nullable=True)
+    text_sha256 = Column(String, index=True, nullable=True)
+    external_id = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_jobs_recruiter_id_external_id", "recruiter_id", "external_id"),
+        Index("ix_jobs_recruiter_id_created_at_id", "recruiter_id", "created_at", "id"),
+    )
 
 
 class ChatSessionTable(Base):
@@ -81,12 +268,61 @@ class ChatMessageTable(Base):
     __tablename__ = "chat_messages"
     
     id = Column(String, primary_key=True)
-    session_id = Column(String, index=True, nullable=False)
+    session_id = Column(String, nullable=False)
     role = Column(String, nullable=False)
     content = Column(String, nullable=False)
     ui_components = Column(JSON, nullable=False, default=[])
     actions = Column(JSON, nullable=False, default=[])
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Serves history pages and the newest-first recent-history lookup
+        Index("ix_chat_messages_session_id_created_at_id", "session_id", "created_at", "id"),
+    )
+
+
+class IngestionJobTable(Base):
+    """Ingestion job queue table"""
+    __tablename__ = "ingestion_jobs"
+    
+    id = Column(String, primary_key=True)
+    kind = Column(String, nullable=False)
+    owner_id = Column(String, index=True, nullable=False)
+    status = Column(String, nullable=False)
+    stage = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    file_path = Column(String, nullable=False)
+    file_type = Column(String, nullable=False)
+    file_name = Column(String, nullable=True)
+    content_sha256 = Column(String, nullable=True)
+    result_id = Column(String, nullable=True)
+    error = Column(String, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_ingestion_jobs_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+
+class VectorOutboxTable(Base):
+    """Pending vector store writes, committed together with the rows they index"""
+    __tablename__ = "vector_outbox"
+    
+    id = Column(String, primary_key=True)
+    kind = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(String, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_vector_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
 
 
 async def get_db() -> AsyncSession:
@@ -95,7 +331,38 @@ async def get_db() -> AsyncSession:
         yield session
 
 
+# Columns added after tables may already exist; create_all does not alter tables
+ADDED_COLUMNS = {
+    "resumes": ["content_sha256", "text_sha256"],
+    "jobs": ["content_sha256", "text_sha256", "external_id"],
+}
+
+
+def _add_missing_columns(conn) -> None:
+    """Add ADDED_COLUMNS (and their indexes) to tables created by an older version"""
+    inspector = inspect(conn)
+    for table_name, column_names in ADDED_COLUMNS.items():
+        table = Base.metadata.tables[table_name]
+        existing = {column["name"] for column in inspector.get_columns(table_name)}
+        missing = [name for name in column_names if name not in existing]
+        for name in missing:
+            column_type = table.c[name].type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {column_type}"))
+        for index in table.indexes:
+            if any(column.name in missing for column in index.columns):
+                index.create(conn, checkfirst=True)
+
+
+def _create_missing_indexes(conn) -> None:
+    """Create indexes added to tables that already exist; create_all skips them"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_create_missing_indexes)
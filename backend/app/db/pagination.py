@@ -0,0 +1,76 @@
+"""Keyset pagination on (created_at, id)"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import Select, tuple_
+
+from app.config import get_settings
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a listing and the token for the next one (None on the last page)"""
+    items: List[T]
+    next_page_token: Optional[str] = None
+
+
+def encode_page_token(created_at: datetime, row_id: str) -> str:
+    """Opaque token for the position just after a row"""
+    payload = json.dumps({"c": created_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_page_token(token: str) -> Tuple[datetime, str]:
+    """Position encoded by encode_page_token; raises ValueError for a malformed token"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return datetime.fromisoformat(payload["c"]), str(payload["i"])
+    except (binascii.Error, json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError):
+        raise ValueError("Invalid page token")
+
+
+def clamp_page_size(page_size: Optional[int]) -> int:
+    """Default and cap a requested page size"""
+    return max(1, min(page_size or settings.page_size_default, settings.page_size_max))
+
+
+def keyset_page_query(
+    query: Select,
+    table,
+    page_token: Optional[str],
+    page_size: int,
+    descending: bool = False
+) -> Select:
+    """Order a query by (created_at, id), seek past page_token and fetch one extra row.
+
+    Seeking on the key instead of OFFSET keeps every page as cheap as the
+    first, given an index ending in (created_at, id) after the equality
+    filters. Use keyset_page() on the fetched rows.
+    """
+    key = tuple_(table.created_at, table.id)
+    if page_token:
+        created_at, row_id = decode_page_token(page_token)
+        position = tuple_(created_at, row_id)
+        query = query.where(key < position if descending else key > position)
+
+    if descending:
+        query = query.order_by(table.created_at.desc(), table.id.desc())
+    else:
+        query = query.order_by(table.created_at, table.id)
+    return query.limit(page_size + 1)
+
+
+def keyset_page(rows: List, page_size: int) -> Tuple[List, Optional[str]]:
+    """Split the rows of keyset_page_query into the page and the next page token"""
+    if len(rows) <= page_size:
+        return list(rows), None
+    rows = rows[:page_size]
+    return rows, encode_page_token(rows[-1].created_at, rows[-1].id)
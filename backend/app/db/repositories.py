@@ -1,14 +1,53 @@
 """Data access layer repositories"""
-from typing import Optional, List
-from uuid import UUID
-from sqlalchemy import select, update, delete
+from datetime import datetime, timedelta
+from typing import Dict, Optional, List, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy import select, update, delete, or_, case, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, undefer
 
-from app.db.database import async_session, UserTable, ResumeTable, JobTable, ChatSessionTable, ChatMessageTable
+from app.db.pagination import Page, keyset_page, keyset_page_query
+from app.db.database import session_scope, commit, UserTable, ResumeTable, JobTable, ChatSessionTable, ChatMessageTable, IngestionJobTable, VectorOutboxTable
 from app.models.user import User, UserProfile, UserRole
-from app.models.resume import Resume, ParsedResume
-from app.models.job import Job, ParsedJob
+from app.models.resume import Resume, ResumeSummary, ParsedResume
+from app.models.job import Job, JobSummary, ParsedJob
 from app.models.chat import ChatSession, ChatMessage
+from app.models.ingestion import IngestionJob, IngestionKind, IngestionStatus, IngestionStage
+from app.models.outbox import VectorWrite, VectorWriteKind, VectorWriteStatus
+
+
+# Projections for callers that only need parsed data: raw_text and the fingerprint
+# columns are not selected, and touching them raises instead of lazy loading
+_RESUME_SUMMARY = load_only(
+    ResumeTable.id, ResumeTable.candidate_id, ResumeTable.parsed_data,
+    ResumeTable.file_name, ResumeTable.created_at, ResumeTable.updated_at,
+    raiseload=True
+)
+_JOB_SUMMARY = load_only(
+    JobTable.id, JobTable.recruiter_id, JobTable.parsed_data,
+    JobTable.file_name, JobTable.created_at, JobTable.updated_at,
+    raiseload=True
+)
+# Chat messages are returned without their UI components and actions
+_MESSAGE_FIELDS = load_only(
+    ChatMessageTable.id, ChatMessageTable.session_id, ChatMessageTable.role,
+    ChatMessageTable.content, ChatMessageTable.created_at,
+    raiseload=True
+)
+
+
+def _vector_write_row(kind: VectorWriteKind, entity_id) -> VectorOutboxTable:
+    """Outbox row asking the dispatcher to sync an entity's vector with its database row"""
+    now = datetime.utcnow()
+    return VectorOutboxTable(
+        id=str(uuid4()),
+        kind=kind.value,
+        entity_id=str(entity_id),
+        status=VectorWriteStatus.PENDING.value,
+        attempts=0,
+        next_attempt_at=now,
+        created_at=now
+    )
 
 
 class UserRepository:
@@ -16,7 +55,7 @@ class UserRepository:
     
     async def create(self, user: User) -> User:
         """Create a new user"""
-        async with async_session() as session:
+        async with session_scope() as session:
             db_user = UserTable(
                 id=str(user.id),
                 email=user.email,
@@ -26,12 +65,12 @@ class UserRepository:
                 created_at=user.created_at
             )
             session.add(db_user)
-            await session.commit()
+            await commit(session)
             return user
     
     async def get_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID"""
-        async with async_session() as session:
+        async with session_scope() as session:
             result = await session.execute(
                 select(UserTable).where(UserTable.id == str(user_id))
             )
@@ -42,7 +81,7 @@ class UserRepository:
     
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
-        async with async_session() as session:
+        async with session_scope() as session:
             result = await session.execute(
                 select(UserTable).where(UserTable.email == email)
             )
@@ -67,27 +106,125 @@ class ResumeRepository:
     """Resume data access repository"""
     
     async def create(self, resume: Resume) -> Resume:
-        """Create a new resume"""
-        async with async_session() as session:
-            db_resume = ResumeTable(
-                id=str(resume.id),
-                candidate_id=str(resume.candidate_id),
-                raw_text=resume.raw_text,
-                parsed_data=resume.parsed_data.model_dump(),
-                file_name=resume.file_name,
-                file_type=resume.file_type,
-                created_at=resume.created_at,
-                updated_at=resume.updated_at
-            )
-            session.add(db_resume)
-            await session.commit()
+        """Create a new resume and, in the same transaction, queue its vector write"""
+        async with session_scope() as session:
+            session.add(self._to_row(resume))
+            session.add(_vector_write_row(VectorWriteKind.RESUME, resume.id))
+            await commit(session)
             return resume
     
+    async def create_many(self, resumes: List[Resume]) -> List[Resume]:
+        """Create resumes in one transaction, skipping IDs that already exist"""
+        if not resumes:
+            return []
+        
+        async with session_scope() as session:
+            result = await session.execute(
+                select(ResumeTable.id).where(ResumeTable.id.in_([str(r.id) for r in resumes]))
+            )
+            existing = set(result.scalars().all())
+            created = [resume for resume in resumes if str(resume.id) not in existing]
+            session.add_all([self._to_row(resume) for resume in created])
+            await commit(session)
+            return created
+    
     async def get_by_id(self, resume_id: str) -> Optional[Resume]:
         """Get resume by ID"""
-        async with async_session() as session:
+        async with session_scope() as session:
             result = await session.execute(
-                select(ResumeTable).where(ResumeTable.id == str(resume_id))
+                select(ResumeTable)
+                .options(undefer(ResumeTable.raw_text))
+                .where(ResumeTable.id == str(resume_id))
+            )
+            db_resume = result.scalar_one_or_none()
+            if db_resume:
+                return self._to_model(db_resume)
+            return None
+    
+    async def get_by_ids(self, resume_ids: List[str]) -> List[Optional[Resume]]:
+        """Get resumes by IDs in a single query, preserving the input order"""
+        ids = [str(rid) for rid in resume_ids]
+        if not ids:
+            return []
+        
+        async with session_scope() as session:
+            result = await session.execute(
+                select(ResumeTable)
+                .options(undefer(ResumeTable.raw_text))
+                .where(ResumeTable.id.in_(set(ids)))
+            )
+            by_id = {db_resume.id: db_resume for db_resume in result.scalars().all()}
+            return [
+                self._to_model(by_id[rid]) if rid in by_id else None
+                for rid in ids
+            ]
+    
+    async def get_summary_by_id(self, resume_id: str) -> Optional[ResumeSummary]:
+        """Get a resume's parsed data and metadata by ID, without its raw text"""
+        async with session_scope() as session:
+            result = await session.execute(
+                select(ResumeTable)
+                .options(_RESUME_SUMMARY)
+                .where(ResumeTable.id == str(resume_id))
+            )
+            db_resume = result.scalar_one_or_none()
+            if db_resume:
+                return self._to_summary(db_resume)
+            return None
+    
+    async def get_summaries_by_ids(self, resume_ids: List[str]) -> List[Optional[ResumeSummary]]:
+        """Get resume summaries by IDs in a single query, preserving the input order"""
+        ids = [str(rid) for rid in resume_ids]
+        if not ids:
+            return []
+        
+        async with session_scope() as session:
+            result = await session.execute(
+                select(ResumeTable)
+                .options(_RESUME_SUMMARY)
+                .where(ResumeTable.id.in_(set(ids)))
+            )
+            by_id = {db_resume.id: db_resume for db_resume in result.scalars().all()}
+            return [
+                self._to_summary(by_id[rid]) if rid in by_id else None
+                for rid in ids
+            ]
+    
+    async def get_summary_by_candidate_id(self, candidate_id: str) -> Optional[ResumeSummary]:
+        """Get a candidate's resume without its raw text"""
+        async with session_scope() as session:
+            result = await session.execute(
+                select(ResumeTable)
+                .options(_RESUME_SUMMARY)
+                .where(ResumeTable.candidate_id == str(candidate_id))
+            )
+            db_resume = result.scalar_one_or_none()
+            if db_resume:
+                return self._to_summary(db_resume)
+            return None
+    
+    async def find_by_fingerprint(
+        self,
+        content_sha256: Optional[str],
+        text_sha256: Optional[str],
+        candidate_id: str
+    ) -> Optional[Resume]:
+        """Find a resume with the same bytes or text, preferring the candidate's own"""
+        conditions = []
+        if content_sha256:
+            conditions.append(ResumeTable.content_sha256 == content_sha256)
+        if text_sha256:
+            conditions.append(ResumeTable.text_sha256 == text_sha256)
+        if not conditions:
+            return None
+        
+        async with session_scope() as session:
+            result = await session.execute(
+                select(ResumeTable)
+                .options(undefer(ResumeTable.raw_text))
+                .where(or_(*conditions))
+                .order_by(case((ResumeTable.candidate_id == str(candidate_id), 0), else_=1))
+                .limit(1)
             )
             db_resume = result.scalar_one_or_none()
             if db_resume:
@@ -96,9 +233,11 @@ class ResumeRepository:
     
     async def get_by_candidate_id(self, candidate_id: str) -> Optional[Resume]:
         """Get resume by candidate ID"""
-        async with async_session() as session:
+        async with session_scope() as session:
             result = await session.execute(
-                select(ResumeTable).where(ResumeTable.candidate_id == str(candidate_id))
+                select(ResumeTable)
+                .options(undefer(ResumeTable.raw_text))
+                .where(ResumeTable.candidate_id == str(candidate_id))
             )
             db_resume = result.scalar_one_or_none()
             if db_resume:
@@ -106,8 +245,8 @@ class ResumeRepository:
             return None
     
     async def update(self, resume: Resume) -> Resume:
-        """Update a resume"""
-        async with async_session() as session:
+        """Update a resume and queue its vector write"""
+        async with session_scope() as session:
             await session.execute(
                 update(ResumeTable)
                 .where(ResumeTable.id == str(resume.id))
@@ -117,9 +256,36 @@ class ResumeRepository:
                     updated_at=resume.updated_at
                 )
             )
-            await session.commit()
+            session.add(_vector_write_row(VectorWriteKind.RESUME, resume.id))
+            await commit(session)
             return resume
     
+    def _to_row(self, resume: Resume) -> ResumeTable:
+        """Convert model to database row"""
+        return ResumeTable(
+            id=str(resume.id),
+            candidate_id=str(resume.candidate_id),
+            raw_text=resume.raw_text,
+            parsed_data=resume.parsed_data.model_dump(),
+            file_name=resume.file_name,
+            file_type=resume.file_type,
+            content_sha256=resume.content_sha256,
+            text_sha256=resume.text_sha256,
+            created_at=resume.created_at,
+            updated_at=resume.updated_at
+        )
+    
+    def _to_summary(self, db_resume: ResumeTable) -> ResumeSummary:
+        """Convert a summary projection row to model"""
+        return ResumeSummary(
+            id=UUID(db_resume.id),
+            candidate_id=UUID(db_resume.candidate_id),
+            parsed_data=ParsedResume(**db_resume.parsed_data),
+            file_name=db_resume.file_name,
+            created_at=db_resume.created_at,
+            updated_at=db_resume.updated_at
+        )
+    
     def _to_model(self, db_resume: ResumeTable) -> Resume:
         """Convert database row to model"""
         return Resume(
@@ -129,6 +295,8 @@ class ResumeRepository:
             parsed_data=ParsedResume(**db_resume.parsed_data),
             file_name=db_resume.file_name,
             file_type=db_resume.file_type,
+            content_sha256=db_resume.content_sha256,
+            text_sha256=db_resume.text_sha256,
             created_at=db_resume.created_at,
             updated_at=db_resume.updated_at
         )
@@ -138,44 +306,144 @@ class JobRepository:
     """Job data access repository"""
     
     async def create(self, job: Job) -> Job:
-        """Create a new job"""
-        async with async_session() as session:
-            db_job = JobTable(
-                id=str(job.id),
-                recruiter_id=str(job.recruiter_id),
-                raw_text=job.raw_text,
-                parsed_data=job.parsed_data.model_dump(),
-                file_name=job.file_name,
-                created_at=job.created_at,
-                updated_at=job.updated_at
-            )
-            session.add(db_job)
-            await session.commit()
+        """Create a new job and, in the same transaction, queue its vector write"""
+        async with session_scope() as session:
+            session.add(self._to_row(job))
+            session.add(_vector_write_row(VectorWriteKind.JOB, job.id))
+            await commit(session)
             return job
     
+    async def save_many(self, jobs: List[Job]) -> None:
+        """Insert or overwrite jobs in one transaction; the caller writes their vectors"""
+        if not jobs:
+            return
+        
+        async with session_scope() as session:
+            result = await session.execute(
+                select(JobTable.id).where(JobTable.id.in_([str(j.id) for j in jobs]))
+            )
+            existing = set(result.scalars().all())
+            session.add_all([self._to_row(job) for job in jobs if str(job.id) not in existing])
+            updates = [
+                {
+                    "id": str(job.id),
+                    "raw_text": job.raw_text,
+                    "parsed_data": job.parsed_data.model_dump(),
+                    "file_name": job.file_name,
+                    "text_sha256": job.text_sha256,
+                    "external_id": job.external_id,
+                    "updated_at": job.updated_at
+                }
+                for job in jobs if str(job.id) in existing
+            ]
+            if updates:
+                await session.execute(update(JobTable), updates)
+            await commit(session)
+    
+    async def get_external_index(self, recruiter_id: str) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Map a recruiter's feed postings by external id to (job id, text fingerprint)"""
+        async with session_scope() as session:
+            result = await session.execute(
+                select(JobTable.external_id, JobTable.id, JobTable.text_sha256).where(
+                    JobTable.recruiter_id == str(recruiter_id),
+                    JobTable.external_id.is_not(None)
+                )
+            )
+            return {external_id: (job_id, text_sha256) for external_id, job_id, text_sha256 in result.all()}
+    
     async def get_by_id(self, job_id: str) -> Optional[Job]:
         """Get job by ID"""
-        async with async_session() as session:
+        async with session_scope() as session:
             result = await session.execute(
-                select(JobTable).where(JobTable.id == str(job_id))
+                select(JobTable)
+                .options(undefer(JobTable.raw_text))
+                .where(JobTable.id == str(job_id))
             )
             db_job = result.scalar_one_or_none()
             if db_job:
                 return self._to_model(db_job)
             return None
     
-    async def get_by_recruiter_id(self, recruiter_id: str) -> List[Job]:
-        """Get all jobs by recruiter ID"""
-        async with async_session() as session:
+    async def get_summary_by_id(self, job_id: str) -> Optional[JobSummary]:
+        """Get a job's parsed data and metadata by ID, without its raw text"""
+        async with session_scope() as session:
+            result = await session.execute(
+                select(JobTable)
+                .options(_JOB_SUMMARY)
+                .where(JobTable.id == str(job_id))
+            )
+            db_job = result.scalar_one_or_none()
+            if db_job:
+                return self._to_summary(db_job)
+            return None
+    
+    async def get_by_ids(self, job_ids: List[str]) -> List[Optional[Job]]:
+        """Get jobs by IDs in a single query, preserving the input order"""
+        ids = [str(jid) for jid in job_ids]
+        if not ids:
+            return []
+        
+        async with session_scope() as session:
             result = await session.execute(
-                select(JobTable).where(JobTable.recruiter_id == str(recruiter_id))
+                select(JobTable)
+                .options(undefer(JobTable.raw_text))
+                .where(JobTable.id.in_(set(ids)))
             )
-            db_jobs = result.scalars().all()
-            return [self._to_model(db_job) for db_job in db_jobs]
+            by_id = {db_job.id: db_job for db_job in result.scalars().all()}
+            return [
+                self._to_model(by_id[jid]) if jid in by_id else None
+                for jid in ids
+            ]
+    
+    async def find_by_fingerprint(
+        self,
+        content_sha256: Optional[str],
+        text_sha256: Optional[str],
+        recruiter_id: str
+    ) -> Optional[Job]:
+        """Find a job with the same bytes or text, preferring the recruiter's own"""
+        conditions = []
+        if content_sha256:
+            conditions.append(JobTable.content_sha256 == content_sha256)
+        if text_sha256:
+            conditions.append(JobTable.text_sha256 == text_sha256)
+        if not conditions:
+            return None
+        
+        async with session_scope() as session:
+            result = await session.execute(
+                select(JobTable)
+                .options(undefer(JobTable.raw_text))
+                .where(or_(*conditions))
+                .order_by(case((JobTable.recruiter_id == str(recruiter_id), 0), else_=1))
+                .limit(1)
+            )
+            db_job = result.scalar_one_or_none()
+            if db_job:
+                return self._to_model(db_job)
+            return None
+    
+    async def get_page_by_recruiter_id(
+        self,
+        recruiter_id: str,
+        page_size: int,
+        page_token: Optional[str] = None
+    ) -> Page[JobSummary]:
+        """Get one page of a recruiter's jobs, newest first, without their raw text"""
+        async with session_scope() as session:
+            result = await session.execute(keyset_page_query(
+                select(JobTable).options(_JOB_SUMMARY).where(JobTable.recruiter_id == str(recruiter_id)),
+                JobTable,
+                page_token,
+                page_size,
+                descending=True
+            ))
+            rows, next_page_token = keyset_page(result.scalars().all(), page_size)
+            return Page([self._to_summary(db_job) for db_job in rows], next_page_token)
     
     async def update(self, job: Job) -> Job:
-        """Update a job"""
-        async with async_session() as session:
+        """Update a job and queue its vector write"""
+        async with session_scope() as session:
             await session.execute(
                 update(JobTable)
                 .where(JobTable.id == str(job.id))
@@ -184,18 +452,58 @@ class JobRepository:
                     updated_at=job.updated_at
                 )
             )
-            await session.commit()
+            session.add(_vector_write_row(VectorWriteKind.JOB, job.id))
+            await commit(session)
             return job
     
     async def delete(self, job_id: str) -> bool:
-        """Delete a job"""
-        async with async_session() as session:
+        """Delete a job and queue the removal of its vector"""
+        async with session_scope() as session:
             result = await session.execute(
                 delete(JobTable).where(JobTable.id == str(job_id))
             )
-            await session.commit()
+            session.add(_vector_write_row(VectorWriteKind.JOB, job_id))
+            await commit(session)
             return result.rowcount > 0
     
+    async def delete_many(self, job_ids: List[str]) -> int:
+        """Delete jobs in one transaction; the caller removes their vectors"""
+        if not job_ids:
+            return 0
+        
+        async with session_scope() as session:
+            result = await session.execute(
+                delete(JobTable).where(JobTable.id.in_([str(jid) for jid in job_ids]))
+            )
+            await commit(session)
+            return result.rowcount
+    
+    def _to_row(self, job: Job) -> JobTable:
+        """Convert model to database row"""
+        return JobTable(
+            id=str(job.id),
+            recruiter_id=str(job.recruiter_id),
+            raw_text=job.raw_text,
+            parsed_data=job.parsed_data.model_dump(),
+            file_name=job.file_name,
+            content_sha256=job.content_sha256,
+            text_sha256=job.text_sha256,
+            external_id=job.external_id,
+            created_at=job.created_at,
+            updated_at=job.updated_at
+        )
+    
+    def _to_summary(self, db_job: JobTable) -> JobSummary:
+        """Convert a summary projection row to model"""
+        return JobSummary(
+            id=UUID(db_job.id),
+            recruiter_id=UUID(db_job.recruiter_id),
+            parsed_data=ParsedJob(**db_job.parsed_data),
+            file_name=db_job.file_name,
+            created_at=db_job.created_at,
+            updated_at=db_job.updated_at
+        )
+    
     def _to_model(self, db_job: JobTable) -> Job:
         """Convert database row to model"""
         return Job(
@@ -204,6 +512,9 @@ class JobRepository:
             raw_text=db_job.raw_text,
             parsed_data=ParsedJob(**db_job.parsed_data),
             file_name=db_job.file_name,
+            content_sha256=db_job.content_sha256,
+            text_sha256=db_job.text_sha256,
+            external_id=db_job.external_id,
             created_at=db_job.created_at,
             updated_at=db_job.updated_at
         )
@@ -214,7 +525,7 @@ class ChatRepository:
     
     async def create_session(self, session: ChatSession) -> ChatSession:
         """Create a new chat session"""
-        async with async_session() as db:
+        async with session_scope() as db:
             db_session = ChatSessionTable(
                 id=str(session.id),
                 user_id=str(session.user_id),
@@ -224,12 +535,12 @@ class ChatRepository:
                 updated_at=session.updated_at
             )
             db.add(db_session)
-            await db.commit()
+            await commit(db)
             return session
     
     async def get_session(self, session_id: str) -> Optional[ChatSession]:
         """Get chat session by ID"""
-        async with async_session() as db:
+        async with session_scope() as db:
             result = await db.execute(
                 select(ChatSessionTable).where(ChatSessionTable.id == str(session_id))
             )
@@ -247,7 +558,7 @@ class ChatRepository:
     
     async def add_message(self, message: ChatMessage) -> ChatMessage:
         """Add a message to a chat session"""
-        async with async_session() as db:
+        async with session_scope() as db:
             db_message = ChatMessageTable(
                 id=str(message.id),
                 session_id=str(message.session_id),
@@ -258,25 +569,268 @@ class ChatRepository:
                 created_at=message.created_at
             )
             db.add(db_message)
-            await db.commit()
+            await commit(db)
             return message
     
-    async def get_messages(self, session_id: str) -> List[ChatMessage]:
-        """Get all messages for a chat session"""
-        async with async_session() as db:
+    async def get_recent_messages(self, session_id: str, n: int) -> List[ChatMessage]:
+        """Get the last n messages of a chat session, oldest first"""
+        async with session_scope() as db:
             result = await db.execute(
                 select(ChatMessageTable)
+                .options(_MESSAGE_FIELDS)
                 .where(ChatMessageTable.session_id == str(session_id))
-                .order_by(ChatMessageTable.created_at)
+                .order_by(ChatMessageTable.created_at.desc(), ChatMessageTable.id.desc())
+                .limit(n)
             )
-            db_messages = result.scalars().all()
-            return [
-                ChatMessage(
-                    id=UUID(msg.id),
-                    session_id=UUID(msg.session_id),
-                    role=msg.role,
-                    content=msg.content,
-                    created_at=msg.created_at
+            return [self._message_to_model(msg) for msg in reversed(result.scalars().all())]
+    
+    async def get_messages_page(
+        self,
+        session_id: str,
+        page_size: int,
+        page_token: Optional[str] = None
+    ) -> Page[ChatMessage]:
+        """Get one page of a chat session's messages, oldest first"""
+        async with session_scope() as db:
+            result = await db.execute(keyset_page_query(
+                select(ChatMessageTable).options(_MESSAGE_FIELDS).where(ChatMessageTable.session_id == str(session_id)),
+                ChatMessageTable,
+                page_token,
+                page_size
+            ))
+            rows, next_page_token = keyset_page(result.scalars().all(), page_size)
+            return Page([self._message_to_model(msg) for msg in rows], next_page_token)
+    
+    def _message_to_model(self, msg: ChatMessageTable) -> ChatMessage:
+        """Convert database row to model"""
+        return ChatMessage(
+            id=UUID(msg.id),
+            session_id=UUID(msg.session_id),
+            role=msg.role,
+            content=msg.content,
+            created_at=msg.created_at
+        )
+
+
+class IngestionJobRepository:
+    """Ingestion job queue repository"""
+    
+    async def create(self, job: IngestionJob) -> IngestionJob:
+        """Enqueue a new ingestion job"""
+        async with session_scope() as session:
+            session.add(IngestionJobTable(
+                id=str(job.id),
+                kind=job.kind.value,
+                owner_id=str(job.owner_id),
+                status=job.status.value,
+                stage=job.stage.value,
+                attempts=job.attempts,
+                max_attempts=job.max_attempts,
+                file_path=job.file_path,
+                file_type=job.file_type,
+                file_name=job.file_name,
+                content_sha256=job.content_sha256,
+                next_attempt_at=job.next_attempt_at,
+                created_at=job.created_at,
+                updated_at=job.updated_at
+            ))
+            await commit(session)
+            return job
+    
+    async def get_by_id(self, job_id: str) -> Optional[IngestionJob]:
+        """Get ingestion job by ID"""
+        async with session_scope() as session:
+            result = await session.execute(
+                select(IngestionJobTable).where(IngestionJobTable.id == str(job_id))
+            )
+            db_job = result.scalar_one_or_none()
+            if db_job:
+                return self._to_model(db_job)
+            return None
+    
+    async def claim_next(self, lease_seconds: float) -> Optional[IngestionJob]:
+        """Mark the oldest due job as running and return it.
+        
+        Running jobs whose lease expired (the worker died mid-job) are
+        claimed again. The claim is a conditional update, so when several
+        workers race for the same row only one of them gets it.
+        """
+        now = datetime.utcnow()
+        claimable = or_(
+            (IngestionJobTable.status == IngestionStatus.QUEUED.value)
+            & (IngestionJobTable.next_attempt_at <= now),
+            (IngestionJobTable.status == IngestionStatus.RUNNING.value)
+            & (IngestionJobTable.updated_at < now - timedelta(seconds=lease_seconds)),
+        )
+        
+        async with session_scope() as session:
+            result = await session.execute(
+                select(IngestionJobTable.id)
+                .where(claimable)
+                .order_by(IngestionJobTable.next_attempt_at)
+                .limit(1)
+            )
+            job_id = result.scalar_one_or_none()
+            if job_id is None:
+                return None
+            
+            claimed = await session.execute(
+                update(IngestionJobTable)
+                .where(IngestionJobTable.id == job_id, claimable)
+                .values(
+                    status=IngestionStatus.RUNNING.value,
+                    attempts=IngestionJobTable.attempts + 1,
+                    updated_at=now
                 )
-                for msg in db_messages
-            ]
+            )
+            await commit(session)
+            if claimed.rowcount == 0:
+                return None
+        
+        return await self.get_by_id(job_id)
+    
+    async def update_stage(self, job_id: str, stage: IngestionStage) -> None:
+        """Record progress; this also renews the job's lease"""
+        await self._update(job_id, stage=stage.value)
+    
+    async def complete(self, job_id: str, result_id: UUID) -> None:
+        """Mark a job as succeeded"""
+        await self._update(
+            job_id,
+            status=IngestionStatus.SUCCEEDED.value,
+            stage=IngestionStage.DONE.value,
+            result_id=str(result_id),
+            error=None
+        )
+    
+    async def fail(self, job_id: str, error: str) -> None:
+        """Mark a job as permanently failed"""
+        await self._update(job_id, status=IngestionStatus.FAILED.value, error=error)
+    
+    async def retry(self, job_id: str, error: str, delay_seconds: float) -> None:
+        """Put a job back in the queue after a delay"""
+        await self._update(
+            job_id,
+            status=IngestionStatus.QUEUED.value,
+            stage=IngestionStage.QUEUED.value,
+            error=error,
+            next_attempt_at=datetime.utcnow() + timedelta(seconds=delay_seconds)
+        )
+    
+    async def _update(self, job_id: str, **values) -> None:
+        """Update columns of a job, refreshing updated_at"""
+        async with session_scope() as session:
+            await session.execute(
+                update(IngestionJobTable)
+                .where(IngestionJobTable.id == str(job_id))
+                .values(updated_at=datetime.utcnow(), **values)
+            )
+            await commit(session)
+    
+    def _to_model(self, db_job: IngestionJobTable) -> IngestionJob:
+        """Convert database row to model"""
+        return IngestionJob(
+            id=UUID(db_job.id),
+            kind=IngestionKind(db_job.kind),
+            owner_id=UUID(db_job.owner_id),
+            status=IngestionStatus(db_job.status),
+            stage=IngestionStage(db_job.stage),
+            attempts=db_job.attempts,
+            max_attempts=db_job.max_attempts,
+            file_path=db_job.file_path,
+            file_type=db_job.file_type,
+            file_name=db_job.file_name,
+            content_sha256=db_job.content_sha256,
+            result_id=UUID(db_job.result_id) if db_job.result_id else None,
+            error=db_job.error,
+            next_attempt_at=db_job.next_attempt_at,
+            created_at=db_job.created_at,
+            updated_at=db_job.updated_at
+        )
+
+
+class VectorOutboxRepository:
+    """Vector outbox data access repository"""
+    
+    async def enqueue(self, kind: VectorWriteKind, entity_id: UUID) -> None:
+        """Queue a vector write for an entity whose row is not being changed"""
+        async with session_scope() as session:
+            session.add(_vector_write_row(kind, entity_id))
+            await commit(session)
+    
+    async def get_due(self, limit: int, exclude: Optional[List[UUID]] = None) -> List[VectorWrite]:
+        """Oldest pending writes whose retry time has come, skipping the excluded (already applied) ones"""
+        async with session_scope() as session:
+            query = select(VectorOutboxTable).where(
+                VectorOutboxTable.status == VectorWriteStatus.PENDING.value,
+                VectorOutboxTable.next_attempt_at <= datetime.utcnow()
+            )
+            if exclude:
+                query = query.where(VectorOutboxTable.id.notin_([str(i) for i in exclude]))
+            result = await session.execute(
+                query
+                .order_by(VectorOutboxTable.created_at)
+                .limit(limit)
+            )
+            return [self._to_model(row) for row in result.scalars().all()]
+    
+    async def complete(self, entry_ids: List[UUID]) -> None:
+        """Remove applied writes"""
+        if not entry_ids:
+            return
+        async with session_scope() as session:
+            await session.execute(
+                delete(VectorOutboxTable).where(VectorOutboxTable.id.in_([str(i) for i in entry_ids]))
+            )
+            await commit(session)
+    
+    async def retry(self, entry_id: UUID, error: str, delay_seconds: float) -> None:
+        """Count a failed attempt and schedule the next one"""
+        await self._update(
+            entry_id,
+            attempts=VectorOutboxTable.attempts + 1,
+            error=error,
+            next_attempt_at=datetime.utcnow() + timedelta(seconds=delay_seconds)
+        )
+    
+    async def fail(self, entry_id: UUID, error: str) -> None:
+        """Give up on a write; it stays in the table for inspection"""
+        await self._update(
+            entry_id,
+            attempts=VectorOutboxTable.attempts + 1,
+            status=VectorWriteStatus.FAILED.value,
+            error=error
+        )
+    
+    async def counts(self) -> dict:
+        """Number of entries per status"""
+        async with session_scope() as session:
+            result = await session.execute(
+                select(VectorOutboxTable.status, func.count()).group_by(VectorOutboxTable.status)
+            )
+            counts = {status.value: 0 for status in VectorWriteStatus}
+            counts.update(dict(result.all()))
+            return counts
+    
+    async def _update(self, entry_id: UUID, **values) -> None:
+        """Update columns of an outbox entry"""
+        async with session_scope() as session:
+            await session.execute(
+                update(VectorOutboxTable)
+                .where(VectorOutboxTable.id == str(entry_id))
+                .values(**values)
+            )
+            await commit(session)
+    
+    def _to_model(self, row: VectorOutboxTable) -> VectorWrite:
+        """Convert database row to model"""
+        return VectorWrite(
+            id=UUID(row.id),
+            kind=VectorWriteKind(row.kind),
+            entity_id=UUID(row.entity_id),
+            status=VectorWriteStatus(row.status),
+            attempts=row.attempts,
+            error=row.error,
+            next_attempt_at=row.next_attempt_at,
+            created_at=row.created_at
+        )
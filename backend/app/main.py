@@ -5,8 +5,16 @@ from contextlib import asynccontextmanager
 import asyncio
 
 from app.config import get_settings
-from app.api.routes import auth, candidate, recruiter, chat, c1
-from app.db.database import init_db
+from app.api.routes import auth, candidate, recruiter, chat, c1, ingestion
+from app.db.database import init_db, pool_stats
+from app.services.embedding_cache import get_embedding_cache
+from app.services.search_cache import get_search_cache
+from app.services.fingerprint import get_dedup_stats
+from app.services.extraction_cache import get_extraction_cache
+from app.services.ingestion_queue import get_ingestion_workers
+from app.services.vector_outbox import get_vector_outbox
+from app.db.repositories import VectorOutboxRepository
+from app.services.vector_store import get_vector_store
 
 
 @asynccontextmanager
@@ -18,14 +26,18 @@ async def lifespan(app: FastAPI):
     # Initialize database
     await init_db()
     
-    # Initialize Qdrant collections in background (non-blocking)
-    async def init_qdrant():
-        from app.services.qdrant_service import QdrantService
-        qdrant_service = QdrantService()
-        qdrant_service.initialize_collections()
+    # Initialize vector store collections in background (non-blocking)
+    async def init_vector_store():
+        await get_vector_store().initialize_collections()
     
-    # Run Qdrant initialization in background
-    asyncio.create_task(init_qdrant())
+    # Run vector store initialization in background
+    asyncio.create_task(init_vector_store())
+    
+    # Process queued uploads, including any left over from before a restart
+    get_ingestion_workers().start()
+    
+    # Apply vector writes committed with their rows, including any pending before a restart
+    get_vector_outbox().start()
     
     print(f"🚀 {settings.app_name} started successfully!")
     
@@ -33,6 +45,13 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("👋 Shutting down...")
+    await get_ingestion_workers().stop()
+    await get_vector_outbox().stop()
+    await get_vector_store().close()
+    from app.services.qdrant_service import close_qdrant_clients
+    await close_qdrant_clients()
+    from app.services.document_service import get_parser_pool
+    get_parser_pool().shutdown()
 
 
 app = FastAPI(
@@ -62,6 +81,7 @@ app.include_router(candidate.router, prefix="/api/candidate", tags=["Candidate"]
 app.include_router(recruiter.router, prefix="/api/recruiter", tags=["Recruiter"])
 app.include_router(chat.router, prefix="/api/chat", tags=["Chat"])
 app.include_router(c1.router, prefix="/api/c1", tags=["C1 Generative UI"])
+app.include_router(ingestion.router, prefix="/api/ingestion", tags=["Ingestion"])
 
 
 @app.get("/")
@@ -78,3 +98,19 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Cache and performance counters"""
+    embedding_cache = get_embedding_cache()
+    search_cache = get_search_cache()
+    extraction_cache = get_extraction_cache()
+    return {
+        "embedding_cache": embedding_cache.stats() if embedding_cache else None,
+        "search_cache": search_cache.stats() if search_cache else None,
+        "extraction_cache": extraction_cache.stats() if extraction_cache else None,
+        "dedup": get_dedup_stats().stats(),
+        "database": pool_stats(),
+        "vector_outbox": await VectorOutboxRepository().counts()
+    }
@@ -0,0 +1,48 @@
+"""Ingestion job model"""
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel, Field
+from uuid import UUID, uuid4
+
+
+class IngestionKind(str, Enum):
+    """What an ingestion job produces"""
+    RESUME = "resume"
+    JOB = "job"
+
+
+class IngestionStatus(str, Enum):
+    """Ingestion job lifecycle"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class IngestionStage(str, Enum):
+    """Progress of a job through the ingestion steps"""
+    QUEUED = "queued"
+    PARSING = "parsing"
+    EXTRACTING = "extracting"
+    DONE = "done"
+
+
+class IngestionJob(BaseModel):
+    """An uploaded document waiting to be parsed, extracted and indexed"""
+    id: UUID = Field(default_factory=uuid4)
+    kind: IngestionKind
+    owner_id: UUID
+    status: IngestionStatus = IngestionStatus.QUEUED
+    stage: IngestionStage = IngestionStage.QUEUED
+    attempts: int = 0
+    max_attempts: int = 3
+    file_path: str
+    file_type: str
+    file_name: Optional[str] = None
+    content_sha256: Optional[str] = None
+    result_id: Optional[UUID] = None
+    error: Optional[str] = None
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
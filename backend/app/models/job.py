@@ -24,6 +24,9 @@ class Job(BaseModel):
     raw_text: str
     parsed_data: ParsedJob
     file_name: Optional[str] = None
+    content_sha256: Optional[str] = None
+    text_sha256: Optional[str] = None
+    external_id: Optional[str] = None  # posting id in the recruiter's ATS feed
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
@@ -31,6 +34,16 @@ class Job(BaseModel):
         from_attributes = True
 
 
+class JobSummary(BaseModel):
+    """Job without its raw text, for listings and chat context"""
+    id: UUID
+    recruiter_id: UUID
+    parsed_data: ParsedJob
+    file_name: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
 class JobCreate(BaseModel):
     """Job creation schema"""
     raw_text: str
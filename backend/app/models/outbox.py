@@ -0,0 +1,30 @@
+"""Vector outbox model"""
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel, Field
+from uuid import UUID, uuid4
+
+
+class VectorWriteKind(str, Enum):
+    """Entity whose vector is written"""
+    RESUME = "resume"
+    JOB = "job"
+
+
+class VectorWriteStatus(str, Enum):
+    """Outbox entry lifecycle; applied entries are deleted"""
+    PENDING = "pending"
+    FAILED = "failed"
+
+
+class VectorWrite(BaseModel):
+    """A pending write that brings an entity's vector in line with its database row"""
+    id: UUID = Field(default_factory=uuid4)
+    kind: VectorWriteKind
+    entity_id: UUID
+    status: VectorWriteStatus = VectorWriteStatus.PENDING
+    attempts: int = 0
+    error: Optional[str] = None
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -39,6 +39,8 @@ class Resume(BaseModel):
     parsed_data: ParsedResume
     file_name: Optional[str] = None
     file_type: Optional[str] = None
+    content_sha256: Optional[str] = None
+    text_sha256: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
@@ -46,6 +48,16 @@ class Resume(BaseModel):
         from_attributes = True
 
 
+class ResumeSummary(BaseModel):
+    """Resume without its raw text, for listings, search hydration and chat context"""
+    id: UUID
+    candidate_id: UUID
+    parsed_data: ParsedResume
+    file_name: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
 class ResumeCreate(BaseModel):
     """Resume creation schema"""
     raw_text: str
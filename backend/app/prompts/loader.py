@@ -1,4 +1,6 @@
 """YAML prompt loader utility"""
+import hashlib
+import json
 import os
 from typing import Dict, Any, Optional
 from pathlib import Path
@@ -9,6 +11,7 @@ class PromptManager:
     """Manager for loading and caching YAML prompts"""
     
     _cache: Dict[str, Dict[str, Any]] = {}
+    _versions: Dict[str, str] = {}
     _prompts_dir: Path = Path(__file__).parent
     
     @classmethod
@@ -62,7 +65,20 @@ class PromptManager:
         
         return user_prompt
     
+    @classmethod
+    def get_prompt_version(cls, name: str, version: str = "default") -> str:
+        """Content hash of a prompt section; changes whenever its text changes"""
+        cache_key = f"{name}:{version}"
+        
+        if cache_key not in cls._versions:
+            prompt_data = cls.load_prompt(name, version)
+            serialized = json.dumps(prompt_data, sort_keys=True, ensure_ascii=False)
+            cls._versions[cache_key] = hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16]
+        
+        return cls._versions[cache_key]
+    
     @classmethod
     def clear_cache(cls):
         """Clear the prompt cache"""
         cls._cache = {}
+        cls._versions = {}
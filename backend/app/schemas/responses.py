@@ -54,6 +54,28 @@ class JobResponse(BaseModel):
     updated_at: datetime
 
 
+class JobListResponse(BaseModel):
+    """One page of jobs; next_page_token is null on the last page"""
+    jobs: List[JobResponse]
+    next_page_token: Optional[str] = None
+
+
+class IngestionJobResponse(BaseModel):
+    """Ingestion job status; result_id is the resume or job ID once it succeeds"""
+    id: UUID
+    kind: str
+    status: str
+    stage: str
+    attempts: int
+    max_attempts: int
+    file_name: Optional[str] = None
+    result_id: Optional[UUID] = None
+    error: Optional[str] = None
+    status_url: str
+    created_at: datetime
+    updated_at: datetime
+
+
 class UIComponentResponse(BaseModel):
     """UI component for Thesys Gen UI"""
     type: str
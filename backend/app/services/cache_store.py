@@ -0,0 +1,80 @@
+"""Persistent key/value store for local caches"""
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Stay well under SQLite's bound-parameter limit
+_MAX_PARAMS = 500
+
+
+class SqliteCacheStore:
+    """Small SQLite-backed key/value store used as the on-disk tier of local caches"""
+
+    def __init__(self, path: str, table: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a value by key"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """Get the values for keys that exist, in as few queries as possible"""
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _MAX_PARAMS):
+                batch = keys[start:start + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self._conn.execute(
+                    f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})", batch
+                ).fetchall())
+        return found
+
+    def put(self, key: str, value: bytes) -> None:
+        """Insert or replace a value"""
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                (key, value)
+            )
+
+    def put_many(self, items: Iterable[Tuple[str, bytes]]) -> None:
+        """Insert or replace many values in one transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                    items
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def delete(self, key: str) -> None:
+        """Delete a value by key"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
@@ -1,100 +1,214 @@
 """Document parsing service for PDF and DOCX files"""
+import asyncio
 import io
-from typing import Optional
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Optional, Tuple, Union
 import fitz  # PyMuPDF
 from docx import Document
 
+from app.config import get_settings
+from app.services.text_chunker import LENGTH_ESTIMATORS, iter_chunks
+
+PDF_TYPES = ["pdf", "application/pdf"]
+DOCX_TYPES = ["docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
+
+
+class DocumentParseError(ValueError):
+    """The document cannot be parsed: corrupt, unsupported, too large or too slow"""
+
+
+def extract_pdf_text(source: Union[bytes, str]) -> str:
+    """Extract text from PDF bytes or a file path (synchronous, safe to run in a worker process)"""
+    text_parts = []
+    
+    try:
+        # Open by path where possible so pages are read from disk on demand
+        if isinstance(source, (bytes, bytearray)):
+            doc = fitz.open(stream=source, filetype="pdf")
+        else:
+            doc = fitz.open(source, filetype="pdf")
+        
+        for page_num in range(len(doc)):
+            page = doc[page_num]
+            text = page.get_text()
+            if text.strip():
+                text_parts.append(text)
+        
+        doc.close()
+        
+    except Exception as e:
+        raise DocumentParseError(f"Failed to parse PDF: {str(e)}")
+    
+    return "\n\n".join(text_parts)
+
+
+def extract_docx_text(source: Union[bytes, str]) -> str:
+    """Extract text from DOCX bytes or a file path (synchronous, safe to run in a worker process)"""
+    text_parts = []
+    
+    try:
+        if isinstance(source, (bytes, bytearray)):
+            doc = Document(io.BytesIO(source))
+        else:
+            doc = Document(source)
+        
+        for paragraph in doc.paragraphs:
+            if paragraph.text.strip():
+                text_parts.append(paragraph.text)
+        
+        # Also extract from tables
+        for table in doc.tables:
+            for row in table.rows:
+                row_text = []
+                for cell in row.cells:
+                    if cell.text.strip():
+                        row_text.append(cell.text)
+                if row_text:
+                    text_parts.append(" | ".join(row_text))
+        
+    except Exception as e:
+        raise DocumentParseError(f"Failed to parse DOCX: {str(e)}")
+    
+    return "\n\n".join(text_parts)
+
+
+def extract_text(source: Union[bytes, str], file_type: str) -> str:
+    """Extract text from bytes or a file path based on file type (synchronous)"""
+    file_type = file_type.lower()
+    
+    if file_type in PDF_TYPES:
+        return extract_pdf_text(source)
+    elif file_type in DOCX_TYPES:
+        return extract_docx_text(source)
+    else:
+        raise DocumentParseError(f"Unsupported file type: {file_type}")
+
+
+def limit_worker_memory(memory_limit_mb: Optional[int]) -> None:
+    """Process-pool initializer: cap the worker's address space (POSIX only)"""
+    if not memory_limit_mb:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+class DocumentParserPool:
+    """Runs CPU-bound document parsing in worker processes, off the event loop.
+
+    Each call has a timeout; a worker that times out or dies is not
+    reusable, so the pool is torn down and recreated on the next call.
+    With workers=0 parsing runs in a thread instead (no memory limit).
+    """
+    
+    def __init__(self, workers: int, timeout: float, memory_limit_mb: Optional[int] = None):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and client threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=limit_worker_memory,
+                initargs=(self.memory_limit_mb,)
+            )
+        return self._executor
+    
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Kill a pool's workers, including one stuck on a pathological document.
+
+        Other calls still queued or running on it fail with BrokenProcessPool
+        and are retried on a fresh pool.
+        """
+        if self._executor is executor:
+            self._executor = None
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False)
+    
+    async def run(self, func: Callable[..., str], *args: Any) -> str:
+        """Run a parsing function in the pool and return its text"""
+        if self.workers <= 0:
+            return await asyncio.wait_for(asyncio.to_thread(func, *args), self.timeout)
+        
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(executor, func, *args),
+                    self.timeout
+                )
+            except asyncio.TimeoutError:
+                self._discard_executor(executor)
+                raise DocumentParseError(f"Document parsing timed out after {self.timeout}s")
+            except MemoryError:
+                raise DocumentParseError("Document is too large to parse")
+            except BrokenProcessPool:
+                # The pool is shared, so this document may be an innocent victim
+                # of another one's crash or timeout: try once more on a new pool
+                self._discard_executor(executor)
+        raise DocumentParseError("Document parser crashed")
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+@lru_cache()
+def get_parser_pool() -> DocumentParserPool:
+    """Get the process-wide document parser pool"""
+    settings = get_settings()
+    return DocumentParserPool(
+        workers=settings.document_parse_workers,
+        timeout=settings.document_parse_timeout_seconds,
+        memory_limit_mb=settings.document_parse_memory_mb
+    )
+
 
 class DocumentService:
     """Service for parsing PDF and DOCX documents"""
     
     def __init__(self):
-        self.chunk_size = 1000
-        self.chunk_overlap = 200
+        settings = get_settings()
+        self.chunk_size = settings.chunk_size
+        self.chunk_overlap = settings.chunk_overlap
+        # Unit the chunk budgets are measured in: characters or approximate tokens
+        self.length = LENGTH_ESTIMATORS[settings.chunk_length_unit]()
+        self.pool = get_parser_pool()
     
     async def parse_pdf(self, file_content: bytes) -> str:
         """Extract text from PDF file"""
-        text_parts = []
-        
-        try:
-            # Open PDF from bytes
-            doc = fitz.open(stream=file_content, filetype="pdf")
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text = page.get_text()
-                if text.strip():
-                    text_parts.append(text)
-            
-            doc.close()
-            
-        except Exception as e:
-            raise ValueError(f"Failed to parse PDF: {str(e)}")
-        
-        return "\n\n".join(text_parts)
+        return await self.pool.run(extract_pdf_text, file_content)
     
     async def parse_docx(self, file_content: bytes) -> str:
         """Extract text from DOCX file"""
-        text_parts = []
-        
-        try:
-            # Open DOCX from bytes
-            doc = Document(io.BytesIO(file_content))
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text)
-            
-            # Also extract from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            row_text.append(cell.text)
-                    if row_text:
-                        text_parts.append(" | ".join(row_text))
-            
-        except Exception as e:
-            raise ValueError(f"Failed to parse DOCX: {str(e)}")
-        
-        return "\n\n".join(text_parts)
+        return await self.pool.run(extract_docx_text, file_content)
     
     async def parse_document(self, file_content: bytes, file_type: str) -> str:
         """Parse document based on file type"""
-        file_type = file_type.lower()
-        
-        if file_type in ["pdf", "application/pdf"]:
-            return await self.parse_pdf(file_content)
-        elif file_type in ["docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]:
-            return await self.parse_docx(file_content)
-        else:
-            raise ValueError(f"Unsupported file type: {file_type}")
+        return await self.pool.run(extract_text, file_content, file_type)
+    
+    async def parse_file(self, path: str, file_type: str) -> str:
+        """Parse a document on disk; only the path is sent to the worker"""
+        return await self.pool.run(extract_text, path, file_type)
+    
+    def iter_chunks(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Lazily yield (offset, chunk) pairs of overlapping chunks for embedding"""
+        return iter_chunks(text, self.chunk_size, self.chunk_overlap, self.length)
     
     def chunk_text(self, text: str) -> list[str]:
         """Split text into overlapping chunks for embedding"""
-        if len(text) <= self.chunk_size:
-            return [text]
-        
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = start + self.chunk_size
-            
-            # Try to break at sentence boundary
-            if end < len(text):
-                # Look for period, newline, or other sentence boundaries
-                for sep in [". ", "\n\n", "\n", ". ", "! ", "? "]:
-                    last_sep = text[start:end].rfind(sep)
-                    if last_sep > self.chunk_size // 2:
-                        end = start + last_sep + len(sep)
-                        break
-            
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-            
-            start = end - self.chunk_overlap
-        
-        return chunks
+        return [chunk for _, chunk in self.iter_chunks(text)]
@@ -0,0 +1,623 @@
+"""Embedded exact-search vector store backed by NumPy"""
+import asyncio
+import json
+import math
+import os
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+from qdrant_client.http.models import TextIndexParams
+
+from app.services.qdrant_service import PAYLOAD_INDEXES
+from app.services.sparse_encoder import encode_document, encode_query
+from app.services.vector_store import (
+    VectorStore, UpsertAck, reciprocal_rank_fusion, max_sim_fusion, chunk_point_id, bump_generation
+)
+from app.config import get_settings
+
+
+_RANGE_OPS = (("gt", np.greater), ("gte", np.greater_equal), ("lt", np.less), ("lte", np.less_equal))
+
+
+def _filter_terms(value: Any, words: bool) -> Set[Any]:
+    """Terms a payload value is indexed under (or a filter value asks for).
+
+    Text fields match by lowercase words, other fields by the value itself
+    or, for lists, by each item, as the Qdrant filter builder does.
+    """
+    if words:
+        parts = value if isinstance(value, list) else [value]
+        return {word for part in parts if part is not None for word in str(part).lower().split()}
+    values = value if isinstance(value, list) else [value]
+    terms = set()
+    for item in values:
+        try:
+            hash(item)
+        except TypeError:
+            continue
+        terms.add(item)
+    return terms
+
+
+class _Collection:
+    """Vectors in a float32 matrix with payloads stored alongside.
+
+    Deleted rows stay in place, masked out by `alive`, until more than
+    half of the rows are dead. Payload filters use per-field inverted
+    indexes and numeric columns, built on first use and kept up to date
+    by writes; sparse vectors are kept as per-term postings.
+    """
+
+    def __init__(self, name: str, dim: int, path: Optional[Path], mmap: bool):
+        self.name = name
+        self.dim = dim
+        self.path = path
+        self.ids: List[Optional[str]] = []
+        self.index: Dict[str, int] = {}
+        self.payloads: List[Optional[Dict[str, Any]]] = []
+        self.sparse: List[Optional[Dict[int, float]]] = []
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.count = 0
+        self.dirty = False
+        self.text_fields = {
+            field for field, schema in PAYLOAD_INDEXES.get(name, {}).items()
+            if isinstance(schema, TextIndexParams)
+        }
+        # sparse term -> {row: weight}
+        self.postings: Dict[int, Dict[int, float]] = {}
+        # (field, by words) -> term -> rows
+        self._terms: Dict[Tuple[str, bool], Dict[Any, Set[int]]] = {}
+        # field -> float64 column, NaN where the value is not a number
+        self._numbers: Dict[str, np.ndarray] = {}
+
+        if path is not None:
+            self._load(mmap)
+
+    @property
+    def _vectors_file(self) -> Path:
+        return self.path / f"{self.name}.npy"
+
+    @property
+    def _payloads_file(self) -> Path:
+        return self.path / f"{self.name}.json"
+
+    def _load(self, mmap: bool):
+        if not self._vectors_file.exists() or not self._payloads_file.exists():
+            return
+        with open(self._payloads_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.ids = data["ids"]
+        self.payloads = data["payloads"]
+        self.sparse = [
+            {int(i): w for i, w in weights.items()} if weights is not None else None
+            for weights in data.get("sparse", [None] * len(self.ids))
+        ]
+        self.index = {point_id: row for row, point_id in enumerate(self.ids)}
+        self.vectors = np.load(self._vectors_file, mmap_mode="r" if mmap else None)
+        self.count = len(self.ids)
+        self.alive = np.ones(self.count, dtype=bool)
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        """Recreate the sparse postings; payload indexes are rebuilt on next use"""
+        self.postings = {}
+        for row, weights in enumerate(self.sparse):
+            if weights:
+                for i, weight in weights.items():
+                    self.postings.setdefault(i, {})[row] = weight
+        self._terms = {}
+        self._numbers = {}
+
+    def _reserve(self, rows: int):
+        """Grow the matrix (and detach it from a read-only memory map or snapshot) before a write"""
+        capacity = self.vectors.shape[0]
+        if rows <= capacity and isinstance(self.vectors, np.ndarray) and self.vectors.flags.writeable:
+            return
+        new_capacity = max(rows, capacity * 2, 64)
+        grown = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        grown[:self.count] = self.vectors[:self.count]
+        self.vectors = grown
+        self.alive = self._grow(self.alive, new_capacity, False)
+        for field, column in self._numbers.items():
+            self._numbers[field] = self._grow(column, new_capacity, np.nan)
+
+    @staticmethod
+    def _grow(column: np.ndarray, capacity: int, fill: Any) -> np.ndarray:
+        if column.shape[0] >= capacity:
+            return column
+        grown = np.full(capacity, fill, dtype=column.dtype)
+        grown[:column.shape[0]] = column
+        return grown
+
+    def _index_payload(self, row: int, payload: Optional[Dict[str, Any]], add: bool):
+        """Add a row's payload to (or remove it from) the payload indexes built so far"""
+        if payload is None:
+            return
+        for (field, words), index in self._terms.items():
+            for term in _filter_terms(payload.get(field), words):
+                if add:
+                    index.setdefault(term, set()).add(row)
+                else:
+                    rows = index.get(term)
+                    if rows is not None:
+                        rows.discard(row)
+        for field, column in self._numbers.items():
+            value = payload.get(field)
+            column[row] = value if add and isinstance(value, (int, float)) else np.nan
+
+    def upsert(
+        self,
+        point_id: str,
+        vector: List[float],
+        payload: Dict[str, Any],
+        sparse: Optional[Dict[int, float]] = None
+    ):
+        v = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        if norm > 0:
+            v = v / norm
+
+        row = self.index.get(point_id)
+        if row is None:
+            self._reserve(self.count + 1)
+            row = self.count
+            self.count += 1
+            self.ids.append(point_id)
+            self.payloads.append(payload)
+            self.sparse.append(None)
+            self.index[point_id] = row
+        else:
+            self._reserve(self.count)
+            self._index_payload(row, self.payloads[row], add=False)
+            self.payloads[row] = payload
+            self._forget_sparse(row)
+        self._index_payload(row, payload, add=True)
+        self.vectors[row] = v
+        self.alive[row] = True
+        if sparse:
+            self.sparse[row] = sparse
+            for i, weight in sparse.items():
+                self.postings.setdefault(i, {})[row] = weight
+        self.dirty = True
+
+    def delete(self, point_id: str) -> bool:
+        row = self.index.pop(point_id, None)
+        if row is None:
+            return False
+        self._index_payload(row, self.payloads[row], add=False)
+        self.ids[row] = None
+        self.payloads[row] = None
+        self.alive[row] = False
+        self._forget_sparse(row)
+        self.dirty = True
+        if self.count - len(self.index) > self.count // 2:
+            self._compact()
+        return True
+    
+    def _forget_sparse(self, row: int):
+        """Drop a row's sparse vector from the postings"""
+        weights = self.sparse[row]
+        if weights:
+            for i in weights:
+                rows = self.postings.get(i)
+                if rows is not None:
+                    rows.pop(row, None)
+                    if not rows:
+                        del self.postings[i]
+        self.sparse[row] = None
+
+    def _compact(self):
+        """Drop dead rows from memory and renumber the rest"""
+        live = np.flatnonzero(self.alive[:self.count])
+        self.vectors = np.ascontiguousarray(self.vectors[live], dtype=np.float32)
+        self.ids = [self.ids[row] for row in live]
+        self.payloads = [self.payloads[row] for row in live]
+        self.sparse = [self.sparse[row] for row in live]
+        self.index = {point_id: row for row, point_id in enumerate(self.ids)}
+        self.count = len(self.ids)
+        self.alive = np.ones(self.count, dtype=bool)
+        self._rebuild_indexes()
+
+    def get(self, point_id: str) -> Optional[Dict[str, Any]]:
+        row = self.index.get(point_id)
+        if row is None:
+            return None
+        return {"id": point_id, "payload": self.payloads[row]}
+
+    def _term_index(self, field: str, words: bool) -> Dict[Any, Set[int]]:
+        index = self._terms.get((field, words))
+        if index is None:
+            index = {}
+            for row in np.flatnonzero(self.alive[:self.count]):
+                for term in _filter_terms(self.payloads[row].get(field), words):
+                    index.setdefault(term, set()).add(int(row))
+            self._terms[(field, words)] = index
+        return index
+
+    def _number_column(self, field: str) -> np.ndarray:
+        column = self._numbers.get(field)
+        if column is None:
+            column = np.full(self.alive.shape[0], np.nan)
+            for row in np.flatnonzero(self.alive[:self.count]):
+                value = self.payloads[row].get(field)
+                if isinstance(value, (int, float)):
+                    column[row] = value
+            self._numbers[field] = column
+        return column
+
+    def filter_mask(self, filters: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Live rows matching the filters, with the semantics of the Qdrant filter builder"""
+        mask = self.alive[:self.count].copy()
+        for key, expected in (filters or {}).items():
+            if isinstance(expected, dict):
+                column = self._number_column(key)[:self.count]
+                mask &= ~np.isnan(column)
+                for op, compare in _RANGE_OPS:
+                    if expected.get(op) is not None:
+                        with np.errstate(invalid="ignore"):
+                            mask &= compare(column, expected[op])
+                continue
+
+            words = key in self.text_fields and not isinstance(expected, list)
+            terms = _filter_terms(expected, words)
+            if not terms:
+                continue
+            index = self._term_index(key, words)
+            rows = set.intersection(*(index.get(term, set()) for term in terms))
+            matched = np.zeros(self.count, dtype=bool)
+            matched[np.fromiter(rows, dtype=np.int64, count=len(rows))] = True
+            mask &= matched
+        return mask
+
+    def search(
+        self,
+        query: List[float],
+        limit: int,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[tuple]:
+        """Exact top-k cosine search: one matmul plus argpartition"""
+        if self.count == 0 or limit <= 0:
+            return []
+
+        q = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm > 0:
+            q = q / norm
+
+        candidates = np.flatnonzero(self.filter_mask(filters))
+        if candidates.size == 0:
+            return []
+
+        k = min(limit, candidates.size)
+        candidate_scores = (self.vectors[:self.count] @ q)[candidates]
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[np.argsort(-candidate_scores[top])]
+        return [(candidates[i], float(candidate_scores[i])) for i in top]
+
+    def sparse_search(
+        self,
+        query_indices: List[int],
+        limit: int,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[tuple]:
+        """Lexical top-k: sum of IDF-weighted term weights, as Qdrant's IDF modifier scores it"""
+        if not query_indices or limit <= 0 or self.count == 0:
+            return []
+        
+        # Only the postings of the query terms are touched
+        total = len(self.index)
+        scores = np.zeros(self.count, dtype=np.float64)
+        for i in set(query_indices):
+            rows = self.postings.get(i)
+            if not rows:
+                continue
+            df = len(rows)
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            scores[np.fromiter(rows.keys(), dtype=np.int64, count=df)] += (
+                idf * np.fromiter(rows.values(), dtype=np.float64, count=df)
+            )
+        
+        valid = scores > 0
+        if filters:
+            valid &= self.filter_mask(filters)
+        candidates = np.flatnonzero(valid)
+        if candidates.size == 0:
+            return []
+        
+        k = min(limit, candidates.size)
+        candidate_scores = scores[candidates]
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[np.argsort(-candidate_scores[top], kind="stable")]
+        return [(candidates[i], float(candidate_scores[i])) for i in top]
+    
+    def snapshot(self) -> Optional[tuple]:
+        """Capture the state to persist, or None when nothing changed.
+
+        Cheap enough for the event loop: the matrix is handed over as is and
+        frozen, so the next write copies it instead of changing the snapshot.
+        """
+        if self.path is None or not self.dirty:
+            return None
+        self.dirty = False
+        vectors = self.vectors
+        if isinstance(vectors, np.ndarray) and vectors.flags.writeable:
+            vectors.flags.writeable = False
+        live = np.flatnonzero(self.alive[:self.count])
+        return vectors, live, list(self.ids), list(self.payloads), list(self.sparse)
+
+    def write(self, vectors: np.ndarray, live: np.ndarray, ids: list, payloads: list, sparse: list):
+        """Write a snapshot's live rows to disk (blocking; run it in a thread)"""
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        tmp_vectors = self._vectors_file.with_suffix(".npy.tmp")
+        with open(tmp_vectors, "wb") as f:
+            np.save(f, np.ascontiguousarray(vectors[live], dtype=np.float32))
+        os.replace(tmp_vectors, self._vectors_file)
+
+        tmp_payloads = self._payloads_file.with_suffix(".json.tmp")
+        with open(tmp_payloads, "w", encoding="utf-8") as f:
+            json.dump({
+                "ids": [ids[row] for row in live],
+                "payloads": [payloads[row] for row in live],
+                "sparse": [sparse[row] for row in live],
+            }, f)
+        os.replace(tmp_payloads, self._payloads_file)
+
+
+class EmbeddedVectorStore(VectorStore):
+    """Serverless vector store for tests, benchmarks and small single-box deployments.
+
+    Vectors live in a NumPy float32 matrix (optionally memory-mapped from
+    disk) and searches are exact. Writes are kept in memory and persisted
+    by flush(), which also runs on close(); only changed collections are
+    written, in a worker thread.
+    """
+
+    def __init__(self, path: Optional[str] = None, mmap: bool = False):
+        self.path = Path(path) if path else None
+        self.mmap = mmap
+        self.collections: Dict[str, _Collection] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+    def _collection(self, name: str) -> _Collection:
+        if name not in self.collections:
+            self.collections[name] = _Collection(name, self.VECTOR_SIZE, self.path, self.mmap)
+        return self.collections[name]
+
+    async def initialize_collections(self):
+        """Load collections from disk"""
+        for collection_name in (self.RESUMES_COLLECTION, self.JOBS_COLLECTION, self.RESUME_CHUNKS_COLLECTION):
+            self._collection(collection_name)
+
+    async def upsert_resume(
+        self,
+        resume_id: UUID,
+        candidate_id: UUID,
+        embedding: List[float],
+        metadata: Dict[str, Any],
+        sparse_text: Optional[str] = None
+    ) -> bool:
+        """Upsert a resume embedding"""
+        sparse = None
+        if sparse_text is not None and get_settings().hybrid_search_enabled:
+            sparse = dict(zip(*encode_document(sparse_text)))
+        
+        self._collection(self.RESUMES_COLLECTION).upsert(
+            str(resume_id),
+            embedding,
+            {"candidate_id": str(candidate_id), "type": "resume", **metadata},
+            sparse
+        )
+        bump_generation(self.RESUMES_COLLECTION)
+        return True
+
+    async def upsert_resume_chunks(
+        self,
+        resume_id: UUID,
+        candidate_id: UUID,
+        chunk_embeddings: List[List[float]],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """Upsert a resume's chunk points, then delete chunks left over from a longer version"""
+        collection = self._collection(self.RESUME_CHUNKS_COLLECTION)
+        for index, embedding in enumerate(chunk_embeddings):
+            collection.upsert(
+                chunk_point_id(resume_id, index),
+                embedding,
+                {
+                    "resume_id": str(resume_id),
+                    "candidate_id": str(candidate_id),
+                    "chunk_index": index,
+                    "type": "resume_chunk",
+                    **metadata
+                }
+            )
+        self._delete_chunks(resume_id, start=len(chunk_embeddings))
+        bump_generation(self.RESUMES_COLLECTION)
+        return True
+
+    def _delete_chunks(self, resume_id: UUID, start: int = 0):
+        """Chunk IDs are sequential per resume, so stale ones end at the first gap"""
+        collection = self._collection(self.RESUME_CHUNKS_COLLECTION)
+        index = start
+        while collection.delete(chunk_point_id(resume_id, index)):
+            index += 1
+
+    async def upsert_job(
+        self,
+        job_id: UUID,
+        recruiter_id: UUID,
+        embedding: List[float],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """Upsert a job embedding"""
+        self._collection(self.JOBS_COLLECTION).upsert(
+            str(job_id),
+            embedding,
+            {"recruiter_id": str(recruiter_id), "type": "job", **metadata}
+        )
+        bump_generation(self.JOBS_COLLECTION)
+        return True
+
+    async def upsert_resumes_batch(
+        self,
+        items: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        parallel: Optional[int] = None,
+        wait: bool = True
+    ) -> UpsertAck:
+        """Upsert many resumes; writes are in-memory until flush()"""
+        ack = UpsertAck(collection_name=self.RESUMES_COLLECTION, batches=1)
+        for item in items:
+            await self.upsert_resume(**item)
+            ack.points += 1
+        return ack
+
+    async def upsert_jobs_batch(
+        self,
+        items: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        parallel: Optional[int] = None,
+        wait: bool = True
+    ) -> UpsertAck:
+        """Upsert many jobs; writes are in-memory until flush()"""
+        ack = UpsertAck(collection_name=self.JOBS_COLLECTION, batches=1)
+        for item in items:
+            await self.upsert_job(**item)
+            ack.points += 1
+        return ack
+
+    def _search(
+        self,
+        collection_name: str,
+        query_embedding: List[float],
+        limit: int,
+        filters: Optional[Dict[str, Any]],
+        score_threshold: float
+    ) -> List[Dict[str, Any]]:
+        collection = self._collection(collection_name)
+        return [
+            {
+                "id": collection.ids[row],
+                "score": score,
+                "payload": collection.payloads[row]
+            }
+            for row, score in collection.search(query_embedding, limit, filters)
+            if score >= score_threshold
+        ]
+
+    async def search_candidates(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: float = 0.3,
+        query_text: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Search for candidates using semantic similarity, fused with lexical matches when enabled"""
+        settings = get_settings()
+        if not query_text or not settings.hybrid_search_enabled:
+            return self._dense_search_candidates(query_embedding, limit, filters, score_threshold)
+        
+        prefetch = limit * settings.hybrid_prefetch_multiplier
+        collection = self._collection(self.RESUMES_COLLECTION)
+        dense = self._dense_search_candidates(query_embedding, prefetch, filters, score_threshold)
+        query_indices, _ = encode_query(query_text)
+        sparse = [
+            {"id": collection.ids[row], "score": score, "payload": collection.payloads[row]}
+            for row, score in collection.sparse_search(query_indices, prefetch, filters)
+        ]
+        return reciprocal_rank_fusion([dense, sparse], limit, k=settings.hybrid_rrf_k)
+
+    def _dense_search_candidates(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        filters: Optional[Dict[str, Any]],
+        score_threshold: float
+    ) -> List[Dict[str, Any]]:
+        """Rank resumes by their summary vector and, when chunks are indexed, their best chunk"""
+        resumes = self._search(self.RESUMES_COLLECTION, query_embedding, limit, filters, score_threshold)
+        if not get_settings().resume_chunk_indexing_enabled:
+            return resumes
+        
+        # Take the top chunks, keeping each resume's best one; widen the window only
+        # when too few distinct resumes are in it
+        collection = self._collection(self.RESUME_CHUNKS_COLLECTION)
+        live = len(collection.index)
+        chunks_per_resume = max(1, math.ceil(live / max(1, len(self._collection(self.RESUMES_COLLECTION).index))))
+        window = limit * chunks_per_resume
+        while True:
+            hits = collection.search(query_embedding, window, filters)
+            chunks: Dict[str, Dict[str, Any]] = {}
+            for row, score in hits:
+                if score < score_threshold or len(chunks) >= limit:
+                    break
+                resume_id = collection.payloads[row]["resume_id"]
+                if resume_id not in chunks:
+                    chunks[resume_id] = {"id": resume_id, "score": score, "payload": collection.payloads[row]}
+            if len(chunks) >= limit or len(hits) < window or window >= live or (hits and hits[-1][1] < score_threshold):
+                break
+            window *= 2
+        return max_sim_fusion([resumes, list(chunks.values())], limit)
+
+    async def search_jobs(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: float = 0.3
+    ) -> List[Dict[str, Any]]:
+        """Search for jobs using semantic similarity"""
+        return self._search(self.JOBS_COLLECTION, query_embedding, limit, filters, score_threshold)
+
+    async def get_resume_by_id(self, resume_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get a resume by ID"""
+        return self._collection(self.RESUMES_COLLECTION).get(str(resume_id))
+
+    async def get_job_by_id(self, job_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get a job by ID"""
+        return self._collection(self.JOBS_COLLECTION).get(str(job_id))
+
+    async def delete_resume(self, resume_id: UUID) -> bool:
+        """Delete a resume and its chunks"""
+        self._collection(self.RESUMES_COLLECTION).delete(str(resume_id))
+        self._delete_chunks(resume_id)
+        bump_generation(self.RESUMES_COLLECTION)
+        return True
+
+    async def delete_job(self, job_id: UUID) -> bool:
+        """Delete a job"""
+        self._collection(self.JOBS_COLLECTION).delete(str(job_id))
+        bump_generation(self.JOBS_COLLECTION)
+        return True
+
+    async def count_points(self, collection_name: str) -> int:
+        """Number of points stored in a collection"""
+        return len(self._collection(collection_name).index)
+
+    async def flush(self, ack: Optional[UpsertAck] = None):
+        """Persist the collections changed since the last flush.
+
+        Writes that land while a collection is being written mark it dirty
+        again, so the next flush persists them.
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            for collection in self.collections.values():
+                snapshot = collection.snapshot()
+                if snapshot is None:
+                    continue
+                try:
+                    await asyncio.to_thread(collection.write, *snapshot)
+                except BaseException:
+                    collection.dirty = True
+                    raise
+
+    async def close(self):
+        """Persist pending writes"""
+        await self.flush()
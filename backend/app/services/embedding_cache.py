@@ -0,0 +1,164 @@
+"""Content-addressed embedding cache"""
+import asyncio
+import hashlib
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from app.config import get_settings
+from app.services.cache_store import SqliteCacheStore
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different inputs share a cache entry"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_cache_key(model: str, dimensions: int, text: str) -> str:
+    """Build the content-addressed key for an embedding"""
+    digest = hashlib.sha256()
+    digest.update(f"{model}\x00{dimensions}\x00".encode("utf-8"))
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def pack_embedding(embedding: List[float]) -> bytes:
+    """Encode an embedding as a float32 blob"""
+    return array("f", embedding).tobytes()
+
+
+def unpack_embedding(blob: bytes) -> List[float]:
+    """Decode a float32 blob back into an embedding"""
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: in-process LRU over a persistent SQLite store.
+
+    get/put touch the disk synchronously; on the event loop use get_many and
+    put_many, which run the disk tier in a thread and batch its writes.
+    """
+
+    def __init__(self, max_memory_bytes: int, path: Optional[str] = None):
+        self.max_memory_bytes = max_memory_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._disk = SqliteCacheStore(path, "embeddings") if path else None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Look up an embedding, promoting disk hits into memory"""
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return unpack_embedding(blob)
+
+        blob = self._disk.get(key) if self._disk is not None else None
+        if blob is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            self._remember(key, blob)
+        return unpack_embedding(blob)
+
+    def put(self, key: str, embedding: List[float]) -> None:
+        """Store an embedding in both tiers"""
+        blob = pack_embedding(embedding)
+        with self._lock:
+            self._remember(key, blob)
+        if self._disk is not None:
+            self._disk.put(key, blob)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[List[float]]]:
+        """Look up embeddings, reading all memory misses from disk in one query off the event loop"""
+        blobs: List[Optional[bytes]] = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for index, key in enumerate(keys):
+                blob = self._entries.get(key)
+                if blob is not None:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    blobs[index] = blob
+                else:
+                    missing.append(index)
+
+        if missing and self._disk is not None:
+            found = await asyncio.to_thread(self._disk.get_many, [keys[index] for index in missing])
+        else:
+            found = {}
+
+        with self._lock:
+            for index in missing:
+                blob = found.get(keys[index])
+                if blob is None:
+                    self.misses += 1
+                else:
+                    self.disk_hits += 1
+                    self._remember(keys[index], blob)
+                    blobs[index] = blob
+        return [unpack_embedding(blob) if blob is not None else None for blob in blobs]
+
+    async def put_many(self, embeddings: Dict[str, List[float]]) -> None:
+        """Store embeddings in both tiers, writing the disk tier in one transaction off the event loop"""
+        blobs = {key: pack_embedding(embedding) for key, embedding in embeddings.items()}
+        with self._lock:
+            for key, blob in blobs.items():
+                self._remember(key, blob)
+        if self._disk is not None and blobs:
+            await asyncio.to_thread(self._disk.put_many, list(blobs.items()))
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        """Insert into the LRU and evict until within the memory budget"""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+
+        if len(blob) > self.max_memory_bytes:
+            return
+
+        self._entries[key] = blob
+        self._memory_bytes += len(blob)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and memory usage"""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._entries),
+                "memory_bytes": self._memory_bytes,
+            }
+
+
+@lru_cache()
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get the process-wide embedding cache, or None when disabled"""
+    settings = get_settings()
+    if not settings.embedding_cache_enabled:
+        return None
+    return EmbeddingCache(
+        max_memory_bytes=settings.embedding_cache_memory_mb * 1024 * 1024,
+        path=settings.embedding_cache_path or None
+    )
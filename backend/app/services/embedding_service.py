@@ -1,9 +1,10 @@
 """OpenAI embedding service"""
-from typing import List
+from typing import List, Dict, Any
 from openai import AsyncOpenAI
 
 from app.config import get_settings
 from app.services.langfuse_service import LangfuseService
+from app.services.embedding_cache import get_embedding_cache, make_cache_key
 
 settings = get_settings()
 
@@ -14,10 +15,27 @@ class EmbeddingService:
     def __init__(self):
         self.client = AsyncOpenAI(api_key=settings.openai_api_key)
         self.model = settings.openai_embedding_model
+        self.dimensions = settings.openai_embedding_dimensions
         self.langfuse = LangfuseService()
+        self.cache = get_embedding_cache()
+    
+    def _request_params(self) -> Dict[str, Any]:
+        """Extra parameters for the embeddings API call"""
+        # Only the text-embedding-3 family accepts a dimensions override
+        if self.model.startswith("text-embedding-3"):
+            return {"dimensions": self.dimensions}
+        return {}
+    
+    def _cache_key(self, text: str) -> str:
+        return make_cache_key(self.model, self.dimensions, text)
     
     async def generate_embedding(self, text: str, trace_id: str = None) -> List[float]:
         """Generate embedding for a single text"""
+        if self.cache is not None:
+            [cached] = await self.cache.get_many([self._cache_key(text)])
+            if cached is not None:
+                return cached
+        
         generation = None
         
         if trace_id:
@@ -31,11 +49,15 @@ class EmbeddingService:
         try:
             response = await self.client.embeddings.create(
                 model=self.model,
-                input=text
+                input=text,
+                **self._request_params()
             )
             
             embedding = response.data[0].embedding
             
+            if self.cache is not None:
+                await self.cache.put_many({self._cache_key(text): embedding})
+            
             if generation:
                 self.langfuse.end_generation(
                     generation,
@@ -60,10 +82,23 @@ class EmbeddingService:
         trace_id: str = None
     ) -> List[List[float]]:
         """Generate embeddings for multiple texts in batches"""
-        all_embeddings = []
+        all_embeddings: List[List[float]] = [None] * len(texts)
+        
+        # Serve what we can from the cache and only send the misses
+        if self.cache is not None:
+            cached = await self.cache.get_many([self._cache_key(text) for text in texts])
+        else:
+            cached = [None] * len(texts)
+        pending = []
+        for index, embedding in enumerate(cached):
+            if embedding is not None:
+                all_embeddings[index] = embedding
+            else:
+                pending.append(index)
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
+        for i in range(0, len(pending), batch_size):
+            batch_indices = pending[i:i + batch_size]
+            batch = [texts[index] for index in batch_indices]
             
             generation = None
             if trace_id:
@@ -77,11 +112,17 @@ class EmbeddingService:
             try:
                 response = await self.client.embeddings.create(
                     model=self.model,
-                    input=batch
+                    input=batch,
+                    **self._request_params()
                 )
                 
                 batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
+                for index, embedding in zip(batch_indices, batch_embeddings):
+                    all_embeddings[index] = embedding
+                if self.cache is not None:
+                    await self.cache.put_many({
+                        self._cache_key(text): embedding for text, embedding in zip(batch, batch_embeddings)
+                    })
                 
                 if generation:
                     self.langfuse.end_generation(
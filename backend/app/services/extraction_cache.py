@@ -0,0 +1,68 @@
+"""Persistent cache of LLM extraction results"""
+import hashlib
+import json
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from app.config import get_settings
+from app.prompts.loader import PromptManager
+from app.services.cache_store import SqliteCacheStore
+from app.services.embedding_cache import normalize_text
+
+
+def make_extraction_key(prompt_name: str, model: str, text: str) -> str:
+    """Key an extraction by prompt version, model and normalized input text.
+
+    Editing a prompt file changes its version, so only extractions made
+    with that prompt stop matching.
+    """
+    digest = hashlib.sha256()
+    digest.update(
+        f"{prompt_name}\x00{PromptManager.get_prompt_version(prompt_name)}\x00{model}\x00".encode("utf-8")
+    )
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """SQLite-backed store of the JSON returned by extraction prompts"""
+
+    def __init__(self, path: str):
+        self._store = SqliteCacheStore(path, "extractions")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached extraction"""
+        blob = self._store.get(key)
+        with self._lock:
+            if blob is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(blob)
+
+    def put(self, key: str, parsed_data: Dict[str, Any]) -> None:
+        """Store an extraction result"""
+        self._store.put(key, json.dumps(parsed_data).encode("utf-8"))
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+@lru_cache()
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Get the process-wide extraction cache, or None when disabled"""
+    settings = get_settings()
+    if not settings.extraction_cache_enabled or not settings.extraction_cache_path:
+        return None
+    return ExtractionCache(settings.extraction_cache_path)
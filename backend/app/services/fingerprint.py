@@ -0,0 +1,58 @@
+"""Content fingerprints for upload deduplication"""
+import hashlib
+import threading
+from functools import lru_cache
+from typing import Dict
+
+from app.services.embedding_cache import normalize_text
+
+
+def sha256_hex(content: bytes) -> str:
+    """Fingerprint of the raw uploaded bytes"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def text_fingerprint(text: str) -> str:
+    """Fingerprint of extracted text, insensitive to whitespace differences"""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class DedupStats:
+    """Counters for fingerprint lookups per document kind.
+
+    A record hit returns the uploader's existing record; a parse hit
+    reuses another owner's parsed data and skips the LLM extraction.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def record(self, kind: str, outcome: str) -> None:
+        """Count a lookup with outcome "record_hit", "parse_hit" or "miss\""""
+        with self._lock:
+            counters = self._counters.setdefault(
+                kind, {"lookups": 0, "record_hits": 0, "parse_hits": 0}
+            )
+            counters["lookups"] += 1
+            if outcome != "miss":
+                counters[f"{outcome}s"] += 1
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Counters and hit rate per document kind"""
+        with self._lock:
+            return {
+                kind: {
+                    **counters,
+                    "hit_rate": round(
+                        (counters["record_hits"] + counters["parse_hits"]) / counters["lookups"], 4
+                    ) if counters["lookups"] else 0.0,
+                }
+                for kind, counters in self._counters.items()
+            }
+
+
+@lru_cache()
+def get_dedup_stats() -> DedupStats:
+    """Get the process-wide dedup counters"""
+    return DedupStats()
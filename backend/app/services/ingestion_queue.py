@@ -0,0 +1,212 @@
+"""Database-backed queue and worker pool for asynchronous document ingestion"""
+import asyncio
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+from uuid import UUID, uuid4
+
+from app.config import get_settings
+from app.db.repositories import IngestionJobRepository
+from app.models.ingestion import IngestionJob, IngestionKind, IngestionStage
+from app.services.document_service import DocumentParseError, DocumentService
+from app.services.langfuse_service import LangfuseService
+from app.services.upload_service import SpooledUpload
+
+
+class IngestionWorkerPool:
+    """Background workers that parse, extract and index uploaded documents.
+
+    Jobs live in the ingestion_jobs table, so queued work survives a
+    restart. Each worker claims one job at a time; concurrency is bounded
+    by the number of workers. Errors are retried with exponential backoff
+    up to the job's max_attempts, except DocumentParseErrors (corrupt,
+    unsupported or oversized documents), which fail immediately.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        storage_dir: Optional[str] = None
+    ):
+        from app.agents.resume_parser_agent import ResumeParserAgent
+        from app.agents.job_parser_agent import JobParserAgent
+
+        settings = get_settings()
+        self.concurrency = concurrency if concurrency is not None else settings.ingestion_workers
+        self.poll_interval = poll_interval or settings.ingestion_poll_interval_seconds
+        self.storage_dir = Path(storage_dir or settings.ingestion_storage_dir)
+        self.max_attempts = settings.ingestion_max_attempts
+        self.retry_backoff = settings.ingestion_retry_backoff_seconds
+        self.lease_seconds = settings.ingestion_lease_seconds
+
+        self.repo = IngestionJobRepository()
+        self.document_service = DocumentService()
+        self.resume_parser = ResumeParserAgent()
+        self.job_parser = JobParserAgent()
+        self.langfuse = LangfuseService()
+        self._wake = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def enqueue(
+        self,
+        kind: IngestionKind,
+        owner_id: UUID,
+        upload: SpooledUpload,
+        file_name: Optional[str] = None
+    ) -> IngestionJob:
+        """Move a spooled upload into queue storage and persist a job for it"""
+        job_id = uuid4()
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        file_path = self.storage_dir / f"{job_id}.{upload.file_type}"
+        await asyncio.to_thread(shutil.move, upload.path, file_path)
+
+        job = IngestionJob(
+            id=job_id,
+            kind=kind,
+            owner_id=owner_id,
+            max_attempts=self.max_attempts,
+            file_path=str(file_path),
+            file_type=upload.file_type,
+            file_name=file_name,
+            content_sha256=upload.sha256
+        )
+        try:
+            await self.repo.create(job)
+        except Exception:
+            file_path.unlink(missing_ok=True)
+            raise
+
+        self._wake.set()
+        return job
+
+    def start(self) -> None:
+        """Start the worker tasks"""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"ingestion-worker-{n}")
+            for n in range(self.concurrency)
+        ]
+        print(f"📥 Started {self.concurrency} ingestion workers")
+
+    async def stop(self) -> None:
+        """Cancel the workers; a job interrupted mid-run is retried after its lease expires"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await self.repo.claim_next(self.lease_seconds)
+            except Exception as e:
+                print(f"Ingestion queue error: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                continue
+
+            await self.process(job)
+
+    async def process(self, job: IngestionJob) -> None:
+        """Run one claimed job and record its outcome"""
+        if job.attempts > job.max_attempts:
+            # Claimed again after a crash on its last attempt
+            await self.repo.fail(job.id, job.error or "Ingestion was interrupted too many times")
+            self._discard_file(job)
+            return
+
+        try:
+            if job.kind == IngestionKind.RESUME:
+                result_id = await self._ingest_resume(job)
+            else:
+                result_id = await self._ingest_job(job)
+        except DocumentParseError as e:
+            await self.repo.fail(job.id, str(e))
+            self._discard_file(job)
+        except Exception as e:
+            if job.attempts >= job.max_attempts:
+                await self.repo.fail(job.id, str(e))
+                self._discard_file(job)
+            else:
+                delay = self.retry_backoff * 2 ** (job.attempts - 1)
+                print(f"Ingestion job {job.id} failed (attempt {job.attempts}), retrying in {delay:.0f}s: {e}")
+                await self.repo.retry(job.id, str(e), delay)
+        else:
+            await self.repo.complete(job.id, result_id)
+            self._discard_file(job)
+
+    async def _ingest_resume(self, job: IngestionJob) -> UUID:
+        trace_id = self.langfuse.create_trace(
+            name="resume_upload",
+            user_id=str(job.owner_id),
+            metadata={"file_name": job.file_name, "ingestion_job_id": str(job.id)}
+        )
+
+        # A byte-identical re-upload skips parsing entirely
+        resume = await self.resume_parser.find_uploaded_resume(
+            job.owner_id, job.content_sha256, trace_id=trace_id
+        )
+        if resume is None:
+            await self.repo.update_stage(job.id, IngestionStage.PARSING)
+            raw_text = await self.document_service.parse_file(job.file_path, job.file_type)
+
+            await self.repo.update_stage(job.id, IngestionStage.EXTRACTING)
+            resume = await self.resume_parser.parse_resume(
+                resume_text=raw_text,
+                candidate_id=job.owner_id,
+                file_name=job.file_name,
+                trace_id=trace_id,
+                content_sha256=job.content_sha256
+            )
+
+        self.langfuse.flush()
+        return resume.id
+
+    async def _ingest_job(self, job: IngestionJob) -> UUID:
+        trace_id = self.langfuse.create_trace(
+            name="job_upload",
+            user_id=str(job.owner_id),
+            metadata={"file_name": job.file_name, "ingestion_job_id": str(job.id)}
+        )
+
+        parsed_job = await self.job_parser.find_uploaded_job(
+            job.owner_id, job.content_sha256, trace_id=trace_id
+        )
+        if parsed_job is None:
+            await self.repo.update_stage(job.id, IngestionStage.PARSING)
+            raw_text = await self.document_service.parse_file(job.file_path, job.file_type)
+
+            await self.repo.update_stage(job.id, IngestionStage.EXTRACTING)
+            parsed_job = await self.job_parser.parse_job(
+                job_text=raw_text,
+                recruiter_id=job.owner_id,
+                file_name=job.file_name,
+                trace_id=trace_id,
+                content_sha256=job.content_sha256
+            )
+
+        self.langfuse.flush()
+        return parsed_job.id
+
+    def _discard_file(self, job: IngestionJob) -> None:
+        """Delete a job's stored upload once it will not be retried"""
+        try:
+            os.unlink(job.file_path)
+        except FileNotFoundError:
+            pass
+
+
+@lru_cache()
+def get_ingestion_workers() -> IngestionWorkerPool:
+    """Get the process-wide ingestion worker pool"""
+    return IngestionWorkerPool()
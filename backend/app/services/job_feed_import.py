@@ -0,0 +1,269 @@
+"""Bulk job import from recruiter ATS feeds"""
+import asyncio
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+from uuid import NAMESPACE_URL, UUID, uuid5
+
+from app.config import get_settings
+from app.models.job import Job
+from app.services.fingerprint import text_fingerprint
+
+settings = get_settings()
+
+FEED_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+DEFAULT_TEXT_FIELDS = ("title", "company", "location", "description")
+
+
+@dataclass
+class FeedPosting:
+    """One job posting read from a feed"""
+    line: int
+    external_id: str
+    text: str
+
+
+def iter_feed(
+    path: str,
+    feed_format: Optional[str] = None,
+    id_field: str = "external_id",
+    text_fields: Sequence[str] = DEFAULT_TEXT_FIELDS
+) -> Iterator[Any]:
+    """Read a CSV or JSONL feed lazily, one posting at a time.
+
+    The posting text joins the non-empty text_fields in order. Rows
+    without an id or text are yielded as ValueErrors so the caller can
+    report them without stopping the import.
+    """
+    feed_format = feed_format or FEED_FORMATS.get(Path(path).suffix.lower())
+    if feed_format not in ("csv", "jsonl"):
+        raise ValueError(f"Unsupported feed format: {path} (use .csv or .jsonl)")
+
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if feed_format == "csv":
+            reader = csv.DictReader(f)
+            rows = ((reader.line_num, row) for row in reader)
+        else:
+            rows = ((number, line) for number, line in enumerate(f, 1) if line.strip())
+
+        for line, row in rows:
+            if feed_format == "jsonl":
+                try:
+                    row = json.loads(row)
+                except json.JSONDecodeError as e:
+                    yield ValueError(f"line {line}: invalid JSON ({e.msg})")
+                    continue
+                if not isinstance(row, dict):
+                    yield ValueError(f"line {line}: expected a JSON object")
+                    continue
+
+            external_id = str(row.get(id_field) or "").strip()
+            text = "\n".join(
+                str(row[name]).strip() for name in text_fields if str(row.get(name) or "").strip()
+            )
+            if not external_id:
+                yield ValueError(f"line {line}: missing {id_field}")
+            elif not text:
+                yield ValueError(f"line {line}: posting {external_id} has no text")
+            else:
+                yield FeedPosting(line=line, external_id=external_id, text=text)
+
+
+@dataclass
+class FeedImportReport:
+    """Outcome counters for a feed import"""
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def summary(self) -> str:
+        return (
+            f"{self.created} created, {self.updated} updated, {self.unchanged} unchanged, "
+            f"{self.removed} removed, {self.failed} failed in {self.elapsed:.1f}s"
+        )
+
+
+class JobFeedImporter:
+    """Import a recruiter's job feed and reconcile it with their existing postings.
+
+    Postings are matched to existing jobs by external id. Unchanged text
+    is skipped, new and changed postings are extracted by the LLM with
+    bounded concurrency, then embedded and written in batches: one
+    embeddings call, one batched vector upsert and one database
+    transaction per batch. Once the whole feed has been read, feed jobs
+    whose external id no longer appears are removed (unless prune is off).
+    Nothing is removed if any feed row could not be read, since that row
+    may be the only mention of a live posting.
+    """
+
+    def __init__(
+        self,
+        recruiter_id: UUID,
+        extraction_concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        prune: bool = True,
+        progress_interval: float = 10.0
+    ):
+        from app.agents.job_parser_agent import JobParserAgent
+
+        self.recruiter_id = recruiter_id
+        self.extraction_concurrency = extraction_concurrency or settings.ingest_extraction_concurrency
+        self.batch_size = batch_size or settings.ingest_batch_size
+        self.prune = prune
+        self.progress_interval = progress_interval
+
+        self.parser = JobParserAgent()
+        self.embedding_service = self.parser.embedding_service
+        self.vector_store = self.parser.vector_store
+        self.job_repo = self.parser.job_repo
+
+    async def run(self, postings: Iterator[Any], file_name: Optional[str] = None) -> FeedImportReport:
+        """Import postings from iter_feed"""
+        report = FeedImportReport()
+        known = await self.job_repo.get_external_index(str(self.recruiter_id))
+        seen: Set[str] = set()
+        unreadable = 0
+
+        semaphore = asyncio.Semaphore(self.extraction_concurrency)
+        in_flight: Set[asyncio.Task] = set()
+        ready: List[Job] = []
+        last_progress = time.monotonic()
+
+        async def collect(return_when):
+            finished, _ = await asyncio.wait(in_flight, return_when=return_when)
+            for task in finished:
+                in_flight.discard(task)
+                job = task.result()
+                if job is None:
+                    report.failed += 1
+                else:
+                    ready.append(job)
+
+        for posting in postings:
+            if isinstance(posting, ValueError):
+                print(f"[import] Skipped {posting}")
+                report.failed += 1
+                unreadable += 1
+                continue
+            if posting.external_id in seen:
+                print(f"[import] Skipped line {posting.line}: duplicate id {posting.external_id}")
+                report.failed += 1
+                continue
+            seen.add(posting.external_id)
+
+            existing = known.get(posting.external_id)
+            fingerprint = text_fingerprint(posting.text)
+            if existing and existing[1] == fingerprint:
+                report.unchanged += 1
+                continue
+
+            # Keep a bounded window of postings between reading and writing
+            if len(in_flight) >= self.extraction_concurrency * 2:
+                await collect(asyncio.FIRST_COMPLETED)
+            in_flight.add(asyncio.create_task(
+                self._extract(posting, fingerprint, existing[0] if existing else None, file_name, semaphore)
+            ))
+
+            while len(ready) >= self.batch_size:
+                await self._write_batch(ready[:self.batch_size], known, report)
+                del ready[:self.batch_size]
+
+            if time.monotonic() - last_progress >= self.progress_interval:
+                print(f"[import] {report.summary()}")
+                last_progress = time.monotonic()
+
+        if in_flight:
+            await collect(asyncio.ALL_COMPLETED)
+        for start in range(0, len(ready), self.batch_size):
+            await self._write_batch(ready[start:start + self.batch_size], known, report)
+
+        if self.prune and unreadable:
+            print(f"[import] Not removing missing postings: {unreadable} feed rows could not be read")
+        elif self.prune:
+            await self._remove([job_id for external_id, (job_id, _) in known.items() if external_id not in seen], report)
+
+        print(f"[import] Done: {report.summary()}")
+        return report
+
+    async def _extract(
+        self,
+        posting: FeedPosting,
+        fingerprint: str,
+        job_id: Optional[str],
+        file_name: Optional[str],
+        semaphore: asyncio.Semaphore
+    ) -> Optional[Job]:
+        """LLM-extract one posting; returns None on failure"""
+        try:
+            async with semaphore:
+                parsed_job, _ = await self.parser.extract_job(posting.text)
+
+            # New postings get IDs derived from the external id, so a re-run after a crash overwrites
+            return Job(
+                id=UUID(job_id) if job_id else uuid5(NAMESPACE_URL, f"job-feed:{self.recruiter_id}#{posting.external_id}"),
+                recruiter_id=self.recruiter_id,
+                raw_text=posting.text,
+                parsed_data=parsed_job,
+                file_name=file_name,
+                text_sha256=fingerprint,
+                external_id=posting.external_id
+            )
+        except Exception as e:
+            print(f"[import] Failed line {posting.line} ({posting.external_id}): {e}")
+            return None
+
+    async def _write_batch(
+        self,
+        batch: List[Job],
+        known: Dict[str, Any],
+        report: FeedImportReport
+    ) -> None:
+        """Embed a batch in one call and write it to the vector store, then the database.
+
+        Rows are saved only after the vectors are durable, so a posting
+        whose fingerprint is recorded always has its vector.
+        """
+        if not batch:
+            return
+
+        embeddings = await self.embedding_service.generate_embeddings_batch(
+            [self.parser._create_embedding_text(job.parsed_data, job.raw_text) for job in batch]
+        )
+        ack = await self.vector_store.upsert_jobs_batch(
+            (
+                {
+                    "job_id": job.id,
+                    "recruiter_id": job.recruiter_id,
+                    "embedding": embedding,
+                    "metadata": self.parser.vector_metadata(job.parsed_data)
+                }
+                for job, embedding in zip(batch, embeddings)
+            ),
+            wait=False
+        )
+        await self.vector_store.flush(ack)
+        await self.job_repo.save_many(batch)
+
+        for job in batch:
+            if job.external_id in known:
+                report.updated += 1
+            else:
+                report.created += 1
+
+    async def _remove(self, job_ids: List[str], report: FeedImportReport) -> None:
+        """Delete feed jobs that are no longer in the feed"""
+        if not job_ids:
+            return
+        for job_id in job_ids:
+            await self.vector_store.delete_job(UUID(job_id))
+        report.removed += await self.job_repo.delete_many(job_ids)
@@ -1,95 +1,301 @@
 """Qdrant vector database service"""
-from typing import List, Dict, Any, Optional
+import asyncio
+import itertools
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Optional
 from uuid import UUID
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, AsyncQdrantClient
 from qdrant_client.http import models
 from qdrant_client.http.models import (
     Distance, VectorParams, PointStruct, 
-    Filter, FieldCondition, MatchValue
+    Filter, FieldCondition, MatchValue, MatchText, Range,
+    PayloadSchemaType, TextIndexParams, TextIndexType, TokenizerType,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    BinaryQuantization, BinaryQuantizationConfig, Disabled,
+    QuantizationSearchParams, SearchParams, VectorParamsDiff, CollectionParamsDiff,
+    SparseVectorParams, SparseVector, Modifier, QueryRequest
 )
 
 from app.config import get_settings
+from app.services.vector_store import (
+    VectorStore, UpsertAck, reciprocal_rank_fusion, max_sim_fusion, chunk_point_id, bump_generation
+)
+from app.services.sparse_encoder import encode_document, encode_query
 
 settings = get_settings()
 
 
-class QdrantService:
-    """Service for Qdrant vector database operations"""
+def _client_options() -> Dict[str, Any]:
+    """Connection options shared by the sync and async clients"""
+    return {
+        "host": settings.qdrant_host,
+        "port": settings.qdrant_port,
+        "grpc_port": settings.qdrant_grpc_port,
+        "prefer_grpc": settings.qdrant_prefer_grpc,
+        "api_key": settings.qdrant_api_key if settings.qdrant_api_key else None,
+        "timeout": settings.qdrant_timeout,
+        "grpc_options": {
+            "grpc.keepalive_time_ms": settings.qdrant_grpc_keepalive_ms,
+            "grpc.keepalive_permit_without_calls": 1,
+        },
+    }
+
+
+class _AsyncClientPool:
+    """Round-robins calls across several async clients, each with its own gRPC channel"""
     
-    # Collection names
-    RESUMES_COLLECTION = "resumes"
-    JOBS_COLLECTION = "jobs"
+    def __init__(self, clients: List[AsyncQdrantClient]):
+        self.clients = clients
+        self._next = itertools.cycle(clients)
     
-    # Embedding dimensions for text-embedding-3-small
-    VECTOR_SIZE = 1536
+    def __getattr__(self, name: str) -> Any:
+        return getattr(next(self._next), name)
     
-    def __init__(self):
-        self.client = QdrantClient(
-            host=settings.qdrant_host,
-            port=settings.qdrant_port,
-            api_key=settings.qdrant_api_key if settings.qdrant_api_key else None
+    async def close(self):
+        for client in self.clients:
+            await client.close()
+
+
+@lru_cache()
+def get_qdrant_client() -> QdrantClient:
+    """Get the process-wide synchronous Qdrant client"""
+    return QdrantClient(**_client_options())
+
+
+@lru_cache()
+def get_async_qdrant_client() -> AsyncQdrantClient:
+    """Get the process-wide async Qdrant client (pooled when several channels are configured)"""
+    channels = max(1, settings.qdrant_grpc_channels)
+    if channels == 1:
+        return AsyncQdrantClient(**_client_options())
+    return _AsyncClientPool([AsyncQdrantClient(**_client_options()) for _ in range(channels)])
+
+
+async def close_qdrant_clients():
+    """Close the shared Qdrant clients"""
+    if get_async_qdrant_client.cache_info().currsize:
+        await get_async_qdrant_client().close()
+        get_async_qdrant_client.cache_clear()
+    if get_qdrant_client.cache_info().currsize:
+        get_qdrant_client().close()
+        get_qdrant_client.cache_clear()
+
+
+# Payload indexes per collection. initialize_collections creates missing
+# indexes and recreates any whose type has changed.
+PAYLOAD_INDEXES: Dict[str, Dict[str, Any]] = {
+    "resumes": {
+        "candidate_id": PayloadSchemaType.KEYWORD,
+        "skills": PayloadSchemaType.KEYWORD,
+        "experience_years": PayloadSchemaType.INTEGER,
+        "summary": TextIndexParams(
+            type=TextIndexType.TEXT,
+            tokenizer=TokenizerType.WORD,
+            lowercase=True
+        ),
+    },
+    "jobs": {
+        "recruiter_id": PayloadSchemaType.KEYWORD,
+        "required_skills": PayloadSchemaType.KEYWORD,
+        "location": PayloadSchemaType.KEYWORD,
+        "job_type": PayloadSchemaType.KEYWORD,
+        "title": TextIndexParams(
+            type=TextIndexType.TEXT,
+            tokenizer=TokenizerType.WORD,
+            lowercase=True
+        ),
+    },
+}
+# Chunk points carry their resume's metadata, so they share its filters
+PAYLOAD_INDEXES["resume_chunks"] = {
+    "resume_id": PayloadSchemaType.KEYWORD,
+    "chunk_index": PayloadSchemaType.INTEGER,
+    **PAYLOAD_INDEXES["resumes"],
+}
+
+
+def _same_quantization(current: Any, wanted: Any) -> bool:
+    """Whether a collection's quantization matches the configured one (type, quantile, always_ram, ...)"""
+    if current is None or wanted is None:
+        return current is None and wanted is None
+    if type(current) is not type(wanted):
+        return False
+    # Parameters left unset in settings keep whatever Qdrant chose
+    return _contains(current.model_dump(mode="json"), wanted.model_dump(mode="json", exclude_none=True))
+
+
+def _contains(actual: Any, expected: Any) -> bool:
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and all(_contains(actual.get(k), v) for k, v in expected.items())
+    return actual == expected
+
+
+class _QdrantServiceBase:
+    """Collection layout and request/response helpers shared by the sync and async services"""
+    
+    RESUMES_COLLECTION = VectorStore.RESUMES_COLLECTION
+    JOBS_COLLECTION = VectorStore.JOBS_COLLECTION
+    RESUME_CHUNKS_COLLECTION = VectorStore.RESUME_CHUNKS_COLLECTION
+    VECTOR_SIZE = VectorStore.VECTOR_SIZE
+    
+    # Named sparse vector holding lexical (BM25-style) weights for resumes
+    SPARSE_VECTOR_NAME = "text"
+    
+    def _collection_names(self) -> List[str]:
+        """Collections managed by initialize_collections"""
+        names = [self.RESUMES_COLLECTION, self.JOBS_COLLECTION]
+        if settings.resume_chunk_indexing_enabled:
+            names.append(self.RESUME_CHUNKS_COLLECTION)
+        return names
+    
+    def _is_resume_storage(self, collection_name: str) -> bool:
+        """Resume and chunk collections get the on-disk and quantization settings"""
+        return collection_name in (self.RESUMES_COLLECTION, self.RESUME_CHUNKS_COLLECTION)
+    
+    def _vectors_config(self, collection_name: str) -> VectorParams:
+        """Vector configuration used for new collections"""
+        return VectorParams(
+            size=self.VECTOR_SIZE,
+            distance=Distance.COSINE,
+            on_disk=settings.qdrant_vectors_on_disk if self._is_resume_storage(collection_name) else None
         )
     
-    def initialize_collections(self):
-        """Initialize Qdrant collections if they don't exist"""
-        collections = self.client.get_collections().collections
-        collection_names = [c.name for c in collections]
+    def _quantization_config(self, collection_name: str):
+        """Quantization configured for a collection, or None"""
+        if not self._is_resume_storage(collection_name):
+            return None
         
-        # Create resumes collection
-        if self.RESUMES_COLLECTION not in collection_names:
-            self.client.create_collection(
-                collection_name=self.RESUMES_COLLECTION,
-                vectors_config=VectorParams(
-                    size=self.VECTOR_SIZE,
-                    distance=Distance.COSINE
+        mode = settings.qdrant_quantization.lower()
+        if mode == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=settings.qdrant_quantization_always_ram
                 )
             )
-            print(f"✅ Created collection: {self.RESUMES_COLLECTION}")
-        
-        # Create jobs collection
-        if self.JOBS_COLLECTION not in collection_names:
-            self.client.create_collection(
-                collection_name=self.JOBS_COLLECTION,
-                vectors_config=VectorParams(
-                    size=self.VECTOR_SIZE,
-                    distance=Distance.COSINE
+        if mode == "binary":
+            return BinaryQuantization(
+                binary=BinaryQuantizationConfig(
+                    always_ram=settings.qdrant_quantization_always_ram
                 )
             )
-            print(f"✅ Created collection: {self.JOBS_COLLECTION}")
+        if mode not in ("", "none"):
+            raise ValueError(f"Unsupported QDRANT_QUANTIZATION mode: {settings.qdrant_quantization}")
+        return None
     
-    def upsert_resume(
+    def _collection_config(self, collection_name: str) -> Dict[str, Any]:
+        """Arguments for create_collection"""
+        config = {
+            "collection_name": collection_name,
+            "vectors_config": self._vectors_config(collection_name),
+            "quantization_config": self._quantization_config(collection_name),
+        }
+        if self._is_resume_storage(collection_name) and settings.qdrant_payload_on_disk is not None:
+            config["on_disk_payload"] = settings.qdrant_payload_on_disk
+        if collection_name == self.RESUMES_COLLECTION:
+            if settings.hybrid_search_enabled:
+                config["sparse_vectors_config"] = {
+                    self.SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)
+                }
+        return config
+    
+    def _has_sparse_vectors(self, info: Any) -> bool:
+        """Whether a collection was created with the lexical sparse vector"""
+        return self.SPARSE_VECTOR_NAME in (info.config.params.sparse_vectors or {})
+    
+    def _storage_config_changes(self, collection_name: str, info: Any) -> Dict[str, Any]:
+        """Arguments for update_collection when an existing collection differs from settings"""
+        if not self._is_resume_storage(collection_name):
+            return {}
+        
+        changes = {}
+        params = info.config.params
+        
+        vectors = params.vectors
+        if isinstance(vectors, VectorParams) and bool(vectors.on_disk) != settings.qdrant_vectors_on_disk:
+            changes["vectors_config"] = {"": VectorParamsDiff(on_disk=settings.qdrant_vectors_on_disk)}
+        
+        wanted_payload_on_disk = settings.qdrant_payload_on_disk
+        if wanted_payload_on_disk is not None and bool(params.on_disk_payload) != wanted_payload_on_disk:
+            changes["collection_params"] = CollectionParamsDiff(on_disk_payload=wanted_payload_on_disk)
+        
+        wanted = self._quantization_config(collection_name)
+        if not _same_quantization(info.config.quantization_config, wanted):
+            changes["quantization_config"] = wanted if wanted is not None else Disabled.DISABLED
+        
+        return changes
+    
+    def _search_params(self, collection_name: str) -> Optional[SearchParams]:
+        """Search parameters for quantized collections"""
+        if self._quantization_config(collection_name) is None:
+            return None
+        return SearchParams(
+            quantization=QuantizationSearchParams(
+                rescore=settings.qdrant_quantization_rescore,
+                oversampling=settings.qdrant_quantization_oversampling
+            )
+        )
+    
+    def _resume_point(
         self,
         resume_id: UUID,
         candidate_id: UUID,
         embedding: List[float],
-        metadata: Dict[str, Any]
-    ) -> bool:
-        """Upsert a resume embedding to Qdrant"""
-        point = PointStruct(
+        metadata: Dict[str, Any],
+        sparse_text: Optional[str] = None
+    ) -> PointStruct:
+        """Build the Qdrant point for a resume"""
+        vector = embedding
+        if sparse_text is not None:
+            indices, values = encode_document(sparse_text)
+            vector = {
+                "": embedding,
+                self.SPARSE_VECTOR_NAME: SparseVector(indices=indices, values=values)
+            }
+        
+        return PointStruct(
             id=str(resume_id),
-            vector=embedding,
+            vector=vector,
             payload={
                 "candidate_id": str(candidate_id),
                 "type": "resume",
                 **metadata
             }
         )
-        
-        self.client.upsert(
-            collection_name=self.RESUMES_COLLECTION,
-            points=[point]
-        )
-        return True
     
-    def upsert_job(
+    def _resume_chunk_points(
+        self,
+        resume_id: UUID,
+        candidate_id: UUID,
+        chunk_embeddings: List[List[float]],
+        metadata: Dict[str, Any]
+    ) -> List[PointStruct]:
+        """Build the child points holding a resume's chunk vectors"""
+        return [
+            PointStruct(
+                id=chunk_point_id(resume_id, index),
+                vector=embedding,
+                payload={
+                    "resume_id": str(resume_id),
+                    "candidate_id": str(candidate_id),
+                    "chunk_index": index,
+                    "type": "resume_chunk",
+                    **metadata
+                }
+            )
+            for index, embedding in enumerate(chunk_embeddings)
+        ]
+    
+    def _job_point(
         self,
         job_id: UUID,
         recruiter_id: UUID,
         embedding: List[float],
         metadata: Dict[str, Any]
-    ) -> bool:
-        """Upsert a job embedding to Qdrant"""
-        point = PointStruct(
+    ) -> PointStruct:
+        """Build the Qdrant point for a job"""
+        return PointStruct(
             id=str(job_id),
             vector=embedding,
             payload={
@@ -98,11 +304,151 @@ class QdrantService:
                 **metadata
             }
         )
+    
+    def _build_filter(self, collection_name: str, filters: Optional[Dict[str, Any]]) -> Optional[Filter]:
+        """Build a payload filter whose keys and match types follow the stored payload layout"""
+        if not filters:
+            return None
         
+        indexes = PAYLOAD_INDEXES.get(collection_name, {})
+        conditions = []
+        for key, value in filters.items():
+            schema = indexes.get(key)
+            if isinstance(value, list):
+                # Handle list filters (e.g., skills): every value must match
+                for v in value:
+                    conditions.append(FieldCondition(key=key, match=MatchValue(value=v)))
+            elif isinstance(value, dict):
+                # Range filters on numeric fields, e.g. {"gte": 3}
+                conditions.append(FieldCondition(key=key, range=Range(**value)))
+            elif isinstance(schema, TextIndexParams):
+                conditions.append(FieldCondition(key=key, match=MatchText(text=value)))
+            else:
+                conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
+        return Filter(must=conditions) if conditions else None
+    
+    def _payload_index_changes(
+        self,
+        collection_name: str,
+        payload_schema: Dict[str, Any]
+    ) -> List[tuple]:
+        """Compare existing payload indexes with PAYLOAD_INDEXES.
+        
+        Returns (field_name, field_schema, exists) for every index that is
+        missing or has the wrong type.
+        """
+        def type_name(schema_type: Any) -> str:
+            return str(getattr(schema_type, "value", schema_type))
+        
+        changes = []
+        for field_name, field_schema in PAYLOAD_INDEXES.get(collection_name, {}).items():
+            expected = field_schema.type if isinstance(field_schema, TextIndexParams) else field_schema
+            existing = payload_schema.get(field_name)
+            if existing is None:
+                changes.append((field_name, field_schema, False))
+            elif type_name(existing.data_type) != type_name(expected):
+                changes.append((field_name, field_schema, True))
+        return changes
+    
+    def _format_results(
+        self,
+        all_results: list,
+        score_threshold: float,
+        label: str
+    ) -> List[Dict[str, Any]]:
+        """Apply the score threshold and convert scored points to dicts"""
+        print(f"[DEBUG] Qdrant {label} results: {len(all_results)}")
+        for r in all_results:
+            print(f"  - ID: {r.id}, Score: {r.score:.4f}, Above threshold ({score_threshold}): {r.score >= score_threshold}")
+        
+        # Filter by score threshold
+        results = [r for r in all_results if r.score >= score_threshold]
+        
+        return [
+            {
+                "id": result.id,
+                "score": result.score,
+                "payload": result.payload
+            }
+            for result in results
+        ]
+    
+    def _format_record(self, results: list) -> Optional[Dict[str, Any]]:
+        """Convert the first retrieved record to a dict"""
+        if results:
+            return {
+                "id": results[0].id,
+                "payload": results[0].payload
+            }
+        return None
+
+
+class QdrantService(_QdrantServiceBase):
+    """Service for Qdrant vector database operations"""
+    
+    def __init__(self):
+        self.client = get_qdrant_client()
+    
+    def initialize_collections(self):
+        """Initialize Qdrant collections if they don't exist"""
+        collections = self.client.get_collections().collections
+        collection_names = [c.name for c in collections]
+        
+        for collection_name in self._collection_names():
+            if collection_name not in collection_names:
+                self.client.create_collection(**self._collection_config(collection_name))
+                print(f"✅ Created collection: {collection_name}")
+            else:
+                changes = self._storage_config_changes(
+                    collection_name, self.client.get_collection(collection_name)
+                )
+                if changes:
+                    self.client.update_collection(collection_name=collection_name, **changes)
+                    print(f"✅ Updated storage settings: {collection_name}")
+            
+            self._ensure_payload_indexes(collection_name)
+    
+    def _ensure_payload_indexes(self, collection_name: str):
+        """Create or migrate the payload indexes declared in PAYLOAD_INDEXES"""
+        payload_schema = self.client.get_collection(collection_name).payload_schema or {}
+        for field_name, field_schema, exists in self._payload_index_changes(collection_name, payload_schema):
+            if exists:
+                self.client.delete_payload_index(collection_name, field_name)
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=field_schema
+            )
+            print(f"✅ Indexed payload field: {collection_name}.{field_name}")
+    
+    def upsert_resume(
+        self,
+        resume_id: UUID,
+        candidate_id: UUID,
+        embedding: List[float],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """Upsert a resume embedding to Qdrant"""
+        self.client.upsert(
+            collection_name=self.RESUMES_COLLECTION,
+            points=[self._resume_point(resume_id, candidate_id, embedding, metadata)]
+        )
+        bump_generation(self.RESUMES_COLLECTION)
+        return True
+    
+    def upsert_job(
+        self,
+        job_id: UUID,
+        recruiter_id: UUID,
+        embedding: List[float],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """Upsert a job embedding to Qdrant"""
         self.client.upsert(
             collection_name=self.JOBS_COLLECTION,
-            points=[point]
+            points=[self._job_point(job_id, recruiter_id, embedding, metadata)]
         )
+        bump_generation(self.JOBS_COLLECTION)
         return True
     
     def search_candidates(
@@ -113,53 +459,17 @@ class QdrantService:
         score_threshold: float = 0.3
     ) -> List[Dict[str, Any]]:
         """Search for candidates using semantic similarity"""
-        filter_conditions = None
-        
-        if filters:
-            conditions = []
-            for key, value in filters.items():
-                if isinstance(value, list):
-                    # Handle list filters (e.g., skills)
-                    for v in value:
-                        conditions.append(
-                            FieldCondition(
-                                key=f"metadata.{key}",
-                                match=MatchValue(value=v)
-                            )
-                        )
-                else:
-                    conditions.append(
-                        FieldCondition(
-                            key=f"metadata.{key}",
-                            match=MatchValue(value=value)
-                        )
-                    )
-            if conditions:
-                filter_conditions = Filter(must=conditions)
-        
-        # First search without threshold to see all scores
+        # Qdrant applies the threshold, so `limit` hits above it come back
         all_results = self.client.query_points(
             collection_name=self.RESUMES_COLLECTION,
             query=query_embedding,
             limit=limit,
-            query_filter=filter_conditions
+            score_threshold=score_threshold,
+            query_filter=self._build_filter(self.RESUMES_COLLECTION, filters),
+            search_params=self._search_params(self.RESUMES_COLLECTION)
         ).points
         
-        print(f"[DEBUG] All Qdrant results (no threshold): {len(all_results)}")
-        for r in all_results:
-            print(f"  - ID: {r.id}, Score: {r.score:.4f}, Above threshold ({score_threshold}): {r.score >= score_threshold}")
-        
-        # Filter by score threshold
-        results = [r for r in all_results if r.score >= score_threshold]
-        
-        return [
-            {
-                "id": result.id,
-                "score": result.score,
-                "payload": result.payload
-            }
-            for result in results
-        ]
+        return self._format_results(all_results, score_threshold, "candidate")
     
     def search_jobs(
         self,
@@ -169,71 +479,31 @@ class QdrantService:
         score_threshold: float = 0.3
     ) -> List[Dict[str, Any]]:
         """Search for jobs using semantic similarity"""
-        filter_conditions = None
-        
-        if filters:
-            conditions = []
-            for key, value in filters.items():
-                conditions.append(
-                    FieldCondition(
-                        key=f"metadata.{key}",
-                        match=MatchValue(value=value)
-                    )
-                )
-            if conditions:
-                filter_conditions = Filter(must=conditions)
-        
-        # First search without threshold to see all scores
+        # Qdrant applies the threshold, so `limit` hits above it come back
         all_results = self.client.query_points(
             collection_name=self.JOBS_COLLECTION,
             query=query_embedding,
             limit=limit,
-            query_filter=filter_conditions
+            score_threshold=score_threshold,
+            query_filter=self._build_filter(self.JOBS_COLLECTION, filters),
+            search_params=self._search_params(self.JOBS_COLLECTION)
         ).points
         
-        print(f"[DEBUG] All Qdrant job results (no threshold): {len(all_results)}")
-        for r in all_results:
-            print(f"  - ID: {r.id}, Score: {r.score:.4f}, Above threshold ({score_threshold}): {r.score >= score_threshold}")
-        
-        # Filter by score threshold
-        results = [r for r in all_results if r.score >= score_threshold]
-        
-        return [
-            {
-                "id": result.id,
-                "score": result.score,
-                "payload": result.payload
-            }
-            for result in results
-        ]
+        return self._format_results(all_results, score_threshold, "job")
     
     def get_resume_by_id(self, resume_id: UUID) -> Optional[Dict[str, Any]]:
         """Get a resume by ID"""
-        results = self.client.retrieve(
+        return self._format_record(self.client.retrieve(
             collection_name=self.RESUMES_COLLECTION,
             ids=[str(resume_id)]
-        )
-        
-        if results:
-            return {
-                "id": results[0].id,
-                "payload": results[0].payload
-            }
-        return None
+        ))
     
     def get_job_by_id(self, job_id: UUID) -> Optional[Dict[str, Any]]:
         """Get a job by ID"""
-        results = self.client.retrieve(
+        return self._format_record(self.client.retrieve(
             collection_name=self.JOBS_COLLECTION,
             ids=[str(job_id)]
-        )
-        
-        if results:
-            return {
-                "id": results[0].id,
-                "payload": results[0].payload
-            }
-        return None
+        ))
     
     def delete_resume(self, resume_id: UUID) -> bool:
         """Delete a resume from Qdrant"""
@@ -243,6 +513,7 @@ class QdrantService:
                 points=[str(resume_id)]
             )
         )
+        bump_generation(self.RESUMES_COLLECTION)
         return True
     
     def delete_job(self, job_id: UUID) -> bool:
@@ -253,4 +524,411 @@ class QdrantService:
                 points=[str(job_id)]
             )
         )
+        bump_generation(self.JOBS_COLLECTION)
         return True
+
+
+class AsyncQdrantService(_QdrantServiceBase, VectorStore):
+    """Non-blocking Qdrant service for use from async agents and routes"""
+    
+    def __init__(self):
+        self.client = get_async_qdrant_client()
+        self._resumes_hybrid: Optional[bool] = None
+        self._shard_numbers: Dict[str, int] = {}
+    
+    async def _hybrid_enabled(self) -> bool:
+        """Whether resumes are indexed with sparse vectors (checked once per process)"""
+        if not settings.hybrid_search_enabled:
+            return False
+        if self._resumes_hybrid is None:
+            info = await self.client.get_collection(self.RESUMES_COLLECTION)
+            self._resumes_hybrid = self._has_sparse_vectors(info)
+        return self._resumes_hybrid
+    
+    async def _shard_number(self, collection_name: str) -> int:
+        """Number of shards of a collection (checked once per process)"""
+        if collection_name not in self._shard_numbers:
+            info = await self.client.get_collection(collection_name)
+            self._shard_numbers[collection_name] = info.config.params.shard_number or 1
+        return self._shard_numbers[collection_name]
+    
+    async def initialize_collections(self):
+        """Initialize Qdrant collections if they don't exist"""
+        collections = (await self.client.get_collections()).collections
+        collection_names = [c.name for c in collections]
+        
+        for collection_name in self._collection_names():
+            if collection_name not in collection_names:
+                await self.client.create_collection(**self._collection_config(collection_name))
+                print(f"✅ Created collection: {collection_name}")
+            else:
+                info = await self.client.get_collection(collection_name)
+                changes = self._storage_config_changes(collection_name, info)
+                if changes:
+                    await self.client.update_collection(collection_name=collection_name, **changes)
+                    print(f"✅ Updated storage settings: {collection_name}")
+                
+                if (
+                    collection_name == self.RESUMES_COLLECTION
+                    and settings.hybrid_search_enabled
+                    and not self._has_sparse_vectors(info)
+                ):
+                    print(
+                        f"⚠️ Collection {collection_name} has no sparse vectors; "
+                        "recreate it to enable hybrid search"
+                    )
+            
+            await self._ensure_payload_indexes(collection_name)
+    
+    async def _ensure_payload_indexes(self, collection_name: str):
+        """Create or migrate the payload indexes declared in PAYLOAD_INDEXES"""
+        payload_schema = (await self.client.get_collection(collection_name)).payload_schema or {}
+        for field_name, field_schema, exists in self._payload_index_changes(collection_name, payload_schema):
+            if exists:
+                await self.client.delete_payload_index(collection_name, field_name)
+            await self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=field_schema
+            )
+            print(f"✅ Indexed payload field: {collection_name}.{field_name}")
+    
+    async def upsert_resume(
+        self,
+        resume_id: UUID,
+        candidate_id: UUID,
+        embedding: List[float],
+        metadata: Dict[str, Any],
+        sparse_text: Optional[str] = None
+    ) -> bool:
+        """Upsert a resume embedding to Qdrant"""
+        if not await self._hybrid_enabled():
+            sparse_text = None
+        
+        await self.client.upsert(
+            collection_name=self.RESUMES_COLLECTION,
+            points=[self._resume_point(resume_id, candidate_id, embedding, metadata, sparse_text)]
+        )
+        bump_generation(self.RESUMES_COLLECTION)
+        return True
+    
+    async def upsert_resume_chunks(
+        self,
+        resume_id: UUID,
+        candidate_id: UUID,
+        chunk_embeddings: List[List[float]],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """Upsert a resume's chunk points, then delete chunks left over from a longer version"""
+        if chunk_embeddings:
+            await self.client.upsert(
+                collection_name=self.RESUME_CHUNKS_COLLECTION,
+                points=self._resume_chunk_points(resume_id, candidate_id, chunk_embeddings, metadata)
+            )
+        await self.client.delete(
+            collection_name=self.RESUME_CHUNKS_COLLECTION,
+            points_selector=models.FilterSelector(filter=Filter(must=[
+                FieldCondition(key="resume_id", match=MatchValue(value=str(resume_id))),
+                FieldCondition(key="chunk_index", range=Range(gte=len(chunk_embeddings))),
+            ]))
+        )
+        # Chunks feed candidate search, which is cached against the resumes collection
+        bump_generation(self.RESUMES_COLLECTION)
+        return True
+    
+    async def upsert_job(
+        self,
+        job_id: UUID,
+        recruiter_id: UUID,
+        embedding: List[float],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """Upsert a job embedding to Qdrant"""
+        await self.client.upsert(
+            collection_name=self.JOBS_COLLECTION,
+            points=[self._job_point(job_id, recruiter_id, embedding, metadata)]
+        )
+        bump_generation(self.JOBS_COLLECTION)
+        return True
+    
+    async def upsert_resumes_batch(
+        self,
+        items: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        parallel: Optional[int] = None,
+        wait: bool = True
+    ) -> UpsertAck:
+        """Upsert many resumes in chunks with parallel requests"""
+        hybrid = await self._hybrid_enabled()
+        points = (
+            self._resume_point(**{**item, "sparse_text": item.get("sparse_text") if hybrid else None})
+            for item in items
+        )
+        return await self._upsert_batched(self.RESUMES_COLLECTION, points, batch_size, parallel, wait)
+    
+    async def upsert_jobs_batch(
+        self,
+        items: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        parallel: Optional[int] = None,
+        wait: bool = True
+    ) -> UpsertAck:
+        """Upsert many jobs in chunks with parallel requests"""
+        points = (self._job_point(**item) for item in items)
+        return await self._upsert_batched(self.JOBS_COLLECTION, points, batch_size, parallel, wait)
+    
+    async def _upsert_batched(
+        self,
+        collection_name: str,
+        points: Iterable[PointStruct],
+        batch_size: Optional[int],
+        parallel: Optional[int],
+        wait: bool
+    ) -> UpsertAck:
+        """Send points in chunks, keeping at most `parallel` requests in flight.
+
+        Unacknowledged (wait=False) writes are only used on single-shard
+        collections, where flush() can confirm them; on sharded ones every
+        chunk waits.
+        """
+        batch_size = batch_size or settings.vector_upsert_batch_size
+        parallel = max(1, parallel or settings.vector_upsert_parallel)
+        if not wait and await self._shard_number(collection_name) > 1:
+            wait = True
+        ack = UpsertAck(collection_name=collection_name, acknowledged=wait)
+        
+        points = iter(points)
+        in_flight = set()
+        try:
+            while True:
+                chunk = list(itertools.islice(points, batch_size))
+                if not chunk:
+                    break
+                
+                if len(in_flight) >= parallel:
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+                
+                in_flight.add(asyncio.create_task(self.client.upsert(
+                    collection_name=collection_name,
+                    points=chunk,
+                    wait=wait
+                )))
+                ack.points += len(chunk)
+                ack.batches += 1
+                ack.last_point = chunk[-1]
+            
+            if in_flight:
+                await asyncio.gather(*in_flight)
+                in_flight = set()
+        finally:
+            # A failed chunk (or a cancelled caller) must not leave sibling requests running
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            # Chunks that did get through may have changed the collection
+            bump_generation(collection_name)
+        return ack
+    
+    async def flush(self, ack: Optional[UpsertAck] = None):
+        """Confirm that the unacknowledged writes behind ack have been applied"""
+        if ack is None or ack.acknowledged or ack.last_point is None:
+            return
+        
+        # Each shard applies updates in the order it received them, and
+        # _upsert_batched only leaves writes unacknowledged on single-shard
+        # collections, so a waiting (idempotent) re-upsert of the last
+        # point returns only once every earlier chunk has been applied.
+        await self.client.upsert(
+            collection_name=ack.collection_name,
+            points=[ack.last_point],
+            wait=True
+        )
+        ack.acknowledged = True
+        # Searches cached while the chunks were still being applied are stale
+        bump_generation(ack.collection_name)
+    
+    async def search_candidates(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: float = 0.3,
+        query_text: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Search for candidates using semantic similarity, fused with lexical matches when enabled"""
+        if query_text and await self._hybrid_enabled():
+            indices, values = encode_query(query_text)
+            if indices:
+                return await self._hybrid_search_candidates(
+                    query_embedding, SparseVector(indices=indices, values=values),
+                    limit, filters, score_threshold
+                )
+        
+        return await self._dense_search_candidates(query_embedding, limit, filters, score_threshold)
+    
+    async def _dense_search_candidates(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        filters: Optional[Dict[str, Any]],
+        score_threshold: float
+    ) -> List[Dict[str, Any]]:
+        """Rank resumes by their summary vector and, when chunks are indexed, their best chunk"""
+        # Qdrant applies the threshold, so `limit` hits above it come back
+        resume_search = self.client.query_points(
+            collection_name=self.RESUMES_COLLECTION,
+            query=query_embedding,
+            limit=limit,
+            score_threshold=score_threshold,
+            query_filter=self._build_filter(self.RESUMES_COLLECTION, filters),
+            search_params=self._search_params(self.RESUMES_COLLECTION)
+        )
+        if not settings.resume_chunk_indexing_enabled:
+            return self._format_results((await resume_search).points, score_threshold, "candidate")
+        
+        # Grouping by resume_id returns each resume's best chunk, i.e. its max-sim score
+        response, chunk_groups = await asyncio.gather(
+            resume_search,
+            self.client.query_points_groups(
+                collection_name=self.RESUME_CHUNKS_COLLECTION,
+                query=query_embedding,
+                group_by="resume_id",
+                group_size=1,
+                limit=limit,
+                score_threshold=score_threshold,
+                query_filter=self._build_filter(self.RESUME_CHUNKS_COLLECTION, filters),
+                search_params=self._search_params(self.RESUME_CHUNKS_COLLECTION),
+                with_payload=True
+            )
+        )
+        chunk_hits = [
+            group.hits[0] for group in chunk_groups.groups if group.hits
+        ]
+        resumes = self._format_results(response.points, score_threshold, "candidate")
+        chunks = [
+            {**hit, "id": hit["payload"]["resume_id"]}
+            for hit in self._format_results(chunk_hits, score_threshold, "candidate chunk")
+        ]
+        return max_sim_fusion([resumes, chunks], limit)
+    
+    async def _hybrid_search_candidates(
+        self,
+        query_embedding: List[float],
+        query_sparse: SparseVector,
+        limit: int,
+        filters: Optional[Dict[str, Any]],
+        score_threshold: float
+    ) -> List[Dict[str, Any]]:
+        """Run the dense and sparse rankings in one round trip and fuse them with RRF"""
+        query_filter = self._build_filter(self.RESUMES_COLLECTION, filters)
+        prefetch = limit * settings.hybrid_prefetch_multiplier
+        
+        if settings.resume_chunk_indexing_enabled:
+            # The dense side needs the chunk collection, so it cannot share the batch request
+            dense, sparse_response = await asyncio.gather(
+                self._dense_search_candidates(query_embedding, prefetch, filters, score_threshold),
+                self.client.query_points(
+                    collection_name=self.RESUMES_COLLECTION,
+                    query=query_sparse,
+                    using=self.SPARSE_VECTOR_NAME,
+                    query_filter=query_filter,
+                    limit=prefetch,
+                    with_payload=True
+                )
+            )
+        else:
+            dense_response, sparse_response = await self.client.query_batch_points(
+                collection_name=self.RESUMES_COLLECTION,
+                requests=[
+                    QueryRequest(
+                        query=query_embedding,
+                        filter=query_filter,
+                        limit=prefetch,
+                        score_threshold=score_threshold,
+                        params=self._search_params(self.RESUMES_COLLECTION),
+                        with_payload=True
+                    ),
+                    QueryRequest(
+                        query=query_sparse,
+                        using=self.SPARSE_VECTOR_NAME,
+                        filter=query_filter,
+                        limit=prefetch,
+                        with_payload=True
+                    ),
+                ]
+            )
+            dense = self._format_results(dense_response.points, score_threshold, "candidate")
+        
+        # The threshold applies to cosine scores only; lexical hits are kept
+        sparse = self._format_results(sparse_response.points, float("-inf"), "lexical candidate")
+        return reciprocal_rank_fusion([dense, sparse], limit, k=settings.hybrid_rrf_k)
+    
+    async def search_jobs(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: float = 0.3
+    ) -> List[Dict[str, Any]]:
+        """Search for jobs using semantic similarity"""
+        # Qdrant applies the threshold, so `limit` hits above it come back
+        response = await self.client.query_points(
+            collection_name=self.JOBS_COLLECTION,
+            query=query_embedding,
+            limit=limit,
+            score_threshold=score_threshold,
+            query_filter=self._build_filter(self.JOBS_COLLECTION, filters),
+            search_params=self._search_params(self.JOBS_COLLECTION)
+        )
+        
+        return self._format_results(response.points, score_threshold, "job")
+    
+    async def get_resume_by_id(self, resume_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get a resume by ID"""
+        return self._format_record(await self.client.retrieve(
+            collection_name=self.RESUMES_COLLECTION,
+            ids=[str(resume_id)]
+        ))
+    
+    async def get_job_by_id(self, job_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get a job by ID"""
+        return self._format_record(await self.client.retrieve(
+            collection_name=self.JOBS_COLLECTION,
+            ids=[str(job_id)]
+        ))
+    
+    async def delete_resume(self, resume_id: UUID) -> bool:
+        """Delete a resume and its chunks from Qdrant"""
+        await self.client.delete(
+            collection_name=self.RESUMES_COLLECTION,
+            points_selector=models.PointIdsList(
+                points=[str(resume_id)]
+            )
+        )
+        if settings.resume_chunk_indexing_enabled:
+            await self.client.delete(
+                collection_name=self.RESUME_CHUNKS_COLLECTION,
+                points_selector=models.FilterSelector(filter=Filter(must=[
+                    FieldCondition(key="resume_id", match=MatchValue(value=str(resume_id)))
+                ]))
+            )
+        bump_generation(self.RESUMES_COLLECTION)
+        return True
+    
+    async def delete_job(self, job_id: UUID) -> bool:
+        """Delete a job from Qdrant"""
+        await self.client.delete(
+            collection_name=self.JOBS_COLLECTION,
+            points_selector=models.PointIdsList(
+                points=[str(job_id)]
+            )
+        )
+        bump_generation(self.JOBS_COLLECTION)
+        return True
+    
+    async def count_points(self, collection_name: str) -> int:
+        """Number of points stored in a collection"""
+        return (await self.client.count(collection_name=collection_name, exact=True)).count
@@ -0,0 +1,389 @@
+"""Bulk resume ingestion pipeline"""
+import asyncio
+import csv
+import json
+import os
+import time
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+from uuid import NAMESPACE_URL, UUID, uuid5
+
+from app.config import get_settings
+from app.models.resume import Resume
+from app.services.document_service import DocumentParserPool, extract_text
+from app.services.fingerprint import sha256_hex, text_fingerprint
+
+settings = get_settings()
+
+SUPPORTED_EXTENSIONS = {".pdf": "pdf", ".docx": "docx"}
+
+
+@dataclass
+class SourceDocument:
+    """One resume file found in a directory or zip archive"""
+    key: str
+    file_name: str
+    file_type: str
+    read: Callable[[], bytes] = field(repr=False)
+
+
+def iter_documents(source: str) -> Iterator[SourceDocument]:
+    """Walk a directory or zip archive for PDF and DOCX files, in a stable order.
+
+    Document keys are relative paths (or archive member names), so a
+    checkpoint stays valid if the source is moved. An archive is closed
+    when iteration ends, so read each document before advancing past it.
+    """
+    path = Path(source)
+
+    if path.is_file() and zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for member in sorted(archive.namelist()):
+                file_type = SUPPORTED_EXTENSIONS.get(Path(member).suffix.lower())
+                if file_type and not member.endswith("/"):
+                    yield SourceDocument(
+                        key=member,
+                        file_name=Path(member).name,
+                        file_type=file_type,
+                        read=lambda member=member: archive.read(member)
+                    )
+        return
+
+    if not path.is_dir():
+        raise ValueError(f"Not a directory or zip archive: {source}")
+
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_type = SUPPORTED_EXTENSIONS.get(Path(name).suffix.lower())
+            if file_type:
+                file_path = Path(root) / name
+                yield SourceDocument(
+                    key=file_path.relative_to(path).as_posix(),
+                    file_name=name,
+                    file_type=file_type,
+                    read=file_path.read_bytes
+                )
+
+
+def read_owner_manifest(path: str) -> Dict[str, UUID]:
+    """Map document keys to candidate ids from a CSV with `file` and `candidate_id` columns.
+
+    A candidate has at most one resume, so each candidate_id may appear once.
+    """
+    owners = {}
+    files: Dict[UUID, str] = {}
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            key = str(row.get("file") or "").strip()
+            try:
+                owner = UUID(str(row.get("candidate_id") or "").strip())
+            except ValueError:
+                raise ValueError(f"{path} line {reader.line_num}: invalid candidate_id for {key or '(no file)'}")
+            if owner in files and files[owner] != key:
+                raise ValueError(f"{path} line {reader.line_num}: candidate {owner} already owns {files[owner]}")
+            files[owner] = key
+            owners[key] = owner
+    return owners
+
+
+class IngestionCheckpoint:
+    """Append-only JSONL log of finished documents, used to resume an interrupted run"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def completed(self) -> Set[str]:
+        """Keys of documents that were fully ingested by earlier runs"""
+        if not self.path.exists():
+            return set()
+
+        done = set()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn write from a crash
+                if entry.get("status") == "done":
+                    done.add(entry["key"])
+        return done
+
+    def record(self, entries: List[Dict[str, Any]]) -> None:
+        """Append entries and force them to disk"""
+        if not entries:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+@dataclass
+class IngestionReport:
+    """Progress and throughput counters for an ingestion run"""
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Documents ingested per second"""
+        return self.succeeded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.succeeded} ingested, {self.failed} failed, {self.skipped} skipped "
+            f"in {self.elapsed:.1f}s ({self.throughput:.2f} docs/s)"
+        )
+
+
+@dataclass
+class _Extracted:
+    """A document that has been parsed and extracted, waiting to be embedded and written"""
+    document: SourceDocument
+    resume: Resume
+    embedding_text: str
+
+
+class ResumeIngestionPipeline:
+    """Parse, extract, embed and store resumes in bulk.
+
+    Documents are parsed in a process pool, extracted by the LLM with
+    bounded concurrency, then embedded and written in batches: one
+    embeddings call, one batched vector upsert and one database
+    transaction per batch. Each batch is checkpointed only after the
+    vector store confirms the writes.
+
+    Each resume belongs to its candidate in owners (keyed like the
+    document keys), else to candidate_id. Resumes with neither are
+    ownerless: they get a placeholder candidate id derived from the
+    document, are searchable by recruiters and belong to no user account.
+    A candidate has at most one resume: run() refuses a source that gives
+    a candidate several documents, or a candidate who already has a
+    resume from elsewhere.
+    """
+
+    def __init__(
+        self,
+        checkpoint_path: str,
+        parse_workers: Optional[int] = None,
+        extraction_concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        parser_pool: Optional[DocumentParserPool] = None,
+        progress_interval: float = 10.0,
+        candidate_id: Optional[UUID] = None,
+        owners: Optional[Dict[str, UUID]] = None
+    ):
+        from app.agents.resume_parser_agent import ResumeParserAgent
+
+        self.checkpoint = IngestionCheckpoint(checkpoint_path)
+        self.parse_workers = parse_workers or settings.ingest_parse_workers or os.cpu_count()
+        self.extraction_concurrency = extraction_concurrency or settings.ingest_extraction_concurrency
+        self.batch_size = batch_size or settings.ingest_batch_size
+        self.parser_pool = parser_pool
+        self.progress_interval = progress_interval
+        self.candidate_id = candidate_id
+        self.owners = owners or {}
+
+        self.parser = ResumeParserAgent()
+        self.embedding_service = self.parser.embedding_service
+        self.vector_store = self.parser.vector_store
+        self.resume_repo = self.parser.resume_repo
+
+    async def run(self, source: str) -> IngestionReport:
+        """Ingest every document under source that earlier runs did not finish"""
+        report = IngestionReport()
+        done = self.checkpoint.completed()
+        namespace = f"resume-ingest:{Path(source).resolve()}"
+        if self.owners or self.candidate_id is not None:
+            await self._check_owners(source, namespace)
+
+        parser_pool = self.parser_pool or DocumentParserPool(
+            workers=self.parse_workers,
+            timeout=settings.document_parse_timeout_seconds,
+            memory_limit_mb=settings.document_parse_memory_mb
+        )
+        semaphore = asyncio.Semaphore(self.extraction_concurrency)
+        in_flight: Set[asyncio.Task] = set()
+        ready: List[_Extracted] = []
+        failures: List[Dict[str, Any]] = []
+        last_progress = time.monotonic()
+
+        async def collect(return_when):
+            finished, _ = await asyncio.wait(in_flight, return_when=return_when)
+            for task in finished:
+                in_flight.discard(task)
+                outcome = task.result()
+                if isinstance(outcome, _Extracted):
+                    ready.append(outcome)
+                else:
+                    failures.append(outcome)
+                    report.failed += 1
+
+        try:
+            for document in iter_documents(source):
+                if document.key in done:
+                    report.skipped += 1
+                    continue
+
+                # Keep a bounded window of documents between parsing and writing
+                if len(in_flight) >= self.extraction_concurrency * 2:
+                    await collect(asyncio.FIRST_COMPLETED)
+                # Read now: an archive member is unreadable once iteration moves on
+                try:
+                    content = document.read()
+                except Exception as e:
+                    print(f"[ingest] Failed {document.key}: {e}")
+                    failures.append({"key": document.key, "status": "failed", "error": str(e)})
+                    report.failed += 1
+                    continue
+                in_flight.add(asyncio.create_task(
+                    self._extract(document, content, namespace, parser_pool, semaphore)
+                ))
+
+                while len(ready) >= self.batch_size:
+                    await self._write_batch(ready[:self.batch_size], report)
+                    del ready[:self.batch_size]
+
+                if failures:
+                    self.checkpoint.record(failures)
+                    failures.clear()
+
+                if time.monotonic() - last_progress >= self.progress_interval:
+                    print(f"[ingest] {report.summary()}")
+                    last_progress = time.monotonic()
+
+            if in_flight:
+                await collect(asyncio.ALL_COMPLETED)
+            for start in range(0, len(ready), self.batch_size):
+                await self._write_batch(ready[start:start + self.batch_size], report)
+            self.checkpoint.record(failures)
+        finally:
+            if self.parser_pool is None:
+                parser_pool.shutdown()
+
+        print(f"[ingest] Done: {report.summary()}")
+        return report
+
+    async def _extract(
+        self,
+        document: SourceDocument,
+        content: bytes,
+        namespace: str,
+        parser_pool: DocumentParserPool,
+        semaphore: asyncio.Semaphore
+    ) -> Any:
+        """Parse and LLM-extract one document; returns _Extracted or a failure checkpoint entry"""
+        try:
+            text = await parser_pool.run(extract_text, content, document.file_type)
+            if not text.strip():
+                raise ValueError("No text could be extracted")
+
+            async with semaphore:
+                parsed_resume, _ = await self.parser.extract_resume(text)
+
+            # IDs derive from the source so a re-run overwrites instead of duplicating
+            resume = Resume(
+                id=uuid5(NAMESPACE_URL, f"{namespace}#{document.key}"),
+                candidate_id=self._owner(document, namespace),
+                raw_text=text,
+                parsed_data=parsed_resume,
+                file_name=document.file_name,
+                file_type=document.file_type,
+                content_sha256=sha256_hex(content),
+                text_sha256=text_fingerprint(text)
+            )
+            return _Extracted(
+                document=document,
+                resume=resume,
+                embedding_text=self.parser._create_embedding_text(parsed_resume, text)
+            )
+        except Exception as e:
+            print(f"[ingest] Failed {document.key}: {e}")
+            return {"key": document.key, "status": "failed", "error": str(e)}
+
+    async def _check_owners(self, source: str, namespace: str) -> None:
+        """Raise ValueError unless every owned document would be its candidate's only resume"""
+        documents: Dict[UUID, List[str]] = {}
+        for document in iter_documents(source):
+            owner = self.owners.get(document.key) or self.candidate_id
+            if owner is not None:
+                documents.setdefault(owner, []).append(document.key)
+
+        for owner, keys in documents.items():
+            if len(keys) > 1:
+                raise ValueError(
+                    f"Candidate {owner} would own {len(keys)} documents ({', '.join(keys[:3])}"
+                    f"{', ...' if len(keys) > 3 else ''}); a candidate can have one resume"
+                )
+            # A resume from an earlier run of this source has the same id and is overwritten
+            existing = await self.resume_repo.get_summary_by_candidate_id(str(owner))
+            if existing is not None and existing.id != uuid5(NAMESPACE_URL, f"{namespace}#{keys[0]}"):
+                raise ValueError(f"Candidate {owner} already has resume {existing.id}")
+
+    def _owner(self, document: SourceDocument, namespace: str) -> UUID:
+        """Candidate who owns a document, or a placeholder id for an ownerless resume"""
+        owner = self.owners.get(document.key) or self.candidate_id
+        if owner is not None:
+            return owner
+        return uuid5(NAMESPACE_URL, f"{namespace}#{document.key}#candidate")
+
+    async def _write_batch(self, batch: List[_Extracted], report: IngestionReport) -> None:
+        """Embed a batch in one call, write it to the vector store and database, then checkpoint it"""
+        if not batch:
+            return
+
+        # Chunks (when enabled) are embedded in the same call as the summaries
+        chunked = [
+            self.parser.document_service.chunk_text(item.resume.raw_text)
+            if settings.resume_chunk_indexing_enabled else []
+            for item in batch
+        ]
+        all_embeddings = await self.embedding_service.generate_embeddings_batch(
+            [item.embedding_text for item in batch] + [chunk for chunks in chunked for chunk in chunks]
+        )
+        embeddings = all_embeddings[:len(batch)]
+        chunk_embeddings = all_embeddings[len(batch):]
+
+        ack = await self.vector_store.upsert_resumes_batch(
+            (
+                {
+                    "resume_id": item.resume.id,
+                    "candidate_id": item.resume.candidate_id,
+                    "embedding": embedding,
+                    "metadata": self.parser.vector_metadata(item.resume.parsed_data),
+                    "sparse_text": self.parser._create_sparse_text(item.resume.parsed_data, item.resume.raw_text),
+                }
+                for item, embedding in zip(batch, embeddings)
+            ),
+            wait=False
+        )
+        if settings.resume_chunk_indexing_enabled:
+            offset = 0
+            for item, chunks in zip(batch, chunked):
+                await self.vector_store.upsert_resume_chunks(
+                    resume_id=item.resume.id,
+                    candidate_id=item.resume.candidate_id,
+                    chunk_embeddings=chunk_embeddings[offset:offset + len(chunks)],
+                    metadata=self.parser.vector_metadata(item.resume.parsed_data)
+                )
+                offset += len(chunks)
+        await self.resume_repo.create_many([item.resume for item in batch])
+        await self.vector_store.flush(ack)
+
+        self.checkpoint.record([
+            {"key": item.document.key, "status": "done", "resume_id": str(item.resume.id)}
+            for item in batch
+        ])
+        report.succeeded += len(batch)
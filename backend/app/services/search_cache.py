@@ -0,0 +1,106 @@
+"""Search result cache invalidated by vector store writes"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import get_settings
+from app.services.embedding_cache import normalize_text
+from app.services.vector_store import collection_generation
+
+
+def make_search_key(
+    collection_name: str,
+    query: str,
+    filters: Optional[Dict[str, Any]],
+    limit: int,
+    score_threshold: float
+) -> str:
+    """Build the cache key for a search request"""
+    return json.dumps(
+        [
+            collection_name,
+            normalize_text(query).lower(),
+            filters or {},
+            limit,
+            score_threshold,
+        ],
+        sort_keys=True,
+        default=str
+    )
+
+
+class SearchResultCache:
+    """LRU of raw vector search hits, tagged with the collection generation they were read at.
+
+    An entry is served only while its collection's generation is unchanged,
+    so any upsert or delete invalidates every cached search on that
+    collection. Generations are per process, so with several API workers
+    (or writes from the import CLIs) a write only invalidates the writer's
+    cache; elsewhere results can be stale for up to the TTL. The default
+    TTL is short for that reason; raise it only for a single worker.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[int, float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, collection_name: str, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached hits if still valid for the collection's current generation"""
+        generation = collection_generation(collection_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            entry_generation, stored_at, results = entry
+            if entry_generation != generation or time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(results)
+
+    def put(self, key: str, generation: int, results: List[Dict[str, Any]]) -> None:
+        """Store hits read at the given generation (captured before the search ran)"""
+        with self._lock:
+            self._entries[key] = (generation, time.monotonic(), list(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+@lru_cache()
+def get_search_cache() -> Optional[SearchResultCache]:
+    """Get the process-wide search result cache, or None when disabled"""
+    settings = get_settings()
+    if not settings.search_cache_enabled:
+        return None
+    return SearchResultCache(
+        max_entries=settings.search_cache_max_entries,
+        ttl_seconds=settings.search_cache_ttl_seconds
+    )
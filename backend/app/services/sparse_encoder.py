@@ -0,0 +1,56 @@
+"""Local BM25-style sparse encoder for lexical retrieval"""
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Keeps tokens like "c++", "c#", "node.js" and "k8s" intact
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+# BM25 term-frequency saturation and length normalisation
+K1 = 1.2
+B = 0.75
+AVERAGE_DOCUMENT_LENGTH = 200
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with trailing punctuation stripped"""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        token = token.rstrip(".-")
+        if token:
+            tokens.append(token)
+    return tokens
+
+
+def token_index(token: str) -> int:
+    """Stable (process-independent) sparse dimension for a token"""
+    return zlib.crc32(token.encode("utf-8")) & 0x7FFFFFFF
+
+
+def encode_document(text: str) -> Tuple[List[int], List[float]]:
+    """Sparse document vector: BM25 term-frequency weights per token.
+
+    IDF is left to the index (Qdrant's IDF modifier, or the embedded
+    store's own document frequencies), so document vectors never need to
+    be recomputed as the corpus grows.
+    """
+    counts = Counter(tokenize(text))
+    length = sum(counts.values())
+    if not length:
+        return [], []
+
+    norm = K1 * (1 - B + B * length / AVERAGE_DOCUMENT_LENGTH)
+    weights: Dict[int, float] = {}
+    for token, tf in counts.items():
+        index = token_index(token)
+        weights[index] = weights.get(index, 0.0) + tf * (K1 + 1) / (tf + norm)
+
+    indices = sorted(weights)
+    return indices, [weights[i] for i in indices]
+
+
+def encode_query(text: str) -> Tuple[List[int], List[float]]:
+    """Sparse query vector: each distinct token with weight 1"""
+    indices = sorted({token_index(token) for token in tokenize(text)})
+    return indices, [1.0] * len(indices)
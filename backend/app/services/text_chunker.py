@@ -0,0 +1,122 @@
+"""Streaming text chunker for embedding long documents"""
+import re
+from typing import Iterator, Optional, Protocol, Tuple
+
+# Preferred break points, strongest first
+SEPARATORS = (". ", "\n\n", "\n", "! ", "? ")
+
+
+class LengthEstimator(Protocol):
+    """Measures chunk budgets in some unit (characters, tokens, ...) without copying the text"""
+
+    def measure(self, text: str, start: int, end: int) -> int:
+        """Units in text[start:end]"""
+
+    def advance(self, text: str, start: int, units: int) -> int:
+        """Offset reached after consuming `units` units from start (at most len(text))"""
+
+
+class CharLength:
+    """Budgets in characters"""
+
+    def measure(self, text: str, start: int, end: int) -> int:
+        return end - start
+
+    def advance(self, text: str, start: int, units: int) -> int:
+        return min(len(text), start + max(units, 0))
+
+
+class ApproxTokenLength:
+    """Budgets in approximate tokens: words, numbers and punctuation marks.
+
+    A local stand-in for a model tokenizer; it slightly undercounts BPE
+    tokens for rare words, so leave some headroom in the budget.
+    """
+
+    _TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+    def measure(self, text: str, start: int, end: int) -> int:
+        return sum(1 for _ in self._TOKEN_RE.finditer(text, start, end))
+
+    def advance(self, text: str, start: int, units: int) -> int:
+        if units <= 0:
+            return start
+        for count, match in enumerate(self._TOKEN_RE.finditer(text, start), 1):
+            if count == units:
+                return match.end()
+        return len(text)
+
+
+LENGTH_ESTIMATORS = {
+    "chars": CharLength,
+    "tokens": ApproxTokenLength,
+}
+
+
+class _SeparatorCursor:
+    """Tracks the last occurrence of a separator that ends at or before a growing offset"""
+
+    __slots__ = ("text", "separator", "last", "next")
+
+    def __init__(self, text: str, separator: str):
+        self.text = text
+        self.separator = separator
+        self.last = -1
+        self.next = text.find(separator)
+
+    def last_before(self, end: int) -> int:
+        while self.next != -1 and self.next + len(self.separator) <= end:
+            self.last = self.next
+            self.next = self.text.find(self.separator, self.next + 1)
+        return self.last
+
+
+def iter_chunks(
+    text: str,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    length: Optional[LengthEstimator] = None
+) -> Iterator[Tuple[int, str]]:
+    """Yield (offset, chunk) for overlapping chunks of text, lazily.
+
+    Each window of chunk_size units is cut at the strongest separator in
+    its second half, and the next window starts chunk_overlap units
+    before the cut. Window ends only move forward, so every separator is
+    found once by a forward-only cursor: chunking is linear in the text
+    length and holds no more than one chunk at a time. Chunks are
+    stripped; offset is where the stripped chunk starts in text.
+
+    chunk_overlap must be less than half of chunk_size: cuts can fall
+    anywhere in a window's second half, and a larger overlap would step
+    back over most of the window, so the next start would barely advance.
+    """
+    if not 0 <= chunk_overlap < chunk_size // 2:
+        raise ValueError(
+            f"chunk_overlap must be at least 0 and less than half of chunk_size "
+            f"(got chunk_size={chunk_size}, chunk_overlap={chunk_overlap})"
+        )
+
+    length = length or CharLength()
+    cursors = [_SeparatorCursor(text, separator) for separator in SEPARATORS]
+
+    start = 0
+    while start < len(text):
+        end = length.advance(text, start, chunk_size)
+
+        if end < len(text):
+            half = (end - start) // 2
+            for cursor in cursors:
+                last = cursor.last_before(end)
+                if last - start > half:
+                    end = last + len(cursor.separator)
+                    break
+
+        window = text[start:end]
+        chunk = window.strip()
+        if chunk:
+            yield start + len(window) - len(window.lstrip()), chunk
+
+        if end >= len(text):
+            break
+        units = length.measure(text, start, end)
+        start = max(start + 1, length.advance(text, start, units - chunk_overlap))
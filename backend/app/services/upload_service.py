@@ -0,0 +1,80 @@
+"""Streaming, size-bounded handling of uploaded documents"""
+import hashlib
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from fastapi import UploadFile
+
+from app.config import get_settings
+
+CHUNK_SIZE = 64 * 1024
+
+# Leading bytes of each supported format (DOCX is a zip container)
+MAGIC_BYTES = {
+    "pdf": b"%PDF-",
+    "docx": b"PK\x03\x04",
+}
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit"""
+
+
+@dataclass
+class SpooledUpload:
+    """An upload copied to a temporary file on disk"""
+    path: str
+    file_type: str
+    size: int
+    sha256: str
+
+
+def detect_file_type(header: bytes) -> Optional[str]:
+    """Identify a supported document format from its first bytes"""
+    for file_type, magic in MAGIC_BYTES.items():
+        if header.startswith(magic):
+            return file_type
+    return None
+
+
+@asynccontextmanager
+async def spool_upload(file: UploadFile, max_bytes: Optional[int] = None) -> AsyncIterator[SpooledUpload]:
+    """Stream an upload to a temporary file in chunks, deleting it on exit.
+
+    The format is checked against the first chunk and the size limit is
+    enforced while copying, so oversized or mislabelled files are
+    rejected before they are fully read. The caller may move the file
+    elsewhere to keep it.
+    """
+    settings = get_settings()
+    max_bytes = max_bytes or settings.upload_max_mb * 1024 * 1024
+
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLargeError(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+
+    first_chunk = await file.read(CHUNK_SIZE)
+    file_type = detect_file_type(first_chunk)
+    if file_type is None:
+        raise ValueError("File content is not a valid PDF or DOCX document")
+
+    fd, path = tempfile.mkstemp(suffix=f".{file_type}", dir=settings.upload_tmp_dir)
+    try:
+        size = 0
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as out:
+            chunk = first_chunk
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+                out.write(chunk)
+                digest.update(chunk)
+                chunk = await file.read(CHUNK_SIZE)
+
+        yield SpooledUpload(path=path, file_type=file_type, size=size, sha256=digest.hexdigest())
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
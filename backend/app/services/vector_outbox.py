@@ -0,0 +1,158 @@
+"""Dispatcher that applies outbox entries to the vector store"""
+import asyncio
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from app.config import get_settings
+from app.db.repositories import JobRepository, ResumeRepository, VectorOutboxRepository
+from app.models.outbox import VectorWrite, VectorWriteKind
+from app.services.vector_store import get_vector_store
+
+
+class VectorOutboxDispatcher:
+    """Background task that brings vectors in line with committed database rows.
+
+    Repositories add an outbox entry in the same transaction as the row
+    they change, so a crash between the SQL commit and the Qdrant write
+    leaves a pending entry instead of a missing or orphaned vector. An
+    entry only names an entity: the dispatcher re-reads the row and
+    upserts its vector, or deletes the vector if the row is gone, so
+    applying an entry twice is harmless. Due entries are applied in
+    batches with one embedding call per kind. Applied entries are
+    completed at checkpoints, after the vector store has persisted them,
+    rather than after every batch.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, poll_interval: Optional[float] = None):
+        from app.agents.resume_parser_agent import ResumeParserAgent
+        from app.agents.job_parser_agent import JobParserAgent
+
+        settings = get_settings()
+        self.batch_size = batch_size or settings.vector_outbox_batch_size
+        self.poll_interval = poll_interval or settings.vector_outbox_poll_interval_seconds
+        self.max_attempts = settings.vector_outbox_max_attempts
+        self.retry_backoff = settings.vector_outbox_retry_backoff_seconds
+        self.checkpoint_interval = settings.vector_outbox_checkpoint_seconds
+
+        self.repo = VectorOutboxRepository()
+        self.resume_repo = ResumeRepository()
+        self.job_repo = JobRepository()
+        self.resume_parser = ResumeParserAgent()
+        self.job_parser = JobParserAgent()
+        self.vector_store = get_vector_store()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._applied: List[UUID] = []
+        self._last_checkpoint = time.monotonic()
+
+    def notify(self) -> None:
+        """Wake the dispatcher after committing new entries"""
+        self._wake.set()
+
+    def start(self) -> None:
+        """Start the dispatch loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="vector-outbox")
+
+    async def stop(self) -> None:
+        """Cancel the dispatch loop and checkpoint; unapplied entries are picked up on the next start"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.checkpoint()
+    
+    async def checkpoint(self) -> None:
+        """Persist the vector store, then complete the entries applied since the last checkpoint.
+
+        If the process dies before this runs the entries are still pending
+        and get applied again, which is harmless.
+        """
+        self._last_checkpoint = time.monotonic()
+        if not self._applied:
+            return
+        await self.vector_store.flush()
+        applied, self._applied = self._applied, []
+        await self.repo.complete(applied)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                applied = await self.dispatch_once()
+            except Exception as e:
+                print(f"Vector outbox error: {e}")
+                applied = 0
+
+            if applied < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+    async def dispatch_once(self) -> int:
+        """Apply one batch of due entries; returns the number of entries handled"""
+        entries = await self.repo.get_due(self.batch_size, exclude=self._applied)
+        by_kind: Dict[VectorWriteKind, List[VectorWrite]] = {}
+        for entry in entries:
+            by_kind.setdefault(entry.kind, []).append(entry)
+
+        for kind, kind_entries in by_kind.items():
+            try:
+                if kind == VectorWriteKind.RESUME:
+                    await self._sync_resumes(kind_entries)
+                else:
+                    await self._sync_jobs(kind_entries)
+            except Exception as e:
+                await self._retry(kind_entries, str(e))
+            else:
+                self._applied.extend(entry.id for entry in kind_entries)
+
+        # Entries are only done once the writes are durable (the embedded store persists on flush);
+        # the size bound keeps the exclusion list short under a steady backlog
+        if (
+            time.monotonic() - self._last_checkpoint >= self.checkpoint_interval
+            or len(self._applied) >= self.batch_size * 8
+        ):
+            await self.checkpoint()
+
+        return len(entries)
+
+    async def _sync_resumes(self, entries: List[VectorWrite]) -> None:
+        ids = _entity_ids(entries)
+        resumes = await self.resume_repo.get_by_ids(ids)
+        await self.resume_parser.index_resumes([r for r in resumes if r is not None])
+        for entity_id, resume in zip(ids, resumes):
+            if resume is None:
+                await self.vector_store.delete_resume(entity_id)
+
+    async def _sync_jobs(self, entries: List[VectorWrite]) -> None:
+        ids = _entity_ids(entries)
+        jobs = await self.job_repo.get_by_ids(ids)
+        await self.job_parser.index_jobs([j for j in jobs if j is not None])
+        for entity_id, job in zip(ids, jobs):
+            if job is None:
+                await self.vector_store.delete_job(entity_id)
+
+    async def _retry(self, entries: List[VectorWrite], error: str) -> None:
+        """Back off failed entries exponentially, giving up after max_attempts"""
+        print(f"Vector outbox write failed for {len(entries)} entries: {error}")
+        for entry in entries:
+            if entry.attempts + 1 >= self.max_attempts:
+                await self.repo.fail(entry.id, error)
+            else:
+                delay = min(self.retry_backoff * 2 ** entry.attempts, 300)
+                await self.repo.retry(entry.id, error, delay)
+
+
+def _entity_ids(entries: List[VectorWrite]) -> List[UUID]:
+    """Distinct entity ids, in entry order"""
+    return list(dict.fromkeys(entry.entity_id for entry in entries))
+
+
+@lru_cache()
+def get_vector_outbox() -> VectorOutboxDispatcher:
+    """Get the process-wide vector outbox dispatcher"""
+    return VectorOutboxDispatcher()
@@ -0,0 +1,231 @@
+"""Vector store interface and backend selection"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Optional
+from uuid import UUID, uuid5
+
+from app.config import get_settings
+
+# Per-collection write counters, bumped on every upsert and delete. They are
+# process-local: writes made by another worker process or a CLI import are not
+# seen here, and cached searches age out only through the search cache TTL.
+_generations: Dict[str, int] = {}
+
+
+def collection_generation(collection_name: str) -> int:
+    """Current write generation of a collection in this process"""
+    return _generations.get(collection_name, 0)
+
+
+def bump_generation(collection_name: str) -> int:
+    """Record a write to a collection, invalidating searches cached against it"""
+    _generations[collection_name] = _generations.get(collection_name, 0) + 1
+    return _generations[collection_name]
+
+
+@dataclass
+class UpsertAck:
+    """Result of a batched upsert; pass it to VectorStore.flush to confirm durability"""
+    collection_name: str
+    points: int = 0
+    batches: int = 0
+    acknowledged: bool = True
+    last_point: Any = field(default=None, repr=False)
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[Dict[str, Any]]],
+    limit: int,
+    k: int = 60
+) -> List[Dict[str, Any]]:
+    """Fuse ranked result lists with reciprocal-rank fusion.
+    
+    Scores are normalised so a hit ranked first in every list scores 1.0,
+    which keeps them on the same 0-1 scale as cosine similarity.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, result in enumerate(ranking):
+            entry = fused.setdefault(str(result["id"]), {**result, "score": 0.0})
+            entry["score"] += 1.0 / (k + rank + 1)
+    
+    best_possible = len(rankings) / (k + 1)
+    results = sorted(fused.values(), key=lambda r: r["score"], reverse=True)[:limit]
+    for result in results:
+        result["score"] = result["score"] / best_possible
+    return results
+
+
+def max_sim_fusion(rankings: List[List[Dict[str, Any]]], limit: int) -> List[Dict[str, Any]]:
+    """Merge rankings that score the same resumes by different vectors.
+    
+    Each resume keeps its best-scoring hit (max-sim), so a resume matched
+    by its summary vector and several chunks is returned once.
+    """
+    best: Dict[str, Dict[str, Any]] = {}
+    for ranking in rankings:
+        for result in ranking:
+            key = str(result["id"])
+            if key not in best or result["score"] > best[key]["score"]:
+                best[key] = result
+    return sorted(best.values(), key=lambda r: r["score"], reverse=True)[:limit]
+
+
+def chunk_point_id(resume_id: UUID, chunk_index: int) -> str:
+    """Deterministic ID of a resume's chunk point, so re-indexing overwrites it"""
+    return str(uuid5(UUID(str(resume_id)), f"chunk-{chunk_index}"))
+
+
+class VectorStore(ABC):
+    """Interface shared by the vector store backends used by the agents"""
+
+    # Collection names
+    RESUMES_COLLECTION = "resumes"
+    JOBS_COLLECTION = "jobs"
+    # Child points holding chunk-level resume vectors, keyed by resume_id
+    RESUME_CHUNKS_COLLECTION = "resume_chunks"
+
+    # Embedding dimensions for text-embedding-3-small
+    VECTOR_SIZE = 1536
+
+    @abstractmethod
+    async def initialize_collections(self):
+        """Create collections and indexes if they don't exist"""
+
+    @abstractmethod
+    async def upsert_resume(
+        self,
+        resume_id: UUID,
+        candidate_id: UUID,
+        embedding: List[float],
+        metadata: Dict[str, Any],
+        sparse_text: Optional[str] = None
+    ) -> bool:
+        """Upsert a resume embedding.
+        
+        sparse_text, when given, is indexed as a lexical sparse vector for
+        hybrid candidate search.
+        """
+
+    @abstractmethod
+    async def upsert_resume_chunks(
+        self,
+        resume_id: UUID,
+        candidate_id: UUID,
+        chunk_embeddings: List[List[float]],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """Replace the chunk vectors of a resume.
+        
+        Each chunk is stored as a child point carrying resume_id and the
+        resume's metadata, so payload filters apply to chunks too.
+        """
+
+    @abstractmethod
+    async def upsert_job(
+        self,
+        job_id: UUID,
+        recruiter_id: UUID,
+        embedding: List[float],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """Upsert a job embedding"""
+
+    @abstractmethod
+    async def upsert_resumes_batch(
+        self,
+        items: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        parallel: Optional[int] = None,
+        wait: bool = True
+    ) -> UpsertAck:
+        """Upsert many resumes in chunks.
+        
+        Each item has the upsert_resume arguments: resume_id, candidate_id,
+        embedding and metadata. With wait=False chunks are not confirmed
+        individually; call flush(ack) once at the end of the import.
+        """
+
+    @abstractmethod
+    async def upsert_jobs_batch(
+        self,
+        items: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        parallel: Optional[int] = None,
+        wait: bool = True
+    ) -> UpsertAck:
+        """Upsert many jobs in chunks; items have the upsert_job arguments"""
+
+    @abstractmethod
+    async def flush(self, ack: Optional[UpsertAck] = None):
+        """Block until previously sent writes (or those behind ack) are durable"""
+
+    @abstractmethod
+    async def search_candidates(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: float = 0.3,
+        query_text: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Search for candidates.
+        
+        With chunk indexing enabled, each resume's dense score is the best
+        of its summary vector and its chunk vectors (max-sim), and each
+        candidate is returned once. With query_text and hybrid search
+        enabled, the dense ranking (after score_threshold) is fused with a
+        lexical sparse ranking using reciprocal-rank fusion.
+        """
+
+    @abstractmethod
+    async def search_jobs(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: float = 0.3
+    ) -> List[Dict[str, Any]]:
+        """Search for jobs using semantic similarity"""
+
+    @abstractmethod
+    async def get_resume_by_id(self, resume_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get a resume by ID"""
+
+    @abstractmethod
+    async def get_job_by_id(self, job_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get a job by ID"""
+
+    @abstractmethod
+    async def delete_resume(self, resume_id: UUID) -> bool:
+        """Delete a resume and its chunks"""
+
+    @abstractmethod
+    async def delete_job(self, job_id: UUID) -> bool:
+        """Delete a job"""
+
+    @abstractmethod
+    async def count_points(self, collection_name: str) -> int:
+        """Number of points stored in a collection"""
+
+    async def close(self):
+        """Release resources held by the backend"""
+
+
+@lru_cache()
+def get_vector_store() -> VectorStore:
+    """Get the process-wide vector store for the configured backend"""
+    settings = get_settings()
+    backend = settings.vector_store_backend.lower()
+
+    if backend == "qdrant":
+        from app.services.qdrant_service import AsyncQdrantService
+        return AsyncQdrantService()
+    if backend == "embedded":
+        from app.services.embedded_vector_store import EmbeddedVectorStore
+        return EmbeddedVectorStore(
+            path=settings.vector_store_path,
+            mmap=settings.vector_store_mmap
+        )
+    raise ValueError(f"Unsupported VECTOR_STORE_BACKEND: {settings.vector_store_backend}")
@@ -73,6 +73,52 @@ class TestResumeParserAgent:
         assert "Skills: Python, FastAPI, React" in embedding_text
 
 
+    @pytest.mark.asyncio
+    async def test_parse_resume_dedups_by_fingerprint(self):
+        from app.models.resume import Resume, ParsedResume
+        agent = ResumeParserAgent()
+        candidate_id, other_candidate = uuid4(), uuid4()
+        existing = Resume(candidate_id=candidate_id, raw_text="cv", parsed_data=ParsedResume(name="Jane"))
+        agent.resume_repo = MagicMock()
+        agent.resume_repo.find_by_fingerprint = AsyncMock(return_value=existing)
+        agent.resume_repo.create = AsyncMock()
+        agent.vector_store = MagicMock()
+        agent.vector_store.get_resume_by_id = AsyncMock(return_value={"id": str(existing.id)})
+        agent.vector_store.upsert_resume = AsyncMock()
+        agent.embedding_service = MagicMock()
+        agent.embedding_service.generate_embedding = AsyncMock(return_value=[0.0] * 1536)
+        agent.extract_resume = AsyncMock()
+        
+        # Same candidate: the existing record is returned untouched
+        assert await agent.parse_resume("cv", candidate_id) is existing
+        agent.resume_repo.create.assert_not_called()
+        
+        # Another candidate: parsed data is reused, but a new record is created
+        resume = await agent.parse_resume("cv", other_candidate)
+        assert resume.id != existing.id and resume.parsed_data.name == "Jane"
+        agent.resume_repo.create.assert_awaited_once()
+        agent.extract_resume.assert_not_called()
+
+
+    @pytest.mark.asyncio
+    async def test_extract_resume_served_from_extraction_cache(self, tmp_path):
+        from app.services.extraction_cache import ExtractionCache
+        agent = ResumeParserAgent()
+        agent.extraction_cache = ExtractionCache(str(tmp_path / "extractions.db"))
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = '{"name": "Jane", "skills": ["Go"]}'
+        agent.client = MagicMock()
+        agent.client.chat.completions.create = AsyncMock(return_value=response)
+        
+        first, usage = await agent.extract_resume("Jane, Go developer")
+        second, cached_usage = await agent.extract_resume("Jane,  Go developer")
+        
+        assert first == second and second.skills == ["Go"]
+        assert usage is not None and cached_usage is None
+        agent.client.chat.completions.create.assert_awaited_once()
+
+
 class TestSearchAgent:
     def test_calculate_experience_years(self):
         from app.models.resume import Resume, ParsedResume
@@ -87,3 +133,47 @@ class TestSearchAgent:
         
         # Test with no resume
         assert agent._get_current_role(None) is None
+    
+    @pytest.mark.asyncio
+    async def test_search_candidates_hydrates_in_one_query(self):
+        agent = SearchAgent()
+        hits = [
+            {"id": str(uuid4()), "score": 0.9, "payload": {"name": "A", "skills": ["Python"]}},
+            {"id": str(uuid4()), "score": 0.8, "payload": {"name": "B", "skills": ["Go"]}},
+        ]
+        agent.embedding_service = MagicMock()
+        agent.embedding_service.generate_embedding = AsyncMock(return_value=[0.0] * 1536)
+        agent.vector_store = MagicMock()
+        agent.vector_store.search_candidates = AsyncMock(return_value=hits)
+        agent.resume_repo = MagicMock()
+        agent.resume_repo.get_summaries_by_ids = AsyncMock(return_value=[None, None])
+        agent.resume_repo.get_by_id = AsyncMock()
+        agent.search_cache = None
+        
+        results = await agent.search_candidates(query="python engineer")
+        
+        agent.resume_repo.get_summaries_by_ids.assert_awaited_once_with([h["id"] for h in hits])
+        agent.resume_repo.get_by_id.assert_not_called()
+        assert [str(r.id) for r in results] == [h["id"] for h in hits]
+    
+    @pytest.mark.asyncio
+    async def test_repeated_search_served_from_cache_until_write(self):
+        from app.services.search_cache import SearchResultCache
+        from app.services.vector_store import bump_generation
+        agent = SearchAgent()
+        agent.embedding_service = MagicMock()
+        agent.embedding_service.generate_embedding = AsyncMock(return_value=[0.0] * 1536)
+        agent.vector_store = MagicMock()
+        agent.vector_store.search_jobs = AsyncMock(return_value=[
+            {"id": str(uuid4()), "score": 0.9, "payload": {"title": "Engineer"}}
+        ])
+        agent.search_cache = SearchResultCache(max_entries=8, ttl_seconds=60)
+        
+        await agent.search_jobs(query="Rust  developer")
+        await agent.search_jobs(query="rust developer")
+        assert agent.embedding_service.generate_embedding.await_count == 1
+        assert agent.vector_store.search_jobs.await_count == 1
+        
+        bump_generation("jobs")
+        await agent.search_jobs(query="rust developer")
+        assert agent.vector_store.search_jobs.await_count == 2
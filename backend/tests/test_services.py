@@ -1,9 +1,32 @@
 """Tests for services"""
 import pytest
+import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.services.document_service import DocumentService
 from app.services.auth_service import AuthService
+from app.services.embedding_cache import EmbeddingCache, make_cache_key
+from app.services.qdrant_service import AsyncQdrantService, _AsyncClientPool
+from app.services.embedded_vector_store import EmbeddedVectorStore
+from app.services.sparse_encoder import tokenize, encode_document
+from app.services.vector_store import reciprocal_rank_fusion
+from app.services.resume_ingestion import ResumeIngestionPipeline, iter_documents
+from app.services.ingestion_queue import IngestionWorkerPool
+from app.services.vector_outbox import VectorOutboxDispatcher
+from app.services.job_feed_import import JobFeedImporter, FeedPosting, iter_feed
+
+
+@pytest_asyncio.fixture
+async def temp_database(tmp_path):
+    """Point the app's engine and sessions at a throwaway SQLite database"""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    from app.db.database import build_engine, init_db
+    engine = build_engine(f"sqlite:///{tmp_path / 'recruitment.db'}")
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with patch("app.db.database.engine", engine), patch("app.db.database.async_session", sessions):
+        await init_db()
+        yield engine
+    await engine.dispose()
 
 
 class TestDocumentService:
@@ -23,6 +46,1067 @@ class TestDocumentService:
         chunks = service.chunk_text(text)
         
         assert len(chunks) > 1
+    
+    def test_iter_chunks_offsets_and_sentence_breaks(self):
+        from app.services.text_chunker import iter_chunks
+        text = " ".join(f"Sentence number {i} is here." for i in range(60))
+        
+        chunks = list(iter_chunks(text, chunk_size=200, chunk_overlap=40))
+        
+        assert all(text[offset:offset + len(chunk)] == chunk for offset, chunk in chunks)
+        assert all(chunk.endswith(".") for _, chunk in chunks)
+        # The last window ends the text; no tail chunk is repeated inside it
+        assert chunks[-1][1].endswith("59 is here.") and not chunks[-2][1].endswith("59 is here.")
+    
+    def test_iter_chunks_token_budget(self):
+        from app.services.text_chunker import iter_chunks, ApproxTokenLength
+        length = ApproxTokenLength()
+        text = "word, " * 1000
+        
+        chunks = list(iter_chunks(text, chunk_size=50, chunk_overlap=10, length=length))
+        
+        assert max(length.measure(chunk, 0, len(chunk)) for _, chunk in chunks) <= 50
+        assert chunks[-1][0] + len(chunks[-1][1]) == len(text.rstrip())
+    
+    def test_iter_chunks_rejects_overlap_of_half_the_window(self):
+        from app.services.text_chunker import iter_chunks
+        for chunk_overlap in (-1, 50, 120):
+            with pytest.raises(ValueError):
+                list(iter_chunks("text " * 100, chunk_size=100, chunk_overlap=chunk_overlap))
+    
+    @pytest.mark.asyncio
+    async def test_parse_runs_in_worker_and_recovers_from_timeout(self, tmp_path):
+        import time
+        from app.services.document_service import DocumentParserPool, extract_text
+        path = tmp_path / "cv.docx"
+        _write_docx(path, "Jane Doe, Rust engineer")
+        pool = DocumentParserPool(workers=1, timeout=5)
+        try:
+            with pytest.raises(ValueError, match="timed out"):
+                await pool.run(time.sleep, 60)
+            
+            text = await pool.run(extract_text, path.read_bytes(), "docx")
+            assert text == "Jane Doe, Rust engineer"
+        finally:
+            pool.shutdown()
+
+    
+    @pytest.mark.asyncio
+    async def test_timeout_does_not_fail_other_parses(self, tmp_path):
+        import asyncio
+        import time
+        from app.services.document_service import DocumentParserPool, DocumentParseError, extract_text
+        path = tmp_path / "cv.docx"
+        _write_docx(path, "Jane Doe, Rust engineer")
+        pool = DocumentParserPool(workers=1, timeout=4)
+        
+        async def innocent():
+            await asyncio.sleep(0.5)  # queued behind the stuck parse, with a later deadline
+            return await pool.run(extract_text, path.read_bytes(), "docx")
+        
+        try:
+            stuck, text = await asyncio.gather(pool.run(time.sleep, 60), innocent(), return_exceptions=True)
+            assert isinstance(stuck, DocumentParseError) and "timed out" in str(stuck)
+            assert text == "Jane Doe, Rust engineer"
+        finally:
+            pool.shutdown()
+
+class TestUploadSpooling:
+    @staticmethod
+    def _upload(content):
+        import io
+        from fastapi import UploadFile
+        return UploadFile(file=io.BytesIO(content), filename="cv.pdf")
+    
+    @pytest.mark.asyncio
+    async def test_spools_to_disk_and_cleans_up(self):
+        import os
+        from app.services.upload_service import spool_upload
+        content = b"%PDF-1.7\n" + b"x" * 200_000
+        
+        async with spool_upload(self._upload(content), max_bytes=1024 * 1024) as upload:
+            assert (upload.file_type, upload.size) == ("pdf", len(content))
+            with open(upload.path, "rb") as f:
+                assert f.read() == content
+        
+        assert not os.path.exists(upload.path)
+    
+    @pytest.mark.asyncio
+    async def test_rejects_wrong_magic_and_oversized_files(self):
+        from app.services.upload_service import spool_upload, UploadTooLargeError
+        with pytest.raises(ValueError, match="not a valid PDF or DOCX"):
+            async with spool_upload(self._upload(b"GIF89a...")):
+                pass
+        
+        with pytest.raises(UploadTooLargeError):
+            async with spool_upload(self._upload(b"PK\x03\x04" + b"x" * 200_000), max_bytes=100_000):
+                pass
+    
+    def test_extract_text_from_path(self, tmp_path):
+        from app.services.document_service import extract_text
+        path = tmp_path / "jd.docx"
+        _write_docx(path, "Senior Go engineer")
+        
+        assert extract_text(str(path), "docx") == "Senior Go engineer"
+
+
+class TestDatabaseMigrations:
+    def test_adds_fingerprint_columns_to_existing_tables(self, tmp_path):
+        from sqlalchemy import create_engine, inspect, text
+        from app.db.database import _add_missing_columns
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE resumes (id VARCHAR PRIMARY KEY, candidate_id VARCHAR, raw_text VARCHAR)"))
+            conn.execute(text("CREATE TABLE jobs (id VARCHAR PRIMARY KEY, recruiter_id VARCHAR, raw_text VARCHAR)"))
+            _add_missing_columns(conn)
+            _add_missing_columns(conn)  # idempotent
+        
+        inspector = inspect(engine)
+        assert {"content_sha256", "text_sha256"} <= {c["name"] for c in inspector.get_columns("resumes")}
+        assert "ix_jobs_text_sha256" in {i["name"] for i in inspector.get_indexes("jobs")}
+
+
+class TestDatabaseEngine:
+    def test_async_driver_selected_from_url(self):
+        from app.db.database import async_database_url
+        assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+        assert async_database_url("postgres://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+        assert async_database_url("postgresql+asyncpg://db/app") == "postgresql+asyncpg://db/app"
+    
+    @pytest.mark.asyncio
+    async def test_sqlite_profile_sets_pragmas_and_counts_checkouts(self, tmp_path):
+        from sqlalchemy import text
+        from app.db.database import build_engine, checkout_stats
+        engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        before = checkout_stats.checkouts
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+            assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 5000
+        await engine.dispose()
+        assert checkout_stats.checkouts == before + 1
+
+    
+    @pytest.mark.asyncio
+    async def test_unit_of_work_commits_repository_writes_once(self, temp_database):
+        from uuid import uuid4
+        from app.db.database import unit_of_work
+        from app.db.repositories import ChatRepository
+        from app.models.chat import ChatSession, ChatMessage, MessageRole
+        repo = ChatRepository()
+        kept = ChatSession(user_id=uuid4(), context_type="resume")
+        discarded = ChatSession(user_id=uuid4(), context_type="resume")
+        
+        async with unit_of_work() as session:
+            await repo.create_session(kept)
+            await repo.add_message(ChatMessage(session_id=kept.id, role=MessageRole.USER, content="hi"))
+            assert session.in_transaction()  # flushed, not yet committed
+        
+        with pytest.raises(RuntimeError):
+            async with unit_of_work():
+                await repo.create_session(discarded)
+                raise RuntimeError("model call failed")
+        
+        assert await repo.get_session(str(kept.id)) is not None
+        assert len(await repo.get_recent_messages(str(kept.id), 10)) == 1
+        assert await repo.get_session(str(discarded.id)) is None
+    
+    @pytest.mark.asyncio
+    async def test_recent_messages_are_newest_n_in_order(self, temp_database):
+        from datetime import datetime, timedelta
+        from uuid import uuid4
+        from app.db.repositories import ChatRepository
+        from app.models.chat import ChatMessage, MessageRole
+        repo = ChatRepository()
+        session_id, start = uuid4(), datetime(2024, 1, 1)
+        for i in range(25):
+            await repo.add_message(ChatMessage(
+                session_id=session_id, role=MessageRole.USER, content=str(i),
+                created_at=start + timedelta(seconds=i)
+            ))
+        
+        recent = await repo.get_recent_messages(str(session_id), 10)
+        
+        assert [m.content for m in recent] == [str(i) for i in range(15, 25)]
+
+
+class TestKeysetPagination:
+    def test_page_tokens_round_trip_and_reject_garbage(self):
+        from datetime import datetime
+        from app.db.pagination import encode_page_token, decode_page_token
+        created_at = datetime(2024, 5, 1, 12, 30, 0, 123456)
+        
+        assert decode_page_token(encode_page_token(created_at, "abc")) == (created_at, "abc")
+        for token in ("not-a-token", "e30", ""):
+            with pytest.raises(ValueError):
+                decode_page_token(token)
+    
+    @pytest.mark.asyncio
+    async def test_jobs_page_newest_first_with_ties(self, temp_database):
+        from datetime import datetime, timedelta
+        from uuid import uuid4
+        from app.db.repositories import JobRepository
+        from app.models.job import Job, ParsedJob
+        repo = JobRepository()
+        recruiter_id, start = uuid4(), datetime(2024, 1, 1)
+        # Pairs of jobs share a timestamp, so pages must break ties on id
+        jobs = [
+            Job(recruiter_id=recruiter_id, raw_text="jd", parsed_data=ParsedJob(), created_at=start + timedelta(minutes=i // 2))
+            for i in range(7)
+        ]
+        await repo.save_many(jobs)
+        
+        seen, token = [], None
+        while True:
+            page = await repo.get_page_by_recruiter_id(str(recruiter_id), 3, token)
+            seen.extend(page.items)
+            token = page.next_page_token
+            if token is None:
+                break
+        
+        expected = sorted(jobs, key=lambda j: (j.created_at, str(j.id)), reverse=True)
+        assert [j.id for j in seen] == [j.id for j in expected]
+
+    
+    @pytest.mark.asyncio
+    async def test_summaries_skip_raw_text(self, temp_database):
+        from uuid import uuid4
+        from sqlalchemy import select
+        from sqlalchemy.exc import InvalidRequestError
+        from app.db.database import unit_of_work, ResumeTable
+        from app.db.repositories import ResumeRepository, _RESUME_SUMMARY
+        from app.models.resume import Resume, ParsedResume
+        repo = ResumeRepository()
+        resume = Resume(candidate_id=uuid4(), raw_text="x" * 50_000, parsed_data=ParsedResume(name="Ada"))
+        await repo.create_many([resume])
+        
+        async with unit_of_work() as session:
+            row = (await session.execute(
+                select(ResumeTable).options(_RESUME_SUMMARY).where(ResumeTable.id == str(resume.id))
+            )).scalar_one()
+            with pytest.raises(InvalidRequestError):
+                row.raw_text
+            
+            [summary] = await repo.get_summaries_by_ids([resume.id])
+            full = await repo.get_by_id(str(resume.id))
+        
+        assert summary.parsed_data.name == "Ada" and not hasattr(summary, "raw_text")
+        assert full.raw_text == resume.raw_text
+
+
+class TestExtractionCache:
+    def test_key_tracks_prompt_version(self):
+        from app.services.extraction_cache import make_extraction_key
+        with patch("app.services.extraction_cache.PromptManager.get_prompt_version", return_value="v1"):
+            key = make_extraction_key("resume_parser", "gpt-4o", "Jane  Doe")
+            assert key == make_extraction_key("resume_parser", "gpt-4o", "Jane Doe")
+        with patch("app.services.extraction_cache.PromptManager.get_prompt_version", return_value="v2"):
+            assert key != make_extraction_key("resume_parser", "gpt-4o", "Jane Doe")
+    
+    def test_prompt_version_is_per_section(self):
+        from app.prompts.loader import PromptManager
+        assert PromptManager.get_prompt_version("resume_parser") != PromptManager.get_prompt_version("job_parser")
+        assert len(PromptManager.get_prompt_version("resume_parser")) == 16
+
+
+class TestHybridSearch:
+    def test_tokenize_keeps_technical_terms(self):
+        assert tokenize("C++, Node.js and CI/CD.") == ["c++", "node.js", "and", "ci", "cd"]
+    
+    def test_encode_document_saturates_term_frequency(self):
+        indices, values = encode_document("kafka kafka kafka kafka python")
+        weights = dict(zip(indices, values))
+        kafka, python = encode_document("kafka")[0][0], encode_document("python")[0][0]
+        
+        assert weights[python] < weights[kafka] < 4 * weights[python]
+    
+    def test_rrf_rewards_agreement_and_normalises(self):
+        dense = [{"id": "a", "score": 0.9}, {"id": "b", "score": 0.8}]
+        sparse = [{"id": "b", "score": 7.0}, {"id": "c", "score": 3.0}]
+        
+        results = reciprocal_rank_fusion([dense, sparse], limit=3, k=60)
+        
+        assert [r["id"] for r in results] == ["b", "a", "c"]
+        assert reciprocal_rank_fusion([dense, dense], limit=1)[0]["score"] == pytest.approx(1.0)
+
+
+class TestEmbeddingCache:
+    def test_key_ignores_whitespace_but_not_model(self):
+        key = make_cache_key("text-embedding-3-small", 1536, "senior  python\nengineer")
+        assert key == make_cache_key("text-embedding-3-small", 1536, " senior python engineer ")
+        assert key != make_cache_key("text-embedding-3-large", 1536, "senior python engineer")
+        assert key != make_cache_key("text-embedding-3-small", 512, "senior python engineer")
+    
+    def test_lru_evicts_within_memory_budget(self):
+        cache = EmbeddingCache(max_memory_bytes=2 * 4 * 4)  # two 4-dim float32 vectors
+        cache.put("a", [0.1, 0.2, 0.3, 0.4])
+        cache.put("b", [0.5, 0.6, 0.7, 0.8])
+        cache.get("a")
+        cache.put("c", [1.0, 1.0, 1.0, 1.0])
+        
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["memory_bytes"] <= cache.max_memory_bytes
+    
+    def test_disk_tier_survives_restart(self, tmp_path):
+        path = str(tmp_path / "embeddings.db")
+        EmbeddingCache(max_memory_bytes=1024, path=path).put("k", [0.25, -0.5])
+        
+        cache = EmbeddingCache(max_memory_bytes=1024, path=path)
+        assert cache.get("k") == [0.25, -0.5]
+        assert cache.get("k") == [0.25, -0.5]
+        stats = cache.stats()
+        assert stats["disk_hits"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 0
+
+    
+    @pytest.mark.asyncio
+    async def test_batched_disk_tier_round_trip(self, tmp_path):
+        path = str(tmp_path / "embeddings.db")
+        writer = EmbeddingCache(max_memory_bytes=1024, path=path)
+        await writer.put_many({f"k{i}": [float(i), 0.5] for i in range(600)})
+        assert len(writer._disk) == 600
+        
+        cache = EmbeddingCache(max_memory_bytes=1024, path=path)
+        found = await cache.get_many(["k1", "missing", "k599", "k1"])
+        
+        assert found == [[1.0, 0.5], None, [599.0, 0.5], [1.0, 0.5]]
+        assert cache.stats()["misses"] == 1 and cache.stats()["disk_hits"] == 3
+
+class TestAsyncQdrantService:
+    @pytest.mark.asyncio
+    async def test_upsert_resume_awaits_client(self):
+        from uuid import uuid4
+        service = AsyncQdrantService()
+        service.client = AsyncMock()
+        resume_id, candidate_id = uuid4(), uuid4()
+        
+        await service.upsert_resume(resume_id, candidate_id, [0.1] * 4, {"name": "Jane"})
+        
+        service.client.upsert.assert_awaited_once()
+        point = service.client.upsert.await_args.kwargs["points"][0]
+        assert point.id == str(resume_id)
+        assert point.payload == {"candidate_id": str(candidate_id), "type": "resume", "name": "Jane"}
+    
+    @pytest.mark.asyncio
+    async def test_search_applies_score_threshold(self):
+        service = AsyncQdrantService()
+        service.client = AsyncMock()
+        service.client.query_points.return_value = MagicMock(points=[
+            MagicMock(id="a", score=0.9, payload={}),
+            MagicMock(id="b", score=0.05, payload={}),
+        ])
+        
+        results = await service.search_jobs([0.1] * 4, score_threshold=0.1)
+        
+        assert [r["id"] for r in results] == ["a"]
+    
+    @pytest.mark.asyncio
+    async def test_hybrid_search_fuses_dense_and_sparse(self):
+        service = AsyncQdrantService()
+        service.client = AsyncMock()
+        service._resumes_hybrid = True
+        service.client.query_batch_points.return_value = [
+            MagicMock(points=[MagicMock(id="a", score=0.9, payload={}), MagicMock(id="b", score=0.05, payload={})]),
+            MagicMock(points=[MagicMock(id="c", score=4.0, payload={}), MagicMock(id="a", score=2.0, payload={})]),
+        ]
+        
+        results = await service.search_candidates([0.1] * 4, limit=5, score_threshold=0.1, query_text="kubernetes")
+        
+        requests = service.client.query_batch_points.await_args.kwargs["requests"]
+        assert requests[1].using == "text"
+        assert [r["id"] for r in results] == ["a", "c"]
+    
+    def test_filters_use_flat_payload_keys(self):
+        service = AsyncQdrantService()
+        
+        query_filter = service._build_filter("jobs", {"location": "Berlin", "title": "backend engineer"})
+        
+        keys = [condition.key for condition in query_filter.must]
+        assert keys == ["location", "title"]
+        assert query_filter.must[0].match.value == "Berlin"
+        assert query_filter.must[1].match.text == "backend engineer"
+    
+    def test_filters_support_lists_and_ranges(self):
+        service = AsyncQdrantService()
+        
+        query_filter = service._build_filter("resumes", {"skills": ["Rust", "Go"], "experience_years": {"gte": 3}})
+        
+        assert [c.match.value for c in query_filter.must[:2]] == ["Rust", "Go"]
+        assert query_filter.must[2].range.gte == 3
+    
+    def test_payload_index_changes(self):
+        from qdrant_client.http.models import PayloadSchemaType
+        service = AsyncQdrantService()
+        existing = {
+            "candidate_id": MagicMock(data_type=PayloadSchemaType.KEYWORD),
+            "skills": MagicMock(data_type=PayloadSchemaType.TEXT),
+        }
+        
+        changes = {name: exists for name, _, exists in service._payload_index_changes("resumes", existing)}
+        
+        assert "candidate_id" not in changes
+        assert changes["skills"] is True
+        assert changes["experience_years"] is False
+    
+    @patch("app.services.qdrant_service.settings")
+    def test_scalar_quantization_config(self, mock_settings):
+        from qdrant_client.http.models import ScalarQuantization
+        mock_settings.qdrant_quantization = "scalar"
+        mock_settings.qdrant_quantization_always_ram = True
+        mock_settings.qdrant_quantization_rescore = True
+        mock_settings.qdrant_quantization_oversampling = 3.0
+        mock_settings.qdrant_vectors_on_disk = True
+        mock_settings.qdrant_payload_on_disk = True
+        service = AsyncQdrantService()
+        
+        config = service._collection_config("resumes")
+        
+        assert isinstance(config["quantization_config"], ScalarQuantization)
+        assert config["vectors_config"].on_disk is True
+        assert config["on_disk_payload"] is True
+        assert service._search_params("resumes").quantization.oversampling == 3.0
+        assert service._collection_config("jobs")["quantization_config"] is None
+        assert service._search_params("jobs") is None
+    
+    @patch("app.services.qdrant_service.settings")
+    def test_unset_payload_on_disk_keeps_qdrant_default(self, mock_settings):
+        from qdrant_client.http.models import VectorParams
+        mock_settings.qdrant_quantization = "none"
+        mock_settings.qdrant_vectors_on_disk = False
+        mock_settings.qdrant_payload_on_disk = None
+        service = AsyncQdrantService()
+        info = MagicMock()
+        info.config.params.vectors = VectorParams(size=4, distance="Cosine")
+        info.config.params.on_disk_payload = True
+        info.config.quantization_config = None
+        
+        assert "on_disk_payload" not in service._collection_config("resumes")
+        assert service._storage_config_changes("resumes", info) == {}
+    
+    @patch("app.services.qdrant_service.settings")
+    def test_quantization_parameter_change_is_applied(self, mock_settings):
+        from qdrant_client.http.models import VectorParams, ScalarQuantization, ScalarQuantizationConfig
+        mock_settings.qdrant_quantization = "scalar"
+        mock_settings.qdrant_quantization_always_ram = True
+        mock_settings.qdrant_vectors_on_disk = False
+        mock_settings.qdrant_payload_on_disk = None
+        service = AsyncQdrantService()
+        info = MagicMock()
+        info.config.params.vectors = VectorParams(size=4, distance="Cosine")
+        info.config.quantization_config = ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type="int8", quantile=0.99, always_ram=False)
+        )
+        
+        changes = service._storage_config_changes("resumes", info)
+        assert changes["quantization_config"].scalar.always_ram is True
+        
+        info.config.quantization_config.scalar.always_ram = True
+        assert service._storage_config_changes("resumes", info) == {}
+    
+    @pytest.mark.asyncio
+    async def test_batch_upsert_chunks_and_flush(self):
+        from uuid import uuid4
+        service = AsyncQdrantService()
+        service.client = AsyncMock()
+        service.client.get_collection.return_value.config.params.shard_number = 1
+        items = [
+            {"job_id": uuid4(), "recruiter_id": uuid4(), "embedding": [0.1] * 4, "metadata": {}}
+            for _ in range(5)
+        ]
+        
+        ack = await service.upsert_jobs_batch(iter(items), batch_size=2, parallel=2, wait=False)
+        
+        assert (ack.points, ack.batches, ack.acknowledged) == (5, 3, False)
+        assert [len(c.kwargs["points"]) for c in service.client.upsert.await_args_list] == [2, 2, 1]
+        assert all(c.kwargs["wait"] is False for c in service.client.upsert.await_args_list)
+        
+        await service.flush(ack)
+        
+        last_call = service.client.upsert.await_args
+        assert last_call.kwargs["wait"] is True
+        assert last_call.kwargs["points"][0].id == str(items[-1]["job_id"])
+        assert ack.acknowledged
+    
+    @pytest.mark.asyncio
+    async def test_batch_upsert_cancels_siblings_of_failed_chunk(self):
+        import asyncio
+        from uuid import uuid4
+        service = AsyncQdrantService()
+        service.client = AsyncMock()
+        service.client.get_collection.return_value.config.params.shard_number = 1
+        cancelled = []
+        
+        async def upsert(collection_name, points, wait):
+            if len(points) == 1:
+                raise RuntimeError("qdrant down")
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(len(points))
+                raise
+        service.client.upsert = upsert
+        items = [
+            {"job_id": uuid4(), "recruiter_id": uuid4(), "embedding": [0.1] * 4, "metadata": {}}
+            for _ in range(3)
+        ]
+        
+        with pytest.raises(RuntimeError):
+            await service.upsert_jobs_batch(iter(items), batch_size=2, parallel=2, wait=False)
+        
+        assert cancelled == [2]
+    
+    @pytest.mark.asyncio
+    async def test_batch_upsert_waits_on_sharded_collections(self):
+        from uuid import uuid4
+        service = AsyncQdrantService()
+        service.client = AsyncMock()
+        service.client.get_collection.return_value.config.params.shard_number = 3
+        items = [{"job_id": uuid4(), "recruiter_id": uuid4(), "embedding": [0.1] * 4, "metadata": {}}]
+        
+        ack = await service.upsert_jobs_batch(iter(items), wait=False)
+        
+        assert ack.acknowledged
+        assert service.client.upsert.await_args.kwargs["wait"] is True
+    
+    def test_services_share_one_client(self):
+        assert AsyncQdrantService().client is AsyncQdrantService().client
+    
+    def test_client_pool_round_robins(self):
+        first, second = MagicMock(), MagicMock()
+        pool = _AsyncClientPool([first, second])
+        
+        pool.retrieve("resumes", ids=["a"])
+        pool.retrieve("resumes", ids=["b"])
+        pool.retrieve("resumes", ids=["c"])
+        
+        assert first.retrieve.call_count == 2
+        assert second.retrieve.call_count == 1
+
+
+def _unit_vector(index: int, dim: int = 1536) -> list:
+    vector = [0.0] * dim
+    vector[index] = 1.0
+    return vector
+
+
+class TestEmbeddedVectorStore:
+    @pytest.mark.asyncio
+    async def test_search_ranks_by_cosine_and_applies_threshold(self):
+        from uuid import uuid4
+        store = EmbeddedVectorStore()
+        near, far, other = uuid4(), uuid4(), uuid4()
+        await store.upsert_resume(near, uuid4(), _unit_vector(0), {"name": "Near"})
+        await store.upsert_resume(far, uuid4(), [0.6, 0.8] + [0.0] * 1534, {"name": "Far"})
+        await store.upsert_resume(other, uuid4(), _unit_vector(5), {"name": "Other"})
+        
+        results = await store.search_candidates(_unit_vector(0), limit=5, score_threshold=0.1)
+        
+        assert [r["id"] for r in results] == [str(near), str(far)]
+        assert results[0]["score"] == pytest.approx(1.0)
+        assert results[0]["payload"]["type"] == "resume"
+    
+    @pytest.mark.asyncio
+    async def test_search_filters_and_delete(self):
+        from uuid import uuid4
+        store = EmbeddedVectorStore()
+        berlin, remote = uuid4(), uuid4()
+        await store.upsert_job(berlin, uuid4(), _unit_vector(0), {"location": "Berlin", "required_skills": ["Go", "Rust"]})
+        await store.upsert_job(remote, uuid4(), _unit_vector(0), {"location": "Remote", "required_skills": ["Go"]})
+        
+        results = await store.search_jobs(_unit_vector(0), filters={"required_skills": ["Go", "Rust"]})
+        assert [r["id"] for r in results] == [str(berlin)]
+        
+        await store.delete_job(berlin)
+        results = await store.search_jobs(_unit_vector(0), filters={"required_skills": ["Go"]})
+        assert [r["id"] for r in results] == [str(remote)]
+        assert await store.count_points("jobs") == 1
+    
+    @pytest.mark.asyncio
+    async def test_filter_indexes_follow_payload_updates(self):
+        from uuid import uuid4
+        store = EmbeddedVectorStore()
+        senior, junior = uuid4(), uuid4()
+        await store.upsert_resume(senior, uuid4(), _unit_vector(0), {"summary": "Senior Go engineer", "experience_years": 9})
+        await store.upsert_resume(junior, uuid4(), _unit_vector(0), {"summary": "Junior engineer", "experience_years": 1})
+        
+        results = await store.search_candidates(_unit_vector(0), filters={"summary": "go ENGINEER", "experience_years": {"gte": 5}})
+        assert [r["id"] for r in results] == [str(senior)]
+        
+        await store.upsert_resume(senior, uuid4(), _unit_vector(0), {"summary": "Senior Rust engineer", "experience_years": 9})
+        await store.upsert_resume(junior, uuid4(), _unit_vector(0), {"summary": "Go engineer", "experience_years": 6})
+        results = await store.search_candidates(_unit_vector(0), filters={"summary": "go engineer", "experience_years": {"gte": 5}})
+        assert [r["id"] for r in results] == [str(junior)]
+    
+    @pytest.mark.asyncio
+    async def test_flush_writes_only_changed_collections(self, tmp_path):
+        from uuid import uuid4
+        store = EmbeddedVectorStore(path=str(tmp_path))
+        await store.initialize_collections()
+        await store.upsert_resume(uuid4(), uuid4(), _unit_vector(0), {})
+        
+        with patch("app.services.embedded_vector_store._Collection.write", autospec=True) as write:
+            await store.flush()
+            await store.flush()
+        
+        assert [call.args[0].name for call in write.call_args_list] == ["resumes"]
+    
+    @pytest.mark.asyncio
+    async def test_flush_and_reload_memory_mapped(self, tmp_path):
+        from uuid import uuid4
+        resume_id = uuid4()
+        store = EmbeddedVectorStore(path=str(tmp_path))
+        await store.upsert_resume(resume_id, uuid4(), _unit_vector(3), {"name": "Persisted"})
+        await store.close()
+        
+        reloaded = EmbeddedVectorStore(path=str(tmp_path), mmap=True)
+        results = await reloaded.search_candidates(_unit_vector(3))
+        assert [r["id"] for r in results] == [str(resume_id)]
+        
+        await reloaded.upsert_resume(uuid4(), uuid4(), _unit_vector(4), {"name": "New"})
+        assert await reloaded.count_points("resumes") == 2
+    
+    @pytest.mark.asyncio
+    async def test_hybrid_search_surfaces_exact_token_match(self):
+        from uuid import uuid4
+        store = EmbeddedVectorStore()
+        semantic, lexical = uuid4(), uuid4()
+        await store.upsert_resume(semantic, uuid4(), _unit_vector(0), {}, sparse_text="cloud infrastructure engineer")
+        await store.upsert_resume(lexical, uuid4(), _unit_vector(1), {}, sparse_text="holds a CKA certification")
+        
+        dense_only = await store.search_candidates(_unit_vector(0), score_threshold=0.1)
+        hybrid = await store.search_candidates(_unit_vector(0), score_threshold=0.1, query_text="CKA")
+        
+        assert [r["id"] for r in dense_only] == [str(semantic)]
+        assert {r["id"] for r in hybrid} == {str(semantic), str(lexical)}
+    
+    @pytest.mark.asyncio
+    async def test_hybrid_search_returns_exact_token_match_within_limit(self):
+        from uuid import uuid4
+        from app.agents.resume_parser_agent import ResumeParserAgent
+        from app.models.resume import ParsedResume
+        store = EmbeddedVectorStore()
+        parser = ResumeParserAgent()
+        for _ in range(5):
+            near = _unit_vector(0)
+            near[2] = 0.2
+            parsed = ParsedResume(summary="Cloud infrastructure engineer", skills=["Terraform"])
+            await store.upsert_resume(
+                uuid4(), uuid4(), near, {}, sparse_text=parser._create_sparse_text(parsed, "cv")
+            )
+        certified = uuid4()
+        parsed = ParsedResume(summary="Platform operator", skills=["CKA"])
+        await store.upsert_resume(
+            certified, uuid4(), _unit_vector(1), {}, sparse_text=parser._create_sparse_text(parsed, "cv")
+        )
+        
+        results = await store.search_candidates(_unit_vector(0), limit=3, score_threshold=0.1, query_text="CKA")
+        
+        assert len(results) == 3
+        assert str(certified) in [r["id"] for r in results]
+    
+    @pytest.mark.asyncio
+    async def test_chunk_search_scores_each_resume_by_best_chunk(self):
+        from uuid import uuid4
+        from app.config import get_settings
+        store = EmbeddedVectorStore()
+        chunked, plain = uuid4(), uuid4()
+        await store.upsert_resume(chunked, uuid4(), _unit_vector(0), {"name": "Chunked"})
+        await store.upsert_resume(plain, uuid4(), [0.6, 0.8] + [0.0] * 1534, {"name": "Plain"})
+        await store.upsert_resume_chunks(chunked, uuid4(), [_unit_vector(1), [0.0, 0.9, 0.1] + [0.0] * 1533], {"name": "Chunked"})
+        
+        with patch.object(get_settings(), "resume_chunk_indexing_enabled", True):
+            results = await store.search_candidates(_unit_vector(1), score_threshold=0.1)
+            
+            # Both chunks of one resume match, but the resume is returned once with its best score
+            assert [r["id"] for r in results] == [str(chunked), str(plain)]
+            assert results[0]["score"] == pytest.approx(1.0)
+            
+            await store.upsert_resume_chunks(chunked, uuid4(), [_unit_vector(2)], {"name": "Chunked"})
+            assert await store.count_points("resume_chunks") == 1
+            await store.delete_resume(chunked)
+            assert await store.count_points("resume_chunks") == 0
+
+    
+    @pytest.mark.asyncio
+    async def test_chunk_search_widens_window_past_one_resumes_chunks(self):
+        from uuid import uuid4
+        from app.config import get_settings
+        store = EmbeddedVectorStore()
+        verbose, brief, other = uuid4(), uuid4(), uuid4()
+        for resume_id in (verbose, brief, other, uuid4(), uuid4(), uuid4()):
+            await store.upsert_resume(resume_id, uuid4(), _unit_vector(5), {})
+        near = [[1.0, 0.01 * i] + [0.0] * 1534 for i in range(10)]
+        await store.upsert_resume_chunks(verbose, uuid4(), near, {})
+        await store.upsert_resume_chunks(brief, uuid4(), [[0.8, 0.6] + [0.0] * 1534], {})
+        await store.upsert_resume_chunks(other, uuid4(), [_unit_vector(3)], {})
+        await store.delete_resume(other)
+        
+        with patch.object(get_settings(), "resume_chunk_indexing_enabled", True):
+            results = await store.search_candidates(_unit_vector(0), limit=2, score_threshold=0.1)
+        
+        assert [r["id"] for r in results] == [str(verbose), str(brief)]
+
+def _write_docx(path, text):
+    from docx import Document
+    doc = Document()
+    doc.add_paragraph(text)
+    doc.save(path)
+
+
+class TestResumeIngestion:
+    def test_iter_documents_walks_zip_in_order(self, tmp_path):
+        import zipfile
+        archive = tmp_path / "resumes.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("b/second.pdf", b"%PDF-")
+            zf.writestr("a/first.docx", b"PK")
+            zf.writestr("notes.txt", b"skip me")
+        
+        documents = [(d.key, d.file_type, d.read()) for d in iter_documents(str(archive))]
+        
+        assert documents == [("a/first.docx", "docx", b"PK"), ("b/second.pdf", "pdf", b"%PDF-")]
+    
+    def test_owner_manifest_maps_documents_to_candidates(self, tmp_path):
+        from uuid import uuid4
+        from app.services.resume_ingestion import read_owner_manifest, SourceDocument
+        owner, fallback = uuid4(), uuid4()
+        manifest = tmp_path / "owners.csv"
+        manifest.write_text(f"file,candidate_id\na/first.docx,{owner}\n")
+        pipeline = ResumeIngestionPipeline(
+            checkpoint_path=str(tmp_path / "checkpoint.jsonl"), owners=read_owner_manifest(str(manifest))
+        )
+        first = SourceDocument(key="a/first.docx", file_name="first.docx", file_type="docx", read=bytes)
+        other = SourceDocument(key="b/second.pdf", file_name="second.pdf", file_type="pdf", read=bytes)
+        
+        assert pipeline._owner(first, "ns") == owner
+        assert pipeline._owner(other, "ns") == pipeline._owner(other, "ns") != owner
+        pipeline.candidate_id = fallback
+        assert pipeline._owner(other, "ns") == fallback
+        
+        manifest.write_text("file,candidate_id\na/first.docx,not-a-uuid\n")
+        with pytest.raises(ValueError):
+            read_owner_manifest(str(manifest))
+        
+        manifest.write_text(f"file,candidate_id\na/first.docx,{owner}\nb/second.pdf,{owner}\n")
+        with pytest.raises(ValueError, match="already owns a/first.docx"):
+            read_owner_manifest(str(manifest))
+    
+    @pytest.mark.asyncio
+    async def test_pipeline_refuses_several_resumes_per_candidate(self, tmp_path):
+        from datetime import datetime
+        from uuid import uuid4
+        from app.models.resume import ResumeSummary, ParsedResume
+        source = tmp_path / "resumes"
+        source.mkdir()
+        for i in range(2):
+            _write_docx(source / f"cv{i}.docx", f"Candidate {i}")
+        pipeline = ResumeIngestionPipeline(checkpoint_path=str(tmp_path / "checkpoint.jsonl"), candidate_id=uuid4())
+        pipeline.resume_repo = MagicMock()
+        pipeline.resume_repo.get_summary_by_candidate_id = AsyncMock(return_value=None)
+        pipeline.parser.extract_resume = AsyncMock()
+        
+        with pytest.raises(ValueError, match="would own 2 documents"):
+            await pipeline.run(str(source))
+        
+        (source / "cv1.docx").unlink()
+        pipeline.resume_repo.get_summary_by_candidate_id = AsyncMock(return_value=ResumeSummary(
+            id=uuid4(), candidate_id=pipeline.candidate_id, parsed_data=ParsedResume(),
+            created_at=datetime.utcnow(), updated_at=datetime.utcnow()
+        ))
+        with pytest.raises(ValueError, match="already has resume"):
+            await pipeline.run(str(source))
+        pipeline.parser.extract_resume.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_pipeline_batches_and_resumes_from_checkpoint(self, tmp_path):
+        from app.models.resume import ParsedResume
+        from app.services.document_service import DocumentParserPool
+        source = tmp_path / "resumes"
+        source.mkdir()
+        for i in range(5):
+            _write_docx(source / f"cv{i}.docx", f"Candidate {i} Python developer")
+        
+        def make_pipeline():
+            pipeline = ResumeIngestionPipeline(
+                checkpoint_path=str(tmp_path / "checkpoint.jsonl"),
+                extraction_concurrency=2,
+                batch_size=2,
+                parser_pool=DocumentParserPool(workers=0, timeout=30)
+            )
+            pipeline.parser.extract_resume = AsyncMock(return_value=(ParsedResume(skills=["Python"]), None))
+            pipeline.embedding_service = MagicMock()
+            pipeline.embedding_service.generate_embeddings_batch = AsyncMock(
+                side_effect=lambda texts: [_unit_vector(0)] * len(texts)
+            )
+            pipeline.vector_store = EmbeddedVectorStore()
+            pipeline.resume_repo = MagicMock()
+            pipeline.resume_repo.create_many = AsyncMock()
+            return pipeline
+        
+        pipeline = make_pipeline()
+        report = await pipeline.run(str(source))
+        
+        assert (report.succeeded, report.failed) == (5, 0)
+        assert [len(c.args[0]) for c in pipeline.embedding_service.generate_embeddings_batch.await_args_list] == [2, 2, 1]
+        assert await pipeline.vector_store.count_points("resumes") == 5
+        
+        rerun = make_pipeline()
+        report = await rerun.run(str(source))
+        assert (report.succeeded, report.skipped) == (0, 5)
+        rerun.parser.extract_resume.assert_not_called()
+
+
+class TestJobFeedImport:
+    def test_iter_feed_reads_csv_rows_lazily(self, tmp_path):
+        feed = tmp_path / "feed.csv"
+        feed.write_text(
+            "external_id,title,description\n"
+            "r1,Engineer,\"Build APIs\nin Python\"\n"
+            ",Designer,No id\n"
+            "r3,Analyst,SQL\n"
+        )
+        
+        rows = list(iter_feed(str(feed)))
+        
+        assert rows[0] == FeedPosting(line=3, external_id="r1", text="Engineer\nBuild APIs\nin Python")
+        assert isinstance(rows[1], ValueError) and "line 4" in str(rows[1])
+        assert rows[2].external_id == "r3"
+    
+    @pytest.mark.asyncio
+    async def test_reimport_reconciles_by_external_id(self):
+        from uuid import uuid4
+        from app.models.job import ParsedJob
+        from app.services.fingerprint import text_fingerprint
+        importer = JobFeedImporter(recruiter_id=uuid4(), extraction_concurrency=2, batch_size=2)
+        changed_id, removed_id = str(uuid4()), str(uuid4())
+        importer.job_repo = MagicMock()
+        importer.job_repo.get_external_index = AsyncMock(return_value={
+            "same": (str(uuid4()), text_fingerprint("Unchanged posting")),
+            "changed": (changed_id, text_fingerprint("Old text")),
+            "gone": (removed_id, "x"),
+        })
+        importer.job_repo.save_many = AsyncMock()
+        importer.job_repo.delete_many = AsyncMock(return_value=1)
+        importer.parser.extract_job = AsyncMock(return_value=(ParsedJob(title="Engineer"), None))
+        importer.embedding_service = MagicMock()
+        importer.embedding_service.generate_embeddings_batch = AsyncMock(
+            side_effect=lambda texts: [_unit_vector(0)] * len(texts)
+        )
+        importer.vector_store = EmbeddedVectorStore()
+        postings = [
+            FeedPosting(line=2, external_id="same", text="Unchanged  posting"),
+            FeedPosting(line=3, external_id="changed", text="New text"),
+            FeedPosting(line=4, external_id="new-1", text="First new"),
+            FeedPosting(line=5, external_id="new-2", text="Second new"),
+        ]
+        
+        report = await importer.run(iter(postings))
+        
+        assert (report.created, report.updated, report.unchanged, report.removed) == (2, 1, 1, 1)
+        saved = {job.external_id: job for c in importer.job_repo.save_many.await_args_list for job in c.args[0]}
+        assert set(saved) == {"changed", "new-1", "new-2"} and str(saved["changed"].id) == changed_id
+        importer.job_repo.delete_many.assert_awaited_once_with([removed_id])
+        assert await importer.vector_store.count_points("jobs") == 3
+
+    
+    @pytest.mark.asyncio
+    async def test_unreadable_row_disables_pruning(self, tmp_path):
+        from uuid import uuid4
+        from app.services.fingerprint import text_fingerprint
+        feed = tmp_path / "feed.jsonl"
+        feed.write_text(
+            '{"external_id": "kept", "title": "Engineer"}\n'
+            '{"external_id": "corrupt", "title": "Desig\n'
+        )
+        importer = JobFeedImporter(recruiter_id=uuid4())
+        importer.job_repo = MagicMock()
+        importer.job_repo.get_external_index = AsyncMock(return_value={
+            "kept": (str(uuid4()), text_fingerprint("Engineer")),
+            "corrupt": (str(uuid4()), "x"),
+        })
+        importer.job_repo.delete_many = AsyncMock()
+        
+        report = await importer.run(iter_feed(str(feed)))
+        
+        assert (report.unchanged, report.failed, report.removed) == (1, 1, 0)
+        importer.job_repo.delete_many.assert_not_called()
+
+class TestIngestionQueue:
+    def _job(self, tmp_path, attempts=1):
+        from uuid import uuid4
+        from app.models.ingestion import IngestionJob, IngestionKind
+        path = tmp_path / "upload.pdf"
+        path.write_bytes(b"%PDF-")
+        return IngestionJob(
+            kind=IngestionKind.RESUME, owner_id=uuid4(), attempts=attempts,
+            max_attempts=3, file_path=str(path), file_type="pdf"
+        )
+    
+    def _pool(self, tmp_path):
+        pool = IngestionWorkerPool(concurrency=1, storage_dir=str(tmp_path))
+        pool.retry_backoff = 10
+        pool.repo = MagicMock()
+        for method in ("update_stage", "complete", "fail", "retry"):
+            setattr(pool.repo, method, AsyncMock())
+        pool.resume_parser = MagicMock()
+        pool.resume_parser.find_uploaded_resume = AsyncMock(return_value=None)
+        pool.document_service = MagicMock()
+        pool.document_service.parse_file = AsyncMock(return_value="Python developer")
+        return pool
+    
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried_with_backoff(self, tmp_path):
+        pool = self._pool(tmp_path)
+        pool.resume_parser.parse_resume = AsyncMock(side_effect=RuntimeError("rate limited"))
+        job = self._job(tmp_path, attempts=2)
+        
+        await pool.process(job)
+        
+        pool.repo.retry.assert_awaited_once_with(job.id, "rate limited", 20)
+        pool.repo.fail.assert_not_called()
+        assert (tmp_path / "upload.pdf").exists()
+        
+        job.attempts = 3
+        await pool.process(job)
+        pool.repo.fail.assert_awaited_once_with(job.id, "rate limited")
+        assert not (tmp_path / "upload.pdf").exists()
+    
+    @pytest.mark.asyncio
+    async def test_only_parse_errors_fail_immediately(self, tmp_path):
+        import json
+        from app.services.document_service import DocumentParseError
+        pool = self._pool(tmp_path)
+        pool.resume_parser.parse_resume = AsyncMock(side_effect=json.JSONDecodeError("Expecting value", "", 0))
+        job = self._job(tmp_path)
+        
+        await pool.process(job)
+        
+        pool.repo.retry.assert_awaited_once()
+        pool.repo.fail.assert_not_called()
+        
+        pool.document_service.parse_file = AsyncMock(side_effect=DocumentParseError("Failed to parse PDF: broken"))
+        await pool.process(job)
+        pool.repo.fail.assert_awaited_once_with(job.id, "Failed to parse PDF: broken")
+        assert not (tmp_path / "upload.pdf").exists()
+    
+    @pytest.mark.asyncio
+    async def test_success_records_result_and_stages(self, tmp_path):
+        from app.models.ingestion import IngestionStage
+        from app.models.resume import Resume, ParsedResume
+        pool = self._pool(tmp_path)
+        job = self._job(tmp_path)
+        resume = Resume(candidate_id=job.owner_id, raw_text="cv", parsed_data=ParsedResume())
+        pool.resume_parser.parse_resume = AsyncMock(return_value=resume)
+        
+        await pool.process(job)
+        
+        assert [c.args[1] for c in pool.repo.update_stage.await_args_list] == [
+            IngestionStage.PARSING, IngestionStage.EXTRACTING
+        ]
+        pool.repo.complete.assert_awaited_once_with(job.id, resume.id)
+        assert not (tmp_path / "upload.pdf").exists()
+
+
+class TestVectorOutbox:
+    def _dispatcher(self, entries):
+        dispatcher = VectorOutboxDispatcher(batch_size=8)
+        dispatcher.retry_backoff = 5
+        dispatcher.checkpoint_interval = 0
+        dispatcher.repo = MagicMock()
+        dispatcher.repo.get_due = AsyncMock(return_value=entries)
+        for method in ("complete", "retry", "fail"):
+            setattr(dispatcher.repo, method, AsyncMock())
+        dispatcher.resume_repo = MagicMock()
+        dispatcher.resume_parser = MagicMock()
+        dispatcher.resume_parser.index_resumes = AsyncMock()
+        dispatcher.vector_store = MagicMock()
+        dispatcher.vector_store.delete_resume = AsyncMock()
+        dispatcher.vector_store.flush = AsyncMock()
+        return dispatcher
+    
+    @pytest.mark.asyncio
+    async def test_entries_sync_vectors_with_rows(self):
+        from uuid import uuid4
+        from app.models.outbox import VectorWrite, VectorWriteKind
+        from app.models.resume import Resume, ParsedResume
+        resume = Resume(candidate_id=uuid4(), raw_text="cv", parsed_data=ParsedResume())
+        deleted_id = uuid4()
+        entries = [
+            VectorWrite(kind=VectorWriteKind.RESUME, entity_id=resume.id),
+            VectorWrite(kind=VectorWriteKind.RESUME, entity_id=resume.id),
+            VectorWrite(kind=VectorWriteKind.RESUME, entity_id=deleted_id),
+        ]
+        dispatcher = self._dispatcher(entries)
+        dispatcher.resume_repo.get_by_ids = AsyncMock(return_value=[resume, None])
+        
+        assert await dispatcher.dispatch_once() == 3
+        
+        dispatcher.resume_repo.get_by_ids.assert_awaited_once_with([resume.id, deleted_id])
+        dispatcher.resume_parser.index_resumes.assert_awaited_once_with([resume])
+        dispatcher.vector_store.delete_resume.assert_awaited_once_with(deleted_id)
+        dispatcher.repo.complete.assert_awaited_once_with([e.id for e in entries])
+    
+    @pytest.mark.asyncio
+    async def test_applied_entries_are_persisted_before_completion(self, tmp_path):
+        from uuid import uuid4
+        from app.models.outbox import VectorWrite, VectorWriteKind
+        from app.models.resume import Resume, ParsedResume
+        resume = Resume(candidate_id=uuid4(), raw_text="cv", parsed_data=ParsedResume())
+        dispatcher = self._dispatcher([VectorWrite(kind=VectorWriteKind.RESUME, entity_id=resume.id)])
+        dispatcher.resume_repo.get_by_ids = AsyncMock(return_value=[resume])
+        store = EmbeddedVectorStore(path=str(tmp_path))
+        dispatcher.vector_store = store
+        
+        async def index_resumes(resumes):
+            for r in resumes:
+                await store.upsert_resume(r.id, r.candidate_id, _unit_vector(0), {})
+        dispatcher.resume_parser.index_resumes = AsyncMock(side_effect=index_resumes)
+        
+        await dispatcher.dispatch_once()
+        
+        dispatcher.repo.complete.assert_awaited_once()
+        reopened = EmbeddedVectorStore(path=str(tmp_path))
+        assert await reopened.get_resume_by_id(resume.id) is not None
+    
+    @pytest.mark.asyncio
+    async def test_applied_entries_complete_at_checkpoint(self):
+        from uuid import uuid4
+        from app.models.outbox import VectorWrite, VectorWriteKind
+        entry = VectorWrite(kind=VectorWriteKind.RESUME, entity_id=uuid4())
+        dispatcher = self._dispatcher([entry])
+        dispatcher.checkpoint_interval = 60
+        dispatcher.resume_repo.get_by_ids = AsyncMock(return_value=[None])
+        
+        await dispatcher.dispatch_once()
+        dispatcher.vector_store.flush.assert_not_called()
+        dispatcher.repo.complete.assert_not_called()
+        
+        # Applied entries are not fetched again while they wait for the checkpoint
+        dispatcher.repo.get_due = AsyncMock(return_value=[])
+        await dispatcher.dispatch_once()
+        dispatcher.repo.get_due.assert_awaited_once_with(8, exclude=[entry.id])
+        
+        await dispatcher.stop()
+        dispatcher.vector_store.flush.assert_awaited_once()
+        dispatcher.repo.complete.assert_awaited_once_with([entry.id])
+    
+    @pytest.mark.asyncio
+    async def test_failed_writes_back_off_then_give_up(self):
+        from uuid import uuid4
+        from app.models.outbox import VectorWrite, VectorWriteKind
+        fresh = VectorWrite(kind=VectorWriteKind.RESUME, entity_id=uuid4(), attempts=1)
+        exhausted = VectorWrite(kind=VectorWriteKind.RESUME, entity_id=uuid4(), attempts=9)
+        dispatcher = self._dispatcher([fresh, exhausted])
+        dispatcher.max_attempts = 10
+        dispatcher.resume_repo.get_by_ids = AsyncMock(side_effect=RuntimeError("qdrant down"))
+        
+        await dispatcher.dispatch_once()
+        
+        dispatcher.repo.complete.assert_not_called()
+        dispatcher.repo.retry.assert_awaited_once_with(fresh.id, "qdrant down", 10)
+        dispatcher.repo.fail.assert_awaited_once_with(exhausted.id, "qdrant down")
 
 
 class TestAuthService:
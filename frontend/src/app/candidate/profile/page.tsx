@@ -5,7 +5,7 @@ import { useRouter } from "next/navigation";
 import { ArrowLeft, Upload, Loader2, Check, FileText, Sparkles, Briefcase, GraduationCap, Code } from "lucide-react";
 import Link from "next/link";
 import { useAuth } from "@/lib/auth";
-import { api } from "@/lib/api";
+import { api, ingestionApi } from "@/lib/api";
 import FileUpload from "@/components/ui/file-upload";
 
 export default function CandidateProfilePage() {
@@ -58,10 +58,13 @@ export default function CandidateProfilePage() {
                 },
             });
 
-            setResume(response.data);
+            // Parsing runs in the background; wait for the ingestion job to finish
+            await ingestionApi.waitForJob(response.data.id);
+            const resumeResponse = await api.get("/candidate/resume");
+            setResume(resumeResponse.data);
             setSuccess("Resume uploaded successfully!");
         } catch (err: any) {
-            setError(err.response?.data?.detail || "Failed to upload resume");
+            setError(err.response?.data?.detail || err.message || "Failed to upload resume");
         } finally {
             setUploading(false);
         }
@@ -5,7 +5,7 @@ import { useRouter } from "next/navigation";
 import { ArrowLeft, Upload, Plus, Trash2, Briefcase, MapPin, DollarSign, Calendar, Code } from "lucide-react";
 import Link from "next/link";
 import { useAuth } from "@/lib/auth";
-import { api } from "@/lib/api";
+import { api, ingestionApi, recruiterApi } from "@/lib/api";
 import FileUpload from "@/components/ui/file-upload";
 
 export default function RecruiterJobsPage() {
@@ -13,6 +13,8 @@ export default function RecruiterJobsPage() {
     const { user, isAuthenticated, loading: authLoading } = useAuth();
 
     const [jobs, setJobs] = useState<any[]>([]);
+    const [nextPageToken, setNextPageToken] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [loading, setLoading] = useState(true);
     const [uploading, setUploading] = useState(false);
     const [showUpload, setShowUpload] = useState(false);
@@ -32,8 +34,9 @@ export default function RecruiterJobsPage() {
 
     const fetchJobs = async () => {
         try {
-            const response = await api.get("/recruiter/jobs");
-            setJobs(response.data);
+            const page = await recruiterApi.getJobs();
+            setJobs(page.jobs);
+            setNextPageToken(page.next_page_token);
         } catch (err: any) {
             setError("Failed to fetch jobs");
         } finally {
@@ -41,6 +44,20 @@ export default function RecruiterJobsPage() {
         }
     };
 
+    const loadMoreJobs = async () => {
+        if (!nextPageToken) return;
+        setLoadingMore(true);
+        try {
+            const page = await recruiterApi.getJobs(nextPageToken);
+            setJobs((current) => [...current, ...page.jobs]);
+            setNextPageToken(page.next_page_token);
+        } catch (err: any) {
+            setError("Failed to fetch jobs");
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleFileUpload = async (file: File) => {
         setUploading(true);
         setError("");
@@ -55,10 +72,13 @@ export default function RecruiterJobsPage() {
                 },
             });
 
-            setJobs([response.data, ...jobs]);
+            // Parsing runs in the background; wait for the ingestion job to finish
+            const ingestionJob = await ingestionApi.waitForJob(response.data.id);
+            const jobResponse = await api.get(`/recruiter/job/${ingestionJob.result_id}`);
+            setJobs([jobResponse.data, ...jobs]);
             setShowUpload(false);
         } catch (err: any) {
-            setError(err.response?.data?.detail || "Failed to upload job description");
+            setError(err.response?.data?.detail || err.message || "Failed to upload job description");
         } finally {
             setUploading(false);
         }
@@ -237,6 +257,15 @@ export default function RecruiterJobsPage() {
                                 </div>
                             </div>
                         ))}
+                        {nextPageToken && (
+                            <button
+                                onClick={loadMoreJobs}
+                                disabled={loadingMore}
+                                className="px-6 py-3 rounded-xl bg-white/5 border border-white/10 text-white/70 hover:border-white/20 hover:text-white transition-all disabled:opacity-50"
+                            >
+                                {loadingMore ? "Loading..." : "Load more jobs"}
+                            </button>
+                        )}
                     </div>
                 )}
             </main>
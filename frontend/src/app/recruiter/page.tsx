@@ -24,6 +24,7 @@ import { recruiterApi } from "@/lib/api";
 
 interface DashboardStats {
     activeJobs: number;
+    moreJobs: boolean;
     candidatesFound: number;
     matchQuality: number;
     interviews: number;
@@ -35,6 +36,7 @@ export default function RecruiterHomePage() {
     const [greeting, setGreeting] = useState("Welcome");
     const [stats, setStats] = useState<DashboardStats>({
         activeJobs: 0,
+        moreJobs: false,
         candidatesFound: 0,
         matchQuality: 0,
         interviews: 0,
@@ -65,7 +67,8 @@ export default function RecruiterHomePage() {
                 setStatsLoading(true);
                 
                 // Fetch jobs count
-                const jobs = await recruiterApi.getJobs();
+                // One page of jobs; the count shows "+" when there are more
+                const { jobs, next_page_token } = await recruiterApi.getJobs();
                 const activeJobs = jobs.length;
 
                 // Fetch candidates count and match quality
@@ -126,6 +129,7 @@ export default function RecruiterHomePage() {
 
                 setStats({
                     activeJobs,
+                    moreJobs: next_page_token !== null,
                     candidatesFound: candidatesFound || 0,
                     matchQuality: matchQuality || 0,
                     interviews: 0, // This would need a separate endpoint
@@ -225,7 +229,7 @@ export default function RecruiterHomePage() {
                         {statsLoading ? (
                             <div className="h-8 w-12 bg-white/10 rounded animate-pulse" />
                         ) : (
-                            <p className="text-2xl font-bold text-white">{stats.activeJobs}</p>
+                            <p className="text-2xl font-bold text-white">{stats.activeJobs}{stats.moreJobs ? "+" : ""}</p>
                         )}
                         <p className="text-white/50 text-sm">Active Jobs</p>
                     </div>
@@ -106,8 +106,10 @@ export const chatApi = {
         return () => eventSource.close();
     },
 
-    getHistory: async (conversationId: string) => {
-        const response = await api.get(`/chat/history/${conversationId}`);
+    getHistory: async (conversationId: string, pageToken?: string) => {
+        const response = await api.get(`/chat/history/${conversationId}`, {
+            params: { page_token: pageToken },
+        });
         return response.data;
     },
 
@@ -117,6 +119,27 @@ export const chatApi = {
     },
 };
 
+// Ingestion API: document uploads are processed in the background
+export const ingestionApi = {
+    getJob: async (jobId: string) => {
+        const response = await api.get(`/ingestion/jobs/${jobId}`);
+        return response.data;
+    },
+
+    // Poll an ingestion job until it finishes; resolves with the finished job
+    waitForJob: async (jobId: string, onProgress?: (job: any) => void, intervalMs: number = 1500) => {
+        while (true) {
+            const job = await ingestionApi.getJob(jobId);
+            onProgress?.(job);
+            if (job.status === "succeeded") return job;
+            if (job.status === "failed") {
+                throw new Error(job.error || "Document processing failed");
+            }
+            await new Promise((resolve) => setTimeout(resolve, intervalMs));
+        }
+    },
+};
+
 // Candidate API
 export const candidateApi = {
     uploadResume: async (file: File) => {
@@ -150,8 +173,10 @@ export const recruiterApi = {
         return response.data;
     },
 
-    getJobs: async () => {
-        const response = await api.get("/recruiter/jobs");
+    getJobs: async (pageToken?: string, pageSize?: number) => {
+        const response = await api.get("/recruiter/jobs", {
+            params: { page_token: pageToken, page_size: pageSize },
+        });
         return response.data;
     },
 